@@ -1,8 +1,29 @@
+import os
+import sys
+import asyncio
 import uvicorn
 
 
 def main():
-    uvicorn.run("servers.app:app", host="0.0.0.0", port=8000, reload=True)
+    # dev (default): one reloading process running the API and the jobs
+    # api / worker: the API only enqueues jobs, `worker` processes run them, add more to scale out
+    mode = sys.argv[1] if len(sys.argv) > 1 else "dev"
+    if mode == "dev":
+        uvicorn.run("servers.app:app", host="0.0.0.0", port=8000, reload=True)
+        return
+
+    if mode not in ("api", "worker"):
+        sys.exit(f"Unknown mode '{mode}', expected dev, api or worker")
+    os.environ["job_runner"] = "broker"
+    if mode == "api":
+        uvicorn.run("servers.app:app", host="0.0.0.0", port=8000,
+                    workers=int(os.getenv("api_workers", 1)))
+    else:
+        from servers.app import run_broker_workers
+        try:
+            asyncio.run(run_broker_workers())
+        except KeyboardInterrupt:
+            pass
 
 
 if __name__ == "__main__":
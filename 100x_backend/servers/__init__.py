@@ -2,8 +2,16 @@ from .connectors import BaseConnector, GroqConnector, OpenrouterConnector, Ollam
 from .extraction_server import ResumeParser, parse
 from .scoring_server import process_candidate, ATSScorer, score, JobRequirements
 from .generation_server import generate, rerank_resumes
-from .app import app
 
 __all__ = ['parse', 'ResumeParser', 'process_candidate',
            'generate', 'rerank_resumes', 'score', 'ATSScorer',
            'BaseConnector', 'GroqConnector', 'OpenrouterConnector', 'OllamaConnector', 'JobRequirements', 'app']
+
+
+def __getattr__(name):
+    # Built on first use, so extraction workers can import the package without starting the app
+    if name == "app":
+        from .app import app
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,19 +2,31 @@
 
 import posthog
 from fastapi import FastAPI, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing_extensions import TypedDict, List
+from typing_extensions import TypedDict, Dict, List, Optional
 import os
+import json
 import asyncio
 import time
 import shutil
 import uuid
-import zipfile
-import duckdb
+import socket
+import heapq
+import itertools
+from collections import defaultdict
 from dotenv import load_dotenv
 from pathlib import Path
-from servers import GroqConnector, parse, score, JobRequirements, generate, rerank_resumes
+from servers import GroqConnector, JobRequirements
+from servers.db_utils import JobDBManager, ResumeCacheManager, TaskBroker, TYPED_RESUME_COLUMNS, get_connection_manager, \
+    shared_db_thread
+from servers.db_utils.broker import BROKER_LEASE_SECONDS
+from servers.db_utils.shared_duckdb import JOB_RUNNER
+from servers.extraction_server import count_zip_resumes, iter_zip_resumes
+from servers.extraction_server.resume_parser import shutdown_extraction_executor
+from servers.extraction_server.server import get_job_db_path
+from servers.llm_scheduler import llm_flow
+from servers.pipeline import JobProgress, PipelineConfig, StreamingPipeline
 
 load_dotenv()
 
@@ -42,6 +54,22 @@ conn = GroqConnector(api_key=api_key, model=model)
 
 DEFAULT_FOLDER_PATH = "docs/uploads"
 DB_DIR = "db"
+JOBS_DB_PATH = os.path.join(DB_DIR, "jobs.duckdb")
+RESUME_CACHE_DB_PATH = os.path.join(DB_DIR, "resume_cache.duckdb")
+# Jobs running at once, their LLM calls share each provider's budget in weighted fair order
+NUM_WORKERS = int(os.getenv("num_workers", 2))
+# Extra job slots only jobs with a priority above `urgent_priority` are admitted to, so an urgent
+# job starts right away instead of waiting for a bulk job to finish
+NUM_URGENT_WORKERS = int(os.getenv("num_urgent_workers", 1))
+URGENT_PRIORITY = float(os.getenv("urgent_priority", 1.0))
+PIPELINE_CONFIG = PipelineConfig.from_env()
+# How often an idle `main.py worker` process asks the broker for work
+BROKER_POLL_SECONDS = float(os.getenv("broker_poll_seconds", 1.0))
+# Least time between two progress updates of a job, saved to `jobs.duckdb` or sent on its event stream
+PROGRESS_INTERVAL_SECONDS = float(os.getenv("progress_interval_seconds", 1.0))
+# An idle event stream gets a comment this often, so proxies keep the connection open
+EVENTS_KEEPALIVE_SECONDS = 15.0
+FINAL_STATUSES = ("completed", "failed", "cancelled")
 
 
 # JobRequirements Pydantic wrapper
@@ -57,85 +85,264 @@ class JobRequirementsInput(TypedDict):
     location_preference: str = ""
 
 
-task_queue = asyncio.Queue()
+class JobQueue:
+    """Jobs waiting for a worker, highest priority first, then in submission order"""
 
-# Background worker to process tasks sequentially
+    def __init__(self):
+        self._tasks = []
+        self._order = itertools.count()
+        self._changed = asyncio.Condition()
+
+    async def put(self, task, priority: float):
+        async with self._changed:
+            heapq.heappush(self._tasks, (-priority, next(self._order), task))
+            self._changed.notify_all()
+
+    async def get(self, min_priority: Optional[float] = None):
+        """The next task, or with `min_priority` the next one with a priority above it"""
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: self._tasks and (min_priority is None or -self._tasks[0][0] > min_priority))
+            return heapq.heappop(self._tasks)[2]
+
+
+task_queue = JobQueue()
+job_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+# job_id → the task running it in this process, for cancellation
+running_jobs: Dict[str, asyncio.Task] = {}
+# job_id → live progress of the job running in this process
+job_progress: Dict[str, JobProgress] = {}
+os.makedirs(DB_DIR, exist_ok=True)
+job_db = JobDBManager(db_path=JOBS_DB_PATH)
+resume_cache = ResumeCacheManager(db_path=RESUME_CACHE_DB_PATH)
+# Queries on the shared stores run here, so a busy job never stalls a status request
+db_thread = shared_db_thread()
+# With `job_runner=broker` the API only enqueues, jobs run in separate `main.py worker` processes
+broker = TaskBroker() if JOB_RUNNER == "broker" else None
+
+# Pool of background workers, so several jobs can run at once
+
+
+async def enqueue(prompt, job_id, zip_path, filename, priority=1.0, deadline_seconds=None):
+    task = (prompt, job_id, zip_path, filename, priority, deadline_seconds)
+    if broker is not None:
+        await db_thread.run(broker.enqueue, job_id, task, priority)
+    else:
+        await task_queue.put(task, priority)
 
 
 @app.on_event("startup")
-async def start_worker():
-    asyncio.create_task(worker())
+async def start_workers():
+    if broker is not None:
+        # Jobs of workers that died go back to the broker queue once their lease runs out
+        return
+
+    for task in await db_thread.run(job_db.requeue_interrupted_jobs):
+        job_id, zip_path = task[1], task[2]
+        if not os.path.exists(zip_path):
+            await db_thread.run(job_db.mark_failed, job_id, zip_path, "Interrupted by server restart, upload is gone")
+            continue
+        print(f"[!] Job {job_id} was interrupted by a restart, resuming it")
+        await enqueue(*task)
+
+    for _ in range(NUM_WORKERS):
+        asyncio.create_task(worker())
+    for _ in range(NUM_URGENT_WORKERS):
+        asyncio.create_task(worker(min_priority=URGENT_PRIORITY))
+
+
+@app.on_event("shutdown")
+async def stop_extraction_pool():
+    shutdown_extraction_executor()
+
+
+async def run_job(prompt, job_id, zip_path, filename, priority, deadline_seconds=None):
+    try:
+        # Uploads to the same job_id run one after the other, each on top of the last
+        async with job_locks[job_id]:
+            if not await db_thread.run(job_db.mark_running, job_id, zip_path):
+                print(f"[=] Job {job_id}: '{filename}' is no longer queued (e.g. cancelled), skipping it")
+                return
+            with llm_flow(job_id, priority):
+                run = asyncio.create_task(process_task(prompt, job_id, zip_path, filename, deadline_seconds))
+            running_jobs[job_id] = run
+            try:
+                result = await run
+            finally:
+                running_jobs.pop(job_id, None)
+            await db_thread.run(job_db.mark_completed, job_id, zip_path, result)
+    except asyncio.CancelledError:
+        if asyncio.current_task().cancelling():
+            raise
+        # Only the job's own task was cancelled, through the cancel endpoint
+        print(f"[!] Job {job_id} cancelled")
+    except Exception as e:
+        print(f"Task failed: {e}")
+        await db_thread.run(job_db.mark_failed, job_id, zip_path, str(e))
+
+
+async def worker(min_priority: Optional[float] = None):
+    while True:
+        task = await task_queue.get(min_priority)
+        await run_job(*task)
 
 
-async def worker():
+def cancel_running_job(job_id: str) -> bool:
+    run = running_jobs.get(job_id)
+    if run is None:
+        return False
+    # Stops its stage workers and in-flight LLM calls, the stage state keeps what is done
+    run.cancel()
+    return True
+
+
+async def keep_lease(task_id: int, owner: str, job_id: str, job: asyncio.Task):
+    """Heartbeats the task's lease, and stops the job once it is cancelled through the API"""
+    last_heartbeat = time.monotonic()
     while True:
-        task = await task_queue.get()
+        await asyncio.sleep(min(BROKER_POLL_SECONDS, BROKER_LEASE_SECONDS / 3))
         try:
-            await process_task(*task)
+            status = (await db_thread.run(job_db.get_job, job_id) or {}).get("status")
+            if status == "cancelled":
+                cancel_running_job(job_id)
+            if time.monotonic() - last_heartbeat < BROKER_LEASE_SECONDS / 3:
+                continue
+            alive = await db_thread.run(broker.heartbeat, task_id, owner)
+            last_heartbeat = time.monotonic()
         except Exception as e:
-            print(f"Task failed: {e}")
+            print(f"[!] Heartbeat for task {task_id} failed: {e}")
+            continue
+        if not alive:
+            # Another worker has it by now, the stage state lets it carry on from here
+            print(f"[!] Lost the lease on task {task_id}, stopping it")
+            job.cancel()
+            return
+
+
+async def broker_worker(owner: str, min_priority: Optional[float] = None):
+    while True:
+        task, abandoned = await db_thread.run(broker.claim, owner, min_priority=min_priority)
+        for payload in abandoned:
+            await db_thread.run(job_db.mark_failed, payload[1], payload[2],
+                                "Its workers kept dying while running the job")
+        if task is None:
+            await asyncio.sleep(BROKER_POLL_SECONDS)
+            continue
+
+        task_id, payload = task
+        job = asyncio.create_task(run_job(*payload))
+        heartbeat = asyncio.create_task(keep_lease(task_id, owner, payload[1], job))
+        try:
+            await asyncio.wait({job})
+        except asyncio.CancelledError:
+            # The worker is shutting down, hand the job back to the queue
+            job.cancel()
+            await asyncio.gather(job, return_exceptions=True)
+            await db_thread.run(broker.release, task_id, owner)
+            raise
         finally:
-            task_queue.task_done()
+            heartbeat.cancel()
+        if not job.cancelled():
+            await db_thread.run(broker.complete, task_id, owner)
+
+
+async def run_broker_workers():
+    """
+    Entry point of `main.py worker`: `num_workers` jobs at a time, plus `num_urgent_workers`
+    for urgent jobs, pulled from the broker
+    """
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    print(f"→ Worker {owner} pulling jobs from the broker")
+    try:
+        await asyncio.gather(*(broker_worker(f"{owner}:{i}") for i in range(NUM_WORKERS)),
+                             *(broker_worker(f"{owner}:urgent{i}", min_priority=URGENT_PRIORITY)
+                               for i in range(NUM_URGENT_WORKERS)))
+    finally:
+        shutdown_extraction_executor()
+
+
+async def resolve_job_requirements(prompt: str, db_path: str) -> JobRequirements:
+    async with get_connection_manager().connection(db_path) as db:
+        res = None
+        if PIPELINE_CONFIG.incremental:
+            # A top-up of an existing job is scored against the requirements it started with
+            res = await db.run(db.db_manager.load_job_requirements)
+
+        if res is None:
+            llm_prompt = f"""
+            Given a prompt from the user generate all the fields (make sure you use your knowledge but user's prompt is addressed at higher priority), convert the prompt into a useful and structured Job Requirements.
+
+            Input:
+            {prompt}
+            """
+            res = await conn.acall(conn.create_obj(structure=JobRequirementsInput), prompt=llm_prompt)
+            await db.run(db.db_manager.save_job_requirements, res)
+
+    return JobRequirements(
+        required_skills=res["required_skills"],
+        preferred_skills=res["preferred_skills"],
+        min_experience_years=res["min_experience_years"],
+        required_education=res["required_education"],
+        industry_keywords=res["industry_keywords"],
+        job_title_keywords=res["job_title_keywords"],
+        extra_information=res["extra_information"]
+    )
 
 
-async def process_task(prompt, job_id, zip_file, result_future):
+async def process_task(prompt, job_id, zip_path, filename, deadline_seconds=None):
     start_time = time.monotonic()
 
     try:
-        job_id = job_id or str(uuid.uuid1())
-
         # Track job start
         posthog.capture(
             'test-id',
             'backend_job_started',
             {
                 'job_id': job_id,
-                'filename': zip_file.filename,
+                'filename': filename,
                 'prompt': prompt
             }
         )
 
-        job_folder_path = os.path.join(DEFAULT_FOLDER_PATH, job_id)
-        os.makedirs(job_folder_path, exist_ok=True)
-
-        zip_path = os.path.join(job_folder_path, "resumes.zip")
-        with open(zip_path, "wb") as f:
-            shutil.copyfileobj(zip_file.file, f)
-
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(job_folder_path)
-
-        llm_prompt = f"""
-        Given a prompt from the user generate all the fields (make sure you use your knowledge but user's prompt is addressed at higher priority), convert the prompt into a useful and structured Job Requirements.
-
-        Input:
-        {prompt}
-        """
-        res = await conn.acall(conn.create_obj(structure=JobRequirementsInput), prompt=llm_prompt)
-
-        job_requirements = JobRequirements(
-            required_skills=res["required_skills"],
-            preferred_skills=res["preferred_skills"],
-            min_experience_years=res["min_experience_years"],
-            required_education=res["required_education"],
-            industry_keywords=res["industry_keywords"],
-            job_title_keywords=res["job_title_keywords"],
-            extra_information=res["extra_information"]
-        )
-
-        db_path = await parse(connector=conn, folder_path=job_folder_path, job_id=job_id)
-        await score(db_path=db_path, job_requirements=job_requirements)
-        rerank_resumes(db_path=db_path)
-        await generate(db_path=db_path, job_requirements=job_requirements)
+        job_requirements = await resolve_job_requirements(prompt, get_job_db_path(job_id))
 
-        con = duckdb.connect(db_path)
-        res_all = con.execute("SELECT * FROM resumes;").fetch_df()
-        res_all.to_excel(db_path.replace('.duckdb', '.xlsx'))
-        res_pass = con.execute(
-            "SELECT * FROM passed_ranked_resumes;").fetch_df()
-        res_pass.to_excel(db_path.replace('.duckdb', '_pass.xlsx'))
-        res_fail = con.execute("SELECT * FROM failed_resumes;").fetch_df()
-        res_fail.to_excel(db_path.replace('.duckdb', '_fail.xlsx'))
+        progress = JobProgress(job_id)
+        job_progress[job_id] = progress
+        publisher = asyncio.create_task(publish_progress(job_id, progress))
+        try:
+            progress.expect(await asyncio.to_thread(count_zip_resumes, zip_path))
+            pipeline = StreamingPipeline(
+                connector=conn,
+                job_id=job_id,
+                db_path=get_job_db_path(job_id),
+                job_requirements=job_requirements,
+                config=PIPELINE_CONFIG,
+                cache=resume_cache,
+                deadline_seconds=deadline_seconds,
+                progress=progress
+            )
+            db_path = await pipeline.run(iter_zip_resumes(zip_path))
+        finally:
+            publisher.cancel()
+            job_progress.pop(job_id, None)
+            progress.finish()
+            try:
+                await db_thread.run(job_db.set_progress, job_id, progress.snapshot())
+            except Exception as e:
+                print(f"[!] Could not save the progress of job {job_id}: {e}")
+
+        # The typed resume columns are nested STRUCT/LISTs, `raw` already carries them for the sheets
+        columns = f"* EXCLUDE ({', '.join(TYPED_RESUME_COLUMNS)})"
+
+        def export(cursor, table: str, suffix: str):
+            df = cursor.execute(f"SELECT {columns} FROM {table};").fetch_df()
+            df.to_excel(db_path.replace('.duckdb', f'{suffix}.xlsx'))
+            return df
+
+        async with get_connection_manager().connection(db_path) as db:
+            res_all = await db.read(export, "resumes", "")
+            res_pass = await db.read(export, "passed_ranked_resumes", "_pass")
+            res_fail = await db.read(export, "failed_resumes", "_fail")
 
         elapsed = time.monotonic() - start_time
         mins, secs = divmod(int(elapsed), 60)
@@ -150,21 +357,23 @@ async def process_task(prompt, job_id, zip_file, result_future):
                 'resumes_processed': len(res_all),
                 'passed_resumes': len(res_pass),
                 'failed_resumes': len(res_fail),
-                'filename': zip_file.filename
+                'filename': filename
             }
         )
 
-        result_future.set_result({
+        return {
             "message": "Upload and processing complete",
             "job_id": job_id,
             "prompt": prompt,
-            "uploaded_zip_file": zip_file.filename,
+            "uploaded_zip_file": filename,
             "db_path": db_path,
             "xlsx_path": db_path.replace('.duckdb', '.xlsx'),
             "pass_xlsx_path": db_path.replace('.duckdb', '_pass.xlsx'),
             "fail_xlsx_path": db_path.replace('.duckdb', '_fail.xlsx'),
-            "processing_time": f"{mins} min {secs} sec"
-        })
+            "processing_time": f"{mins} min {secs} sec",
+            # Steps the deadline forced, the rankings are partial once it reached "partial_finalize"
+            "degraded": pipeline.degraded
+        }
 
     except Exception as e:
         # Track job errors
@@ -174,18 +383,80 @@ async def process_task(prompt, job_id, zip_file, result_future):
             {
                 'job_id': job_id,
                 'error': str(e),
-                'filename': zip_file.filename
+                'filename': filename
             }
         )
-        result_future.set_result(
-            JSONResponse(status_code=500, content={"error": str(e)})
-        )
+        raise
+
+
+async def publish_progress(job_id: str, progress: JobProgress):
+    """Saves the job's progress as it changes, for `GET /jobs/{job_id}` and streams served by other processes"""
+    version = None
+    while True:
+        version = await progress.wait_changed(version)
+        try:
+            await db_thread.run(job_db.set_progress, job_id, progress.snapshot())
+        except Exception as e:
+            print(f"[!] Could not save the progress of job {job_id}: {e}")
+        await asyncio.sleep(PROGRESS_INTERVAL_SECONDS)
+
+
+def sse_event(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_job_events(job_id: str):
+    """
+    Server-sent events of a job: `progress` with its latest snapshot, at most one per
+    `PROGRESS_INTERVAL_SECONDS`, and `status` whenever its status changes. Ends after a final status.
+    A job running in this process is followed live, otherwise through what its worker saves.
+    """
+    status = snapshot = None
+    last_event = last_progress = 0.0
+    while True:
+        progress = job_progress.get(job_id)
+        if progress is not None:
+            version = progress.version
+            current_status, current = "running", progress.snapshot()
+        else:
+            current_status, current = await db_thread.run(job_db.get_progress, job_id) or ("failed", None)
+
+        if current is not None and current != snapshot:
+            snapshot, last_progress = current, time.monotonic()
+            yield sse_event("progress", snapshot)
+            last_event = last_progress
+        if current_status != status:
+            status = current_status
+            event = {"job_id": job_id, "status": status}
+            if status == "completed":
+                event["result_url"] = f"/jobs/{job_id}/result"
+            yield sse_event("status", event)
+            last_event = time.monotonic()
+        if status in FINAL_STATUSES:
+            return
+        if time.monotonic() - last_event >= EVENTS_KEEPALIVE_SECONDS:
+            yield ": keep-alive\n\n"
+            last_event = time.monotonic()
+
+        if progress is not None:
+            # Woken by the next update, then held back so updates are batched per interval
+            await progress.wait_changed(version, timeout=EVENTS_KEEPALIVE_SECONDS)
+            await asyncio.sleep(max(0.0, last_progress + PROGRESS_INTERVAL_SECONDS - time.monotonic()))
+        else:
+            await asyncio.sleep(PROGRESS_INTERVAL_SECONDS)
+
+
+def save_upload(upload, zip_path: str):
+    with open(zip_path, "wb") as f:
+        shutil.copyfileobj(upload, f)
 
 
 @app.post("/upload_and_run")
 async def upload_and_run(
     prompt: str = Form(...),
     job_id: str = Form(None),
+    priority: float = Form(1.0),
+    deadline_minutes: float = Form(None),
     zip_file: UploadFile = File(...)
 ):
     # Track API request
@@ -197,10 +468,109 @@ async def upload_and_run(
             'filename': zip_file.filename
         }
     )
-    result_future = asyncio.Future()
-    await task_queue.put((prompt, job_id, zip_file, result_future))
-    result = await result_future
-    return result
+    job_id = job_id or str(uuid.uuid1())
+    if priority <= 0:
+        return JSONResponse(status_code=422, content={"error": "priority must be positive"})
+    if deadline_minutes is not None and deadline_minutes <= 0:
+        return JSONResponse(status_code=422, content={"error": "deadline_minutes must be positive"})
+    # The time budget starts once the job runs
+    deadline_seconds = deadline_minutes * 60 if deadline_minutes is not None else None
+
+    # The upload is closed once this request returns, so persist it for the worker
+    job_folder_path = os.path.join(DEFAULT_FOLDER_PATH, job_id)
+    os.makedirs(job_folder_path, exist_ok=True)
+
+    zip_path = os.path.join(job_folder_path, "resumes.zip")
+    if os.path.exists(zip_path):
+        # Adding resumes to an existing job, keep each upload for its own run
+        zip_path = os.path.join(job_folder_path, f"resumes_{uuid.uuid4().hex[:8]}.zip")
+    await asyncio.to_thread(save_upload, zip_file.file, zip_path)
+
+    await db_thread.run(job_db.create_job, job_id, prompt=prompt,
+                        filename=zip_file.filename, zip_path=zip_path, priority=priority,
+                        deadline_seconds=deadline_seconds)
+    await enqueue(prompt, job_id, zip_path, zip_file.filename, priority, deadline_seconds)
+
+    return JSONResponse(status_code=202, content={
+        "message": "Job queued",
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}",
+        "events_url": f"/jobs/{job_id}/events",
+        "result_url": f"/jobs/{job_id}/result"
+    })
+
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    job = await db_thread.run(job_db.get_job, job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown job_id '{job_id}'"})
+
+    job.pop("result")
+    if job_id in job_progress:
+        job["progress"] = job_progress[job_id].snapshot()
+    return job
+
+
+@app.get("/jobs/{job_id}/events")
+async def get_job_events(job_id: str):
+    if job_id not in job_progress and await db_thread.run(job_db.get_progress, job_id) is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown job_id '{job_id}'"})
+
+    return StreamingResponse(stream_job_events(job_id), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = await db_thread.run(job_db.get_job, job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown job_id '{job_id}'"})
+
+    if job["status"] == "failed":
+        return JSONResponse(status_code=500, content={"error": job["error"]})
+    if job["status"] == "cancelled":
+        return JSONResponse(status_code=409, content={"job_id": job_id, "status": "cancelled"})
+    if job["status"] != "completed":
+        return JSONResponse(status_code=202, content={"job_id": job_id, "status": job["status"]})
+    return job["result"]
+
+
+@app.post("/jobs/{job_id}/retry")
+async def retry_job(job_id: str):
+    # The job resumes from the stages its resumes reached, only what is missing is redone
+    tasks = await db_thread.run(job_db.requeue_stopped_job, job_id)
+    if not tasks:
+        job = await db_thread.run(job_db.get_job, job_id)
+        if job is None:
+            return JSONResponse(status_code=404, content={"error": f"Unknown job_id '{job_id}'"})
+        return JSONResponse(status_code=409, content={
+            "error": f"Job '{job_id}' is {job['status']}, not failed or cancelled"})
+
+    for task in tasks:
+        await enqueue(*task)
+    return JSONResponse(status_code=202, content={
+        "message": "Job requeued",
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}",
+        "events_url": f"/jobs/{job_id}/events",
+        "result_url": f"/jobs/{job_id}/result"
+    })
+
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    if not await db_thread.run(job_db.mark_cancelled, job_id):
+        job = await db_thread.run(job_db.get_job, job_id)
+        if job is None:
+            return JSONResponse(status_code=404, content={"error": f"Unknown job_id '{job_id}'"})
+        return JSONResponse(status_code=409, content={"error": f"Job '{job_id}' is already {job['status']}"})
+
+    # A queued job is skipped when its turn comes, one running in a broker worker is stopped by it
+    cancel_running_job(job_id)
+    return {"job_id": job_id, "status": "cancelled"}
 
 
 @app.get("/get-history")
@@ -8,45 +8,111 @@ from langchain_openai import ChatOpenAI
 from langchain_groq import ChatGroq
 from typing_extensions import Coroutine
 from langchain_core.messages import AIMessage
-from typing import Literal
+from typing import Literal, Dict, Tuple
+import httpx
+from .llm_scheduler import get_scheduler
+from .llm_cache import get_response_cache, schema_key
 
 load_dotenv()
 
+LLM_MAX_CONNECTIONS = int(os.getenv("llm_max_connections", 100))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("llm_max_keepalive_connections", 20))
+
+_http_clients: Dict[str, Any] = {}
+
+
+def shared_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    Process-wide keep-alive HTTP pools handed to every OpenAI-compatible client,
+    so connections are reused across models, schemas and requests.
+    """
+    if not _http_clients:
+        limits = httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=30.0,
+        )
+        timeout = httpx.Timeout(120.0, connect=10.0)
+        _http_clients["sync"] = httpx.Client(limits=limits, timeout=timeout)
+        _http_clients["async"] = httpx.AsyncClient(
+            limits=limits, timeout=timeout)
+    return _http_clients["sync"], _http_clients["async"]
+
 
 class BaseConnector(ABC):
-    @abstractmethod
+    # Connectors of the same provider share one rate limiter / concurrency controller
+    provider: str = "default"
+    # Set to False on a connector to always bypass the response cache
+    use_cache: bool = True
+    # (client key, schema) -> structured-output runnable, built once per process
+    _registry: dict = {}
+    # id(structured-output runnable) -> (model, schema key), used as the response cache key
+    _obj_keys: dict = {}
+
+    def _client_key(self) -> tuple:
+        """Everything besides the schema that changes how the client is built"""
+        return (self.provider, self.model)
+
     def create_obj(self, structure: Any = None) -> Any:
+        registry_key = (self._client_key(), structure)
+        obj = BaseConnector._registry.get(registry_key)
+        if obj is None:
+            obj = self._build_obj(structure)
+            BaseConnector._registry[registry_key] = obj
+            BaseConnector._obj_keys[id(obj)] = (
+                f"{self.provider}/{self.model}", schema_key(structure))
+        return obj
+
+    @abstractmethod
+    def _build_obj(self, structure: Any = None) -> Any:
         pass
 
     @abstractmethod
     def call(self, obj: Any, prompt: str) -> AIMessage:
         pass
 
-    @abstractmethod
     def acall(self, obj: Any, prompt: str) -> Coroutine:
-        pass
+        def scheduled():
+            return get_scheduler(self.provider).run(lambda: obj.ainvoke(prompt), prompt=prompt)
+
+        cache = get_response_cache() if self.use_cache else None
+        key = BaseConnector._obj_keys.get(id(obj))
+        if cache is None or key is None:
+            return scheduled()
+        model, schema = key
+        return cache.get_or_call(model, schema, prompt, scheduled)
 
 
 class OpenrouterConnector(BaseConnector):
+    provider = "openrouter"
+
     def __init__(self, api_key: str | None = None, model: str | None = None) -> None:
         self.api_key = api_key or os.getenv("openrouter_api_key")
         self.model = model or os.getenv("openrouter_model_name")
 
-    def create_obj(self, structure: Any = None) -> ChatOpenAI:
+    def _client_key(self) -> tuple:
+        return (self.provider, self.model, self.api_key)
+
+    def _build_obj(self, structure: Any = None) -> ChatOpenAI:
+        http_client, http_async_client = shared_http_clients()
         return ChatOpenAI(
             base_url="https://openrouter.ai/api/v1/",
             api_key=self.api_key,
             model=self.model,
+            # Retries are owned by the provider scheduler
+            max_retries=0,
+            http_client=http_client,
+            http_async_client=http_async_client,
         ).with_structured_output(structure, strict=True)
 
     def call(self, obj: ChatOpenAI, prompt: str) -> AIMessage:
         return obj.invoke(prompt)
 
-    def acall(self, obj: ChatOpenAI, prompt: str) -> Coroutine:
-        return obj.ainvoke(prompt)
-
 
 class OllamaConnector(BaseConnector):
+    provider = "ollama"
+
     def __init__(self, thinking: Literal["thinking", "non-thinking"], model: str | None = None) -> None:
         self.thinking = thinking
         if self.thinking == "non-thinking":
@@ -54,26 +120,28 @@ class OllamaConnector(BaseConnector):
         else:
             self.model = model or os.getenv("ollama_model_name_thinking")
 
-    def create_obj(self, structure: Any = None) -> ChatOllama:
+    def _build_obj(self, structure: Any = None) -> ChatOllama:
         return ChatOllama(model=self.model).with_structured_output(structure)
 
     def call(self, obj: ChatOllama, prompt: str) -> AIMessage:
         return obj.invoke(prompt)
 
-    def acall(self, obj: ChatOllama, prompt: str) -> Coroutine:
-        return obj.ainvoke(prompt)
-
 
 class GroqConnector(BaseConnector):
+    provider = "groq"
+
     def __init__(self, api_key: str | None = None, model: str | None = None) -> None:
         self.api_key = api_key or os.getenv("groq_api_key")
         self.model = model or os.getenv("groq_model_name")
 
-    def create_obj(self, structure=None) -> ChatGroq:
-        return ChatGroq(api_key=self.api_key, model=self.model).with_structured_output(structure, strict=True)
+    def _client_key(self) -> tuple:
+        return (self.provider, self.model, self.api_key)
+
+    def _build_obj(self, structure=None) -> ChatGroq:
+        http_client, http_async_client = shared_http_clients()
+        # Retries are owned by the provider scheduler
+        return ChatGroq(api_key=self.api_key, model=self.model, max_retries=0,
+                        http_client=http_client, http_async_client=http_async_client).with_structured_output(structure, strict=True)
 
     def call(self, obj: ChatGroq, prompt: str) -> AIMessage:
         return obj.invoke(prompt)
-
-    def acall(self, obj: ChatGroq, prompt: str) -> Coroutine:
-        return obj.ainvoke(prompt)
@@ -0,0 +1,156 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+PRESENT_WORDS = {'present', 'current', 'currently', 'now', 'ongoing', 'today',
+                 'date', 'till date', 'to date', 'till now'}
+MONTHS = {
+    'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3, 'apr': 4, 'april': 4,
+    'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7, 'aug': 8, 'august': 8,
+    'sep': 9, 'sept': 9, 'september': 9, 'oct': 10, 'october': 10, 'nov': 11, 'november': 11,
+    'dec': 12, 'december': 12,
+}
+# Seasons map to the month they usually start in
+SEASONS = {'spring': 3, 'summer': 6, 'fall': 9, 'autumn': 9, 'winter': 1}
+QUARTERS = {'q1': 1, 'q2': 4, 'q3': 7, 'q4': 10}
+# Full dates and anything else the fast paths below don't cover
+FALLBACK_FORMATS = ['%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%b %d %Y', '%B %d %Y',
+                    '%d %b %Y', '%d %B %Y']
+# Sections of a parsed resume whose entries carry from_date/to_date
+DATED_SECTIONS = ('work_experience', 'projects', 'education')
+# Added to each dated entry by `normalize_resume_dates`, kept out of the LLM prompts
+NORMALIZED_DATE_FIELDS = ('start_date', 'end_date', 'is_current')
+
+_YEAR = re.compile(r'^(\d{4})$')
+_WORD_YEAR = re.compile(r'^([a-z][a-z0-9]*)\.?,?\s+(\d{4})$')
+_MONTH_YEAR = re.compile(r'^(\d{1,2})\s*[/ .]\s*(\d{4})$')
+_YEAR_MONTH = re.compile(r'^(\d{4})\s*[-/]\s*(\d{1,2})$')
+_RANGE = re.compile(
+    r'\s*(?:–|—|-|\bto\b|\buntil\b|\btill\b)\s*', re.IGNORECASE)
+
+
+def _month_start(year: int, month: int) -> Optional[datetime]:
+    if 1 <= month <= 12:
+        return datetime(year, month, 1)
+    return None
+
+
+@lru_cache(maxsize=65536)
+def _parse(value: str) -> Optional[datetime]:
+    match = _YEAR.match(value)
+    if match:
+        return datetime(int(match.group(1)), 1, 1)
+
+    match = _WORD_YEAR.match(value)
+    if match:
+        word, year = match.group(1), int(match.group(2))
+        month = MONTHS.get(word) or SEASONS.get(word) or QUARTERS.get(word)
+        return _month_start(year, month) if month else None
+
+    match = _MONTH_YEAR.match(value)
+    if match:
+        return _month_start(int(match.group(2)), int(match.group(1)))
+
+    match = _YEAR_MONTH.match(value)
+    if match:
+        return _month_start(int(match.group(1)), int(match.group(2)))
+
+    cleaned = value.replace(',', ' ')
+    for fmt in FALLBACK_FORMATS:
+        try:
+            return datetime.strptime(cleaned, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_date(date_str: str) -> Optional[datetime]:
+    """
+    Parses a single resume date: "Jun 2023", "June, 2019", "06/2023", "2023-06", "2023",
+    "Summer 2020", "Q3 2021" or a full date. Returns None for anything else, including "Present".
+    """
+    if not isinstance(date_str, str):
+        return None
+    value = ' '.join(date_str.lower().split())
+    if not value:
+        return None
+    return _parse(value)
+
+
+def is_present(date_str: str) -> bool:
+    return isinstance(date_str, str) and ' '.join(date_str.lower().split()) in PRESENT_WORDS
+
+
+@lru_cache(maxsize=65536)
+def split_range(date_str: str) -> Optional[Tuple[str, str]]:
+    """Splits "Jun 2023 – Present" or "2019-2021" into its two ends, None when it isn't a range"""
+    if not isinstance(date_str, str) or parse_date(date_str) is not None:
+        return None
+    parts = _RANGE.split(date_str.strip(), maxsplit=1)
+    if len(parts) != 2:
+        return None
+    start, end = parts
+    if parse_date(start) is None or not (is_present(end) or parse_date(end) is not None):
+        return None
+    return start, end
+
+
+def entry_dates(entry: Dict) -> Tuple[Optional[datetime], Optional[datetime], bool]:
+    """
+    (start, end, is_current) of a work experience, project or education entry. Uses the fields
+    added by `normalize_resume_dates` when present, otherwise parses from_date/to_date. A missing
+    or "Present" end date means the entry is current.
+    """
+    if entry.get('is_current') is not None:
+        return _from_iso(entry.get('start_date')), _from_iso(entry.get('end_date')), bool(entry['is_current'])
+
+    from_date = entry.get('from_date', '')
+    to_date = entry.get('to_date', '')
+    if not to_date and from_date:
+        date_range = split_range(from_date)
+        if date_range:
+            from_date, to_date = date_range
+
+    is_current = not to_date or is_present(to_date)
+    end = None if is_current else parse_date(to_date)
+    return parse_date(from_date), end, is_current
+
+
+@lru_cache(maxsize=65536)
+def _from_iso(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def normalize_resume_dates(parsed: Dict) -> Dict:
+    """
+    A copy of a parsed resume with `start_date`/`end_date` (ISO dates or None) and `is_current`
+    added to every dated entry, so scorers don't parse the same strings again. The resume itself
+    is left as parsed, prompts are built from it.
+    """
+    normalized = dict(parsed)
+    for section in DATED_SECTIONS:
+        entries = parsed.get(section) or []
+        if not isinstance(entries, list):
+            continue
+        normalized[section] = [_with_dates(entry) if isinstance(entry, dict) else entry for entry in entries]
+    return normalized
+
+
+def _with_dates(entry: Dict) -> Dict:
+    if entry.get('is_current') is not None:
+        return entry
+    start, end, is_current = entry_dates(entry)
+    return {**entry, 'start_date': start.date().isoformat() if start else None,
+            'end_date': end.date().isoformat() if end else None, 'is_current': is_current}
+
+
+def without_normalized_dates(parsed: Dict) -> Dict:
+    """A copy of a resume without the fields `normalize_resume_dates` adds, e.g. one read back from the typed columns"""
+    stripped = dict(parsed)
+    for section in DATED_SECTIONS:
+        entries = parsed.get(section)
+        if isinstance(entries, list):
+            stripped[section] = [{k: v for k, v in entry.items() if k not in NORMALIZED_DATE_FIELDS}
+                                 if isinstance(entry, dict) else entry for entry in entries]
+    return stripped
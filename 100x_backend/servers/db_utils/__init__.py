@@ -1,3 +1,17 @@
-from .resume_db_utils import ResumeDBManager, process_folder_concurrently
+from .resume_db_utils import ResumeDBManager, process_folder_concurrently, build_resume_row, collect_resume_paths, \
+    TYPED_RESUME_COLUMNS, resume_from_typed_columns
+from .batch_writer import ResumeBatchWriter
+from .stage_state import STAGES, set_stage, run_stage, in_stage, record_failure, dead_lettered_hashes
+from .connection_manager import JobConnection, JobConnectionManager, DBThread, get_connection_manager, shared_db_thread
+from .job_db_utils import JobDBManager
+from .shared_duckdb import ProcessSharedDuckDB, connect_shared
+from .broker import TaskBroker
+from .cache_db_utils import ResumeCacheManager, content_hash, text_hash
+from .near_duplicates import MinHashLSH
 
-__all__ = ['ResumeDBManager', 'process_folder_concurrently']
+__all__ = ['ResumeDBManager', 'process_folder_concurrently', 'build_resume_row', 'collect_resume_paths',
+           'TYPED_RESUME_COLUMNS', 'resume_from_typed_columns', 'ResumeBatchWriter',
+           'STAGES', 'set_stage', 'run_stage', 'in_stage', 'record_failure', 'dead_lettered_hashes',
+           'JobConnection', 'JobConnectionManager', 'DBThread', 'get_connection_manager', 'shared_db_thread',
+           'JobDBManager', 'ProcessSharedDuckDB', 'connect_shared', 'TaskBroker',
+           'ResumeCacheManager', 'content_hash', 'text_hash', 'MinHashLSH']
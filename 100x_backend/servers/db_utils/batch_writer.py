@@ -0,0 +1,124 @@
+import os
+import asyncio
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .stage_state import set_stages
+
+if TYPE_CHECKING:
+    from .connection_manager import JobConnection
+
+RESUME_WRITE_BATCH_SIZE = int(os.getenv("resume_write_batch_size", 64))
+RESUME_WRITE_FLUSH_SECONDS = float(os.getenv("resume_write_flush_seconds", 0.05))
+
+_RESUMES = "resumes"
+_DUPLICATES = "duplicate_resumes"
+
+
+class ResumeBatchWriter:
+    """
+    The single writer of a job's parsed resumes. Producers hand rows over without taking a lock,
+    a background task appends them on the job's DB thread with one INSERT per table and batch.
+    A batch is flushed once it holds `batch_size` rows, or `flush_seconds` after its first row.
+    Resumes are committed together with their 'parsed' stage.
+    """
+
+    def __init__(self, db: "JobConnection", batch_size: int = RESUME_WRITE_BATCH_SIZE,
+                 flush_seconds: float = RESUME_WRITE_FLUSH_SECONDS):
+        self.db = db
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self._pending: List[Tuple[str, Dict, asyncio.Future]] = []
+        self._has_rows = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> "ResumeBatchWriter":
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    def _submit(self, table: str, row: Dict) -> asyncio.Future:
+        if self._task is None or self._closing:
+            raise RuntimeError("ResumeBatchWriter is not running")
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((table, row, future))
+        self._has_rows.set()
+        if len(self._pending) >= self.batch_size:
+            self._batch_full.set()
+        return future
+
+    async def write_resume(self, **row):
+        """Queues an `insert_resume_row` row, returns once its batch is committed"""
+        await self._submit(_RESUMES, row)
+
+    async def write_duplicate(self, **row):
+        """Queues an `insert_duplicate_row` row, returns once its batch is committed"""
+        await self._submit(_DUPLICATES, row)
+
+    async def _run(self):
+        while True:
+            await self._has_rows.wait()
+            if len(self._pending) < self.batch_size and not self._closing:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.flush_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            if len(self._pending) < self.batch_size:
+                self._batch_full.clear()
+            if not self._pending:
+                self._has_rows.clear()
+
+            await self._flush(batch)
+            if self._closing and not self._pending:
+                return
+
+    async def _flush(self, batch: List[Tuple[str, Dict, asyncio.Future]]):
+        for table in (_RESUMES, _DUPLICATES):
+            entries = [(row, future)
+                       for entry_table, row, future in batch if entry_table == table]
+            if not entries:
+                continue
+            try:
+                insert = (self._insert_resumes if table == _RESUMES
+                          else self.db.db_manager.insert_duplicate_rows)
+                await self.db.run(insert, [row for row, _ in entries])
+            except Exception as e:
+                print(f"[!] Batch insert into '{table}' failed: {e}")
+                for _, future in entries:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            print(f"[+] Inserted {len(entries)} row(s) into '{table}'")
+            for _, future in entries:
+                if not future.done():
+                    future.set_result(None)
+
+    def _insert_resumes(self, rows: List[Dict]):
+        con = self.db.con
+        con.begin()
+        try:
+            self.db.db_manager.insert_resume_rows(rows)
+            set_stages(con, [(row["content_hash"], "parsed", row.get("file_path"), row["resume_id"])
+                             for row in rows if row.get("content_hash")])
+            con.commit()
+        except BaseException:
+            con.rollback()
+            raise
+
+    async def close(self):
+        """Flushes whatever is still queued and stops the writer task"""
+        if self._task is None:
+            return
+        self._closing = True
+        self._has_rows.set()
+        self._batch_full.set()
+        try:
+            await self._task
+        finally:
+            self._task = None
@@ -0,0 +1,113 @@
+import os
+import json
+import time
+import sqlite3
+from typing import Any, List, Optional, Tuple
+
+BROKER_DB_PATH = os.getenv("broker_db_path", os.path.join("db", "broker.sqlite3"))
+# A claimed task is handed to another worker once its lease runs out without a heartbeat
+BROKER_LEASE_SECONDS = float(os.getenv("broker_lease_seconds", 60))
+# Claims after which a task whose worker keeps dying is given up on
+BROKER_MAX_ATTEMPTS = int(os.getenv("broker_max_attempts", 3))
+
+
+class TaskBroker:
+    """
+    Durable job queue in a local SQLite file, shared by the API and any number of worker processes:
+      • the API enqueues, workers claim the next task with a lease and keep it alive with heartbeats
+      • a task whose lease expires (its worker died) goes back to the queue, up to `max_attempts` claims
+      • the uploads of one job are claimed one at a time, in order.
+    """
+
+    def __init__(self, db_path: str = BROKER_DB_PATH, max_attempts: int = BROKER_MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+        # Transactions are opened explicitly, so a claim is atomic across processes
+        self.con = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.con.execute("PRAGMA journal_mode=WAL;")
+        self._ensure_tasks_table()
+
+    def _ensure_tasks_table(self):
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id            INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id        TEXT,
+                priority      REAL,
+                payload       TEXT,
+                status        TEXT,
+                lease_owner   TEXT,
+                lease_expires REAL,
+                attempts      INTEGER DEFAULT 0,
+                enqueued_at   REAL
+            );
+        """)
+        self.con.execute(
+            "CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, priority);")
+
+    def enqueue(self, job_id: str, payload: Any, priority: float = 1.0) -> int:
+        cursor = self.con.execute(
+            "INSERT INTO tasks (job_id, priority, payload, status, enqueued_at) VALUES (?, ?, ?, 'queued', ?);",
+            [job_id, priority, json.dumps(payload), time.time()])
+        return cursor.lastrowid
+
+    def claim(self, owner: str, lease_seconds: float = BROKER_LEASE_SECONDS, min_priority: Optional[float] = None
+              ) -> Tuple[Optional[Tuple[int, Any]], List[Any]]:
+        """
+        Leases the next task, highest priority first, only one with a priority above `min_priority` if given.
+        Returns ((task id, payload) or None, and the payloads of tasks given up on because their workers kept dying).
+        """
+        now = time.time()
+        self.con.execute("BEGIN IMMEDIATE;")
+        try:
+            abandoned = self.con.execute("""
+                UPDATE tasks SET status = 'failed'
+                WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?
+                RETURNING payload;
+            """, [now, self.max_attempts]).fetchall()
+
+            # Only a job's oldest unfinished task is eligible, and not while its lease is live
+            row = self.con.execute("""
+                SELECT id, payload FROM tasks t
+                WHERE (status = 'queued' OR (status = 'leased' AND lease_expires < ?))
+                  AND (? IS NULL OR priority > ?)
+                  AND id = (SELECT MIN(id) FROM tasks o
+                            WHERE o.job_id = t.job_id AND o.status IN ('queued', 'leased'))
+                ORDER BY priority DESC, id
+                LIMIT 1;
+            """, [now, min_priority, min_priority]).fetchone()
+            if row is not None:
+                self.con.execute("""
+                    UPDATE tasks
+                    SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1
+                    WHERE id = ?;
+                """, [owner, now + lease_seconds, row[0]])
+            self.con.execute("COMMIT;")
+        except BaseException:
+            self.con.execute("ROLLBACK;")
+            raise
+
+        task = (row[0], json.loads(row[1])) if row is not None else None
+        return task, [json.loads(payload) for payload, in abandoned]
+
+    def heartbeat(self, task_id: int, owner: str, lease_seconds: float = BROKER_LEASE_SECONDS) -> bool:
+        """Extends the lease, returns False if the task is no longer leased to `owner`"""
+        cursor = self.con.execute("""
+            UPDATE tasks SET lease_expires = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'leased';
+        """, [time.time() + lease_seconds, task_id, owner])
+        return cursor.rowcount == 1
+
+    def complete(self, task_id: int, owner: str):
+        self.con.execute(
+            "UPDATE tasks SET status = 'done' WHERE id = ? AND lease_owner = ? AND status = 'leased';",
+            [task_id, owner])
+
+    def release(self, task_id: int, owner: str):
+        """Hands a task back to the queue, e.g. when its worker shuts down"""
+        self.con.execute("""
+            UPDATE tasks SET status = 'queued', lease_owner = NULL, lease_expires = NULL,
+                             attempts = attempts - 1
+            WHERE id = ? AND lease_owner = ? AND status = 'leased';
+        """, [task_id, owner])
+
+    def close(self):
+        self.con.close()
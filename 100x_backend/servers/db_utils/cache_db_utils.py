@@ -0,0 +1,91 @@
+import re
+import json
+import hashlib
+from typing import Dict, Optional, Tuple
+from .shared_duckdb import connect_shared
+
+_PAGE_MARKER = re.compile(r"\[Page \d+\]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def content_hash(data: bytes) -> str:
+    """Hash of the raw file bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    """Drops page markers, lower-cases and collapses whitespace"""
+    normalized = _PAGE_MARKER.sub(" ", text).lower()
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def text_hash(text: str) -> str:
+    """
+    Hash of the normalized extracted text, so re-saved copies of a file still match.
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class ResumeCacheManager:
+    """
+    Encapsulates the cross-job DuckDB cache:
+      • extracted text keyed by file content hash
+      • parsed ResumeJSON keyed by normalized text hash.
+    """
+
+    def __init__(self, db_path: str):
+        self.con = connect_shared(db_path)
+        self._ensure_cache_tables()
+
+    def _ensure_cache_tables(self):
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS extracted_text (
+                content_hash TEXT PRIMARY KEY,
+                text_hash    TEXT,
+                text         TEXT,
+                created_at   TIMESTAMP DEFAULT current_timestamp
+            );
+        """)
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS parsed_resumes (
+                text_hash  TEXT PRIMARY KEY,
+                parsed     JSON,
+                created_at TIMESTAMP DEFAULT current_timestamp
+            );
+        """)
+
+    def get_text(self, content_hash: str) -> Optional[Tuple[str, str]]:
+        """Returns (text_hash, text) for a previously extracted file, or None"""
+        row = self.con.execute(
+            "SELECT text_hash, text FROM extracted_text WHERE content_hash = ?",
+            [content_hash]
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def put_text(self, content_hash: str, text_hash: str, text: str):
+        self.con.execute(
+            """
+            INSERT OR REPLACE INTO extracted_text (content_hash, text_hash, text)
+            VALUES (?, ?, ?)
+            """,
+            [content_hash, text_hash, text]
+        )
+
+    def get_parsed(self, text_hash: str) -> Optional[Dict]:
+        row = self.con.execute(
+            "SELECT parsed FROM parsed_resumes WHERE text_hash = ?",
+            [text_hash]
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_parsed(self, text_hash: str, parsed: Dict):
+        self.con.execute(
+            """
+            INSERT OR REPLACE INTO parsed_resumes (text_hash, parsed)
+            VALUES (?, ?)
+            """,
+            [text_hash, json.dumps(parsed)]
+        )
+
+    def close(self):
+        self.con.close()
@@ -0,0 +1,135 @@
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from .resume_db_utils import ResumeDBManager
+
+# Cursors per job database that queries can run on while the writer is busy
+DB_READ_CURSORS = int(os.getenv("db_read_cursors", 4))
+
+
+class DBThread:
+    """A dedicated thread running every call made through it one at a time, off the event loop"""
+
+    def __init__(self, name: str):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=name)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+class JobConnection(DBThread):
+    """
+    The DuckDB connection of one job database:
+      • `write` runs on the single writer connection, on the job's own thread, one call at a time
+      • `read` runs queries on one of `read_cursors` cursors in a reader pool, next to the writer.
+    Both take a function whose first argument is the connection/cursor to use.
+    """
+
+    def __init__(self, db_path: str, read_cursors: int = DB_READ_CURSORS):
+        super().__init__(f"duckdb-{os.path.basename(db_path)}")
+        self.db_path = db_path
+        self.read_cursors = max(1, read_cursors)
+        self.db_manager: Optional[ResumeDBManager] = None
+        self.con = None
+        self._cursors: asyncio.Queue = asyncio.Queue()
+        self._readers = ThreadPoolExecutor(
+            max_workers=self.read_cursors, thread_name_prefix=f"duckdb-read-{os.path.basename(db_path)}")
+
+    async def open(self) -> "JobConnection":
+        self.db_manager = await self.run(ResumeDBManager, self.db_path)
+        self.con = self.db_manager.con
+        for _ in range(self.read_cursors):
+            self._cursors.put_nowait(await self.run(self.con.cursor))
+        return self
+
+    async def write(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        return await self.run(fn, self.con, *args, **kwargs)
+
+    async def read(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        cursor = await self._cursors.get()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._readers, functools.partial(fn, cursor, *args, **kwargs))
+        finally:
+            self._cursors.put_nowait(cursor)
+
+    async def fetchall(self, query: str, params: Optional[list] = None) -> list:
+        return await self.read(lambda cursor: cursor.execute(query, params).fetchall())
+
+    async def close(self):
+        while not self._cursors.empty():
+            await self.run(self._cursors.get_nowait().close)
+        if self.db_manager is not None:
+            await self.run(self.db_manager.close)
+        # Joining the threads blocks until their last call returns, so wait on them off the event loop
+        await asyncio.to_thread(self._readers.shutdown, wait=True)
+        await asyncio.to_thread(self.shutdown)
+
+
+class JobConnectionManager:
+    """
+    Hands out one JobConnection per job database, shared by everything working on that job
+    (pipeline, scoring, generation, exports) and closed when its last user releases it.
+    """
+
+    def __init__(self):
+        self._connections: Dict[str, JobConnection] = {}
+        self._users: Dict[str, int] = {}
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, db_path: str) -> JobConnection:
+        key = os.path.abspath(db_path)
+        async with self._lock:
+            db = self._connections.get(key)
+            if db is None:
+                db = await JobConnection(key).open()
+                self._connections[key] = db
+            self._users[key] = self._users.get(key, 0) + 1
+            return db
+
+    async def release(self, db_path: str):
+        key = os.path.abspath(db_path)
+        async with self._lock:
+            self._users[key] -= 1
+            if self._users[key] > 0:
+                return
+            del self._users[key]
+            db = self._connections.pop(key)
+        await db.close()
+
+    @asynccontextmanager
+    async def connection(self, db_path: str) -> AsyncIterator[JobConnection]:
+        db = await self.acquire(db_path)
+        try:
+            yield db
+        finally:
+            await self.release(db_path)
+
+
+_manager: Optional[JobConnectionManager] = None
+_shared_thread: Optional[DBThread] = None
+
+
+def get_connection_manager() -> JobConnectionManager:
+    """The process-wide manager of job database connections"""
+    global _manager
+    if _manager is None:
+        _manager = JobConnectionManager()
+    return _manager
+
+
+def shared_db_thread() -> DBThread:
+    """The thread running queries on the stores shared by every job (jobs, resume and LLM caches)"""
+    global _shared_thread
+    if _shared_thread is None:
+        _shared_thread = DBThread("duckdb-shared")
+    return _shared_thread
@@ -0,0 +1,266 @@
+import json
+from typing import Dict, List, Optional, Tuple
+from .shared_duckdb import connect_shared
+
+
+def _other_upload(status: str) -> str:
+    """SQL condition: the job has an upload in `status` besides the one bound to the `?`"""
+    return (f"EXISTS (SELECT 1 FROM job_uploads u "
+            f"WHERE u.job_id = jobs.job_id AND u.zip_path <> ? AND u.status = '{status}')")
+
+
+class JobDBManager:
+    """
+    Encapsulates the DuckDB job tables shared by every upload:
+      • registering a submitted job, and each upload (ZIP) to it in `job_uploads`
+      • status transitions (queued → running → completed / failed, queued or running → cancelled,
+        failed, cancelled or interrupted → queued), a job is only done once none of its uploads is left
+      • storing the latest progress snapshot of a running job
+      • storing the final result payload or error.
+    """
+
+    def __init__(self, db_path: str):
+        self.con = connect_shared(db_path)
+        self._ensure_jobs_table()
+        self._ensure_uploads_table()
+
+    def _ensure_jobs_table(self):
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id      TEXT PRIMARY KEY,
+                status      TEXT,
+                prompt      TEXT,
+                filename    TEXT,
+                zip_path    TEXT,
+                priority    DOUBLE DEFAULT 1.0,
+                deadline_seconds DOUBLE,
+                progress    JSON,
+                result      JSON,
+                error       TEXT,
+                created_at  TIMESTAMP DEFAULT current_timestamp,
+                started_at  TIMESTAMP,
+                finished_at TIMESTAMP
+            );
+        """)
+        # Columns added since, for older job tables: the share of the LLM budget the job gets while
+        # other jobs run, its optional time budget once running, and its live progress.
+        # Checkpointed right away: DuckDB cannot replay these ALTERs from the WAL after a crash
+        # (the table has a current_timestamp default).
+        columns = {row[0] for row in self.con.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = 'jobs';").fetchall()}
+        for column, definition in (("priority", "DOUBLE DEFAULT 1.0"), ("deadline_seconds", "DOUBLE"),
+                                   ("progress", "JSON")):
+            if column not in columns:
+                self.con.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition};")
+                self.con.execute("CHECKPOINT;")
+
+    def _ensure_uploads_table(self):
+        """Uploads of each job: `queued` until a run processed them, then `done`, `failed` or `cancelled`"""
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS job_uploads (
+                job_id     TEXT,
+                zip_path   TEXT,
+                filename   TEXT,
+                status     TEXT,
+                created_at TIMESTAMP DEFAULT current_timestamp,
+                PRIMARY KEY (job_id, zip_path)
+            );
+        """)
+        # Jobs recorded before uploads were, with their one upload in the state of the job
+        self.con.execute("""
+            INSERT INTO job_uploads (job_id, zip_path, filename, status, created_at)
+            SELECT job_id, zip_path, filename,
+                   CASE status WHEN 'running' THEN 'queued' WHEN 'completed' THEN 'done' ELSE status END,
+                   created_at
+            FROM jobs
+            WHERE zip_path IS NOT NULL AND job_id NOT IN (SELECT job_id FROM job_uploads);
+        """)
+
+    def create_job(self, job_id: str, prompt: str, filename: str, zip_path: str, priority: float = 1.0,
+                   deadline_seconds: Optional[float] = None):
+        """
+        Registers a job, or another upload to an existing one. A job that is running stays running,
+        its new upload is run after the current one.
+        """
+        # The upload goes in first, so a job is never queued without something to run
+        self.con.execute(
+            "INSERT OR REPLACE INTO job_uploads (job_id, zip_path, filename, status) VALUES (?, ?, ?, 'queued')",
+            [job_id, zip_path, filename]
+        )
+        self.con.execute(
+            """
+            INSERT INTO jobs (job_id, status, prompt, filename, zip_path, priority, deadline_seconds,
+                              progress, created_at)
+            VALUES (?, 'queued', ?, ?, ?, ?, ?, NULL, current_timestamp)
+            ON CONFLICT (job_id) DO UPDATE SET
+                status = CASE WHEN jobs.status = 'running' THEN 'running' ELSE 'queued' END,
+                progress = CASE WHEN jobs.status = 'running' THEN jobs.progress END,
+                prompt = excluded.prompt, filename = excluded.filename, zip_path = excluded.zip_path,
+                priority = excluded.priority, deadline_seconds = excluded.deadline_seconds,
+                created_at = excluded.created_at
+            """,
+            [job_id, prompt, filename, zip_path, priority, deadline_seconds]
+        )
+
+    def mark_running(self, job_id: str, zip_path: str) -> bool:
+        """
+        Returns False if the upload is not waiting to run anymore, e.g. the job was cancelled before
+        it got to run. Uploads queued while an earlier run of the job was going still run after it.
+        """
+        row = self.con.execute(
+            """
+            UPDATE jobs
+            SET status = 'running', started_at = current_timestamp
+            WHERE job_id = ? AND status <> 'cancelled'
+              AND EXISTS (SELECT 1 FROM job_uploads u
+                          WHERE u.job_id = jobs.job_id AND u.zip_path = ? AND u.status = 'queued')
+            RETURNING job_id
+            """,
+            [job_id, zip_path]
+        ).fetchone()
+        return row is not None
+
+    def mark_cancelled(self, job_id: str) -> bool:
+        """Returns False unless the job was still queued or running, its uploads left to run are cancelled too"""
+        row = self.con.execute(
+            """
+            UPDATE jobs
+            SET status = 'cancelled', finished_at = current_timestamp
+            WHERE job_id = ? AND status IN ('queued', 'running')
+            RETURNING job_id
+            """,
+            [job_id]
+        ).fetchone()
+        if row is None:
+            return False
+        self.con.execute(
+            "UPDATE job_uploads SET status = 'cancelled' WHERE job_id = ? AND status = 'queued'", [job_id])
+        return True
+
+    def set_progress(self, job_id: str, progress: Dict):
+        self.con.execute("UPDATE jobs SET progress = ? WHERE job_id = ?", [json.dumps(progress), job_id])
+
+    def get_progress(self, job_id: str) -> Optional[Tuple[str, Optional[Dict]]]:
+        """(status, latest progress snapshot) of a job, None if it is unknown"""
+        row = self.con.execute("SELECT status, progress FROM jobs WHERE job_id = ?", [job_id]).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]) if row[1] else None
+
+    def mark_completed(self, job_id: str, zip_path: str, result: Dict):
+        """
+        Stores the result of the run of an upload. The job is only `completed` once no other upload
+        of it is queued (it goes back to `queued`) or failed (it stays `failed`).
+        """
+        # The job before the upload: should the process stop in between, the upload is just run again
+        self.con.execute(
+            f"""
+            UPDATE jobs
+            SET status = CASE WHEN {_other_upload('queued')} THEN 'queued'
+                              WHEN {_other_upload('failed')} THEN 'failed'
+                              ELSE 'completed' END,
+                error = CASE WHEN {_other_upload('failed')} THEN error END,
+                result = ?, finished_at = current_timestamp
+            WHERE job_id = ? AND status <> 'cancelled'
+            """,
+            [zip_path, zip_path, zip_path, json.dumps(result), job_id]
+        )
+        self.con.execute(
+            "UPDATE job_uploads SET status = 'done' WHERE job_id = ? AND zip_path = ? AND status = 'queued'",
+            [job_id, zip_path])
+
+    def mark_failed(self, job_id: str, zip_path: str, error: str):
+        """Records the failed run of an upload, the job is `failed` once no other upload of it is queued"""
+        self.con.execute(
+            f"""
+            UPDATE jobs
+            SET status = CASE WHEN {_other_upload('queued')} THEN 'queued' ELSE 'failed' END,
+                error = ?, finished_at = current_timestamp
+            WHERE job_id = ? AND status <> 'cancelled'
+            """,
+            [zip_path, error, job_id]
+        )
+        self.con.execute(
+            "UPDATE job_uploads SET status = 'failed' WHERE job_id = ? AND zip_path = ? AND status = 'queued'",
+            [job_id, zip_path])
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        row = self.con.execute(
+            """
+            SELECT job_id, status, prompt, filename, zip_path, priority, deadline_seconds, progress, result, error,
+                   created_at, started_at, finished_at
+            FROM jobs
+            WHERE job_id = ?
+            """,
+            [job_id]
+        ).fetchone()
+        if row is None:
+            return None
+
+        keys = ["job_id", "status", "prompt", "filename", "zip_path", "priority", "deadline_seconds", "progress",
+                "result", "error", "created_at", "started_at", "finished_at"]
+        job = dict(zip(keys, row))
+        for key in ("progress", "result"):
+            job[key] = json.loads(job[key]) if job[key] else None
+        for key in ("created_at", "started_at", "finished_at"):
+            if job[key] is not None:
+                job[key] = job[key].isoformat()
+        uploads = self.con.execute(
+            "SELECT filename, status, created_at FROM job_uploads WHERE job_id = ? ORDER BY created_at",
+            [job_id]
+        ).fetchall()
+        job["uploads"] = [{"filename": filename, "status": status, "created_at": created_at.isoformat()}
+                          for filename, status, created_at in uploads]
+        return job
+
+    def _queued_upload_tasks(self, job_id: Optional[str] = None) -> List[Tuple[str, str, str, str, float, Optional[float]]]:
+        """(prompt, job_id, zip_path, filename, priority, deadline_seconds) of the queued uploads, oldest first"""
+        rows = self.con.execute(
+            f"""
+            SELECT j.prompt, j.job_id, u.zip_path, u.filename, j.priority, j.deadline_seconds
+            FROM job_uploads u JOIN jobs j ON j.job_id = u.job_id
+            WHERE u.status = 'queued' AND j.status <> 'cancelled'{'' if job_id is None else ' AND j.job_id = ?'}
+            ORDER BY u.created_at
+            """,
+            [] if job_id is None else [job_id]
+        ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def requeue_interrupted_jobs(self) -> List[Tuple[str, str, str, str, float, Optional[float]]]:
+        """
+        Puts the jobs with uploads still to run back to `queued`, since their in-memory queue entries
+        did not survive the restart. Their per-resume stage state lets them resume where they stopped.
+        Returns a task for every queued upload, e.g. both the upload a run stopped in and a top-up behind it.
+        """
+        self.con.execute("""
+            UPDATE jobs
+            SET status = 'queued', started_at = NULL, progress = NULL
+            WHERE status <> 'cancelled'
+              AND job_id IN (SELECT job_id FROM job_uploads WHERE status = 'queued');
+        """)
+        return self._queued_upload_tasks()
+
+    def requeue_stopped_job(self, job_id: str) -> List[Tuple[str, str, str, str, float, Optional[float]]]:
+        """
+        Puts a failed or cancelled job back to `queued`, with the uploads that failed or were cancelled.
+        Returns their tasks, none if the job is neither failed nor cancelled.
+        """
+        # The uploads before the job, so a queued job always has something to run
+        self.con.execute("""
+            UPDATE job_uploads SET status = 'queued'
+            WHERE job_id = ? AND status IN ('failed', 'cancelled')
+              AND job_id IN (SELECT job_id FROM jobs WHERE status IN ('failed', 'cancelled'));
+        """, [job_id])
+        row = self.con.execute("""
+            UPDATE jobs
+            SET status = 'queued', error = NULL, progress = NULL, started_at = NULL, finished_at = NULL
+            WHERE job_id = ? AND status IN ('failed', 'cancelled')
+              AND job_id IN (SELECT job_id FROM job_uploads WHERE status = 'queued')
+            RETURNING job_id;
+        """, [job_id]).fetchone()
+        if row is None:
+            return []
+        return self._queued_upload_tasks(job_id)
+
+    def close(self):
+        self.con.close()
@@ -0,0 +1,92 @@
+import hashlib
+import numpy as np
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from .cache_db_utils import normalize_text
+
+# Mersenne prime 2^31 - 1 keeps (a * h + b) inside uint64 without overflow
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+class MinHashLSH:
+    """
+    In-memory MinHash/LSH index over shingled resume text:
+      • a MinHash signature per resume from word shingles
+      • banded LSH buckets, so a lookup only compares against colliding resumes
+      • Jaccard estimate from signature agreement to confirm a near-duplicate.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 5,
+        seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, Set[str]]] = [
+            defaultdict(set) for _ in range(bands)]
+
+    def _shingles(self, text: str) -> Set[str]:
+        tokens = normalize_text(text).split()
+        if len(tokens) <= self.shingle_size:
+            return {" ".join(tokens)}
+        return {" ".join(tokens[i:i + self.shingle_size])
+                for i in range(len(tokens) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+             for s in self._shingles(text)),
+            dtype=np.uint64
+        ) % _PRIME
+        # (num_shingles, num_perm) permuted hashes, min over shingles
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def query(self, signature: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Returns (key, estimated Jaccard) of the closest indexed resume above the threshold"""
+        candidates: Set[str] = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best = None
+        for candidate in candidates:
+            similarity = float(
+                np.mean(self._signatures[candidate] == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (candidate, similarity)
+        return best
+
+    def insert(self, key: str, signature: np.ndarray):
+        self._signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band][band_key].add(key)
+
+    def remove(self, key: str):
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band][band_key].discard(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
@@ -3,8 +3,73 @@ import json
 import uuid
 import duckdb
 import asyncio
+from datetime import date
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
+
+from ..date_utils import normalize_resume_dates, without_normalized_dates
+from .batch_writer import ResumeBatchWriter
+from .cache_db_utils import content_hash
+from .stage_state import dead_lettered_hashes, ensure_stage_tables, record_failure
+
+
+_DATED_FIELDS = {"from_date": "VARCHAR", "to_date": "VARCHAR",
+                 "start_date": "DATE", "end_date": "DATE", "is_current": "BOOLEAN"}
+
+# json_transform structure of the ResumeJSON sections stored as typed columns,
+# with the dates normalized at ingest
+RESUME_STRUCTURE = {
+    "personal_information": {
+        "first_name": "VARCHAR", "last_name": "VARCHAR", "phone_number": "VARCHAR",
+        "email_address": "VARCHAR", "linkedin_url": "VARCHAR", "website_url": "VARCHAR",
+        "headline": "VARCHAR", "github_url": "VARCHAR"
+    },
+    "skill": {"category": "VARCHAR", "skill_values": ["VARCHAR"]},
+    "work_experience": [{
+        "company_name": "VARCHAR", "job_title": "VARCHAR", "city": "VARCHAR", "country": "VARCHAR",
+        "from_date": "VARCHAR", "to_date": "VARCHAR", "description": "VARCHAR", **_DATED_FIELDS
+    }],
+    "education": [{
+        "institution_name": "VARCHAR", "field_of_study": "VARCHAR", "degree": "VARCHAR",
+        "grade": "VARCHAR", "city": "VARCHAR", "country": "VARCHAR",
+        "from_date": "VARCHAR", "to_date": "VARCHAR", "description": "VARCHAR", **_DATED_FIELDS
+    }],
+    "projects": [{
+        "title": "VARCHAR", "project_role": "VARCHAR", "city": "VARCHAR", "country": "VARCHAR",
+        "from_date": "VARCHAR", "to_date": "VARCHAR", "description": "VARCHAR", **_DATED_FIELDS
+    }],
+}
+TYPED_RESUME_COLUMNS = list(RESUME_STRUCTURE)
+_STRUCTURE_SQL = json.dumps(RESUME_STRUCTURE)
+
+
+def _sql_type(structure) -> str:
+    if isinstance(structure, dict):
+        return "STRUCT(" + ", ".join(f"{name} {_sql_type(field)}" for name, field in structure.items()) + ")"
+    if isinstance(structure, list):
+        return _sql_type(structure[0]) + "[]"
+    return structure
+
+
+def _from_typed(value):
+    """Typed column value back to ResumeJSON form: ISO date strings, NULL fields dropped"""
+    if isinstance(value, dict):
+        return {k: _from_typed(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_from_typed(v) for v in value]
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def resume_from_typed_columns(*values, normalized_dates: bool = True) -> Dict:
+    """
+    Rebuilds the parsed resume sections from a row of TYPED_RESUME_COLUMNS, in that order.
+    Pass `normalized_dates=False` for a resume going into a prompt, to leave out the ingest-time date fields.
+    """
+    resume = {column: _from_typed(value) for column, value in zip(TYPED_RESUME_COLUMNS, values)
+              if value is not None}
+    return resume if normalized_dates else without_normalized_dates(resume)
 
 
 class ResumeDBManager:
@@ -23,7 +88,7 @@ class ResumeDBManager:
             print(f"[+] Created new DuckDB database at '{db_path}'")
 
         self._ensure_main_table()
-        self.con.execute("DROP TABLE IF EXISTS duplicate_resumes;")
+        ensure_stage_tables(self.con)
 
     def _ensure_main_table(self):
         self.con.execute("""
@@ -37,6 +102,26 @@ class ResumeDBManager:
                 file_path TEXT
             );
         """)
+        for column in ("content_hash", "text_hash"):
+            self.con.execute(
+                f"ALTER TABLE resumes ADD COLUMN IF NOT EXISTS {column} TEXT;")
+        self._ensure_typed_columns()
+
+    def _ensure_typed_columns(self):
+        """Typed copies of the main ResumeJSON sections, backfilled from `raw` for older rows"""
+        for column in TYPED_RESUME_COLUMNS:
+            self.con.execute(
+                f"ALTER TABLE resumes ADD COLUMN IF NOT EXISTS {column} {_sql_type(RESUME_STRUCTURE[column])};")
+        self.con.execute(f"""
+            UPDATE resumes
+            SET {", ".join(f"{column} = typed.t.{column}" for column in TYPED_RESUME_COLUMNS)}
+            FROM (
+                SELECT id, json_transform(raw, '{_STRUCTURE_SQL}') AS t
+                FROM resumes
+                WHERE personal_information IS NULL AND raw IS NOT NULL
+            ) AS typed
+            WHERE resumes.id = typed.id;
+        """)
 
     def insert_resume_row(
         self,
@@ -46,26 +131,129 @@ class ResumeDBManager:
         phone: Optional[str],
         job_id: str,
         raw_json_str: str,
-        file_path: str
+        file_path: str,
+        content_hash: Optional[str] = None,
+        text_hash: Optional[str] = None,
+        typed_json_str: Optional[str] = None
+    ):
+        self.insert_resume_rows([{
+            "resume_id": resume_id, "name": name, "email": email, "phone": phone, "job_id": job_id,
+            "raw_json_str": raw_json_str, "file_path": file_path,
+            "content_hash": content_hash, "text_hash": text_hash, "typed_json_str": typed_json_str
+        }])
+
+    def insert_resume_rows(self, rows: List[Dict]):
+        """
+        Appends many `insert_resume_row` keyword dicts in a single INSERT. The typed columns are
+        decoded from `typed_json_str` (the resume with its dates normalized) when given, else from `raw`.
+        """
+        if not rows:
+            return
+        values = ", ".join(["(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"] * len(rows))
+        params = []
+        for row in rows:
+            params.extend([row["resume_id"], row["name"], row["email"], row["phone"], row["job_id"],
+                           row["raw_json_str"], row["file_path"],
+                           row.get("content_hash"), row.get("text_hash"), row.get("typed_json_str")])
+
+        # The typed columns are decoded by DuckDB in the same statement
+        self.con.execute(
+            f"""
+            INSERT INTO resumes (id, name, email, phone, job_id, raw, file_path, content_hash, text_hash,
+                                 {", ".join(TYPED_RESUME_COLUMNS)})
+            SELECT id, name, email, phone, job_id, raw, file_path, content_hash, text_hash,
+                   {", ".join(f"t.{column}" for column in TYPED_RESUME_COLUMNS)}
+            FROM (
+                SELECT *, json_transform(COALESCE(typed, raw), '{_STRUCTURE_SQL}') AS t
+                FROM (
+                    SELECT id::TEXT AS id, name::TEXT AS name, email::TEXT AS email,
+                           phone::TEXT AS phone, job_id::TEXT AS job_id, raw::JSON AS raw,
+                           file_path::TEXT AS file_path, content_hash::TEXT AS content_hash,
+                           text_hash::TEXT AS text_hash, typed::JSON AS typed
+                    FROM (VALUES {values})
+                        AS batch(id, name, email, phone, job_id, raw, file_path, content_hash, text_hash, typed)
+                )
+            )
+            """,
+            params
+        )
+
+    def ensure_duplicates_table(self):
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS duplicate_resumes (
+                id              TEXT,
+                name            TEXT,
+                email           TEXT,
+                phone           TEXT,
+                job_id          TEXT,
+                raw             JSON,
+                duplicate_of_id TEXT
+            );
+        """)
+        for column, dtype in [("file_path", "TEXT"), ("content_hash", "TEXT"), ("text_hash", "TEXT"),
+                              ("duplicate_type", "TEXT"), ("similarity", "DOUBLE")]:
+            self.con.execute(
+                f"ALTER TABLE duplicate_resumes ADD COLUMN IF NOT EXISTS {column} {dtype};")
+
+    def insert_duplicate_row(
+        self,
+        resume_id: str,
+        name: Optional[str],
+        email: Optional[str],
+        phone: Optional[str],
+        job_id: str,
+        raw_json_str: str,
+        duplicate_of_id: str,
+        file_path: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        text_hash: Optional[str] = None,
+        duplicate_type: Optional[str] = None,
+        similarity: Optional[float] = None
     ):
+        """
+        `duplicate_type` is 'exact' (same normalized text), 'near' (MinHash cluster,
+        with its estimated `similarity`) or 'identity' (same name and email).
+        """
+        self.insert_duplicate_rows([{
+            "resume_id": resume_id, "name": name, "email": email, "phone": phone, "job_id": job_id,
+            "raw_json_str": raw_json_str, "duplicate_of_id": duplicate_of_id, "file_path": file_path,
+            "content_hash": content_hash, "text_hash": text_hash,
+            "duplicate_type": duplicate_type, "similarity": similarity
+        }])
+
+    def insert_duplicate_rows(self, rows: List[Dict]):
+        """Appends many `insert_duplicate_row` keyword dicts in a single INSERT"""
+        if not rows:
+            return
+        values = ", ".join(
+            ["(?, ?, ?, ?, ?, ?::JSON, ?, ?, ?, ?, ?, ?::DOUBLE)"] * len(rows))
+        params = []
+        for row in rows:
+            params.extend([row["resume_id"], row["name"], row["email"], row["phone"], row["job_id"],
+                           row["raw_json_str"], row["duplicate_of_id"], row.get("file_path"),
+                           row.get("content_hash"), row.get("text_hash"),
+                           row.get("duplicate_type"), row.get("similarity")])
         self.con.execute(
-            """
-            INSERT INTO resumes (id, name, email, phone, job_id, raw, file_path)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            f"""
+            INSERT INTO duplicate_resumes (id, name, email, phone, job_id, raw, duplicate_of_id,
+                                           file_path, content_hash, text_hash, duplicate_type, similarity)
+            VALUES {values}
             """,
-            [resume_id, name, email, phone, job_id, raw_json_str, file_path]
+            params
         )
 
     def identify_and_store_duplicates(self) -> int:
         """
-        Identifies duplicates by (name, email) and moves all but one into `duplicate_resumes`,
-        with a foreign key reference to the original resume's ID.
+        Identifies duplicates by (name, email) and moves all but the earliest inserted one into
+        `duplicate_resumes`, with a foreign key reference to the original resume's ID.
+        Duplicates found by earlier runs of the job are kept.
         Returns the number of rows moved.
         """
-        self.con.execute("DROP TABLE IF EXISTS duplicate_resumes;")
+        self.ensure_duplicates_table()
 
-        self.con.execute("""
-            CREATE TABLE duplicate_resumes AS
+        moved = self.con.execute("""
+            INSERT INTO duplicate_resumes (id, name, email, phone, job_id, raw, duplicate_of_id,
+                                           file_path, content_hash, text_hash, duplicate_type)
             WITH grouped AS (
                 SELECT
                     id,
@@ -74,79 +262,129 @@ class ResumeDBManager:
                     phone,
                     job_id,
                     raw,
+                    file_path,
+                    content_hash,
+                    text_hash,
                     ROW_NUMBER() OVER (
                         PARTITION BY name, email
-                        ORDER BY id
+                        ORDER BY rowid
                     ) AS row_num,
                     FIRST_VALUE(id) OVER (
                         PARTITION BY name, email
-                        ORDER BY id
+                        ORDER BY rowid
                     ) AS original_id
                 FROM resumes
                 WHERE name IS NOT NULL AND email IS NOT NULL
             )
-            SELECT 
+            SELECT
                 id,
                 name,
                 email,
                 phone,
                 job_id,
                 raw,
-                original_id AS duplicate_of_id
+                original_id AS duplicate_of_id,
+                file_path,
+                content_hash,
+                text_hash,
+                'identity' AS duplicate_type
             FROM grouped
-            WHERE row_num > 1;
-        """)
+            WHERE row_num > 1
+            RETURNING id;
+        """).fetchall()
 
         self.con.execute("""
             DELETE FROM resumes
             WHERE id IN (SELECT id FROM duplicate_resumes);
         """)
 
-        dup_count = self.con.execute(
-            "SELECT COUNT(*) FROM duplicate_resumes;").fetchone()[0]
-        return dup_count
+        return len(moved)
+
+    def processed_content_hashes(self) -> Set[str]:
+        """Content hashes of every file this job has already handled: stored, as a resume or a duplicate, or dead-lettered"""
+        self.ensure_duplicates_table()
+        rows = self.con.execute("""
+            SELECT content_hash FROM resumes WHERE content_hash IS NOT NULL
+            UNION
+            SELECT content_hash FROM duplicate_resumes WHERE content_hash IS NOT NULL;
+        """).fetchall()
+        return {row[0] for row in rows} | dead_lettered_hashes(self.con)
+
+    def _ensure_job_requirements_table(self):
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS job_requirements (
+                requirements JSON,
+                created_at   TIMESTAMP DEFAULT current_timestamp
+            );
+        """)
+
+    def save_job_requirements(self, requirements: Dict):
+        """Stores the requirements the job is scored against, so later top-ups score alike"""
+        self._ensure_job_requirements_table()
+        self.con.execute("DELETE FROM job_requirements;")
+        self.con.execute(
+            "INSERT INTO job_requirements (requirements) VALUES (?);", [json.dumps(requirements)])
+
+    def load_job_requirements(self) -> Optional[Dict]:
+        self._ensure_job_requirements_table()
+        row = self.con.execute(
+            "SELECT requirements FROM job_requirements LIMIT 1;").fetchone()
+        return json.loads(row[0]) if row else None
 
     def close(self):
         self.con.close()
 
 
+def build_resume_row(parsed_dict: Dict, job_id: str, file_path: str, resume_id: Optional[str] = None) -> Dict:
+    name = (parsed_dict.get("personal_information").get("first_name", "").strip() + " " +
+            parsed_dict.get("personal_information").get("last_name", "").strip()) or None
+    email = parsed_dict.get("personal_information").get(
+        "email_address", "").strip() or None
+    phone = parsed_dict.get("personal_information").get(
+        "phone_number", "").strip() or None
+
+    return {
+        "resume_id": resume_id or str(uuid.uuid4()),
+        "name": name,
+        "email": email,
+        "phone": phone,
+        "job_id": job_id,
+        "raw_json_str": json.dumps(parsed_dict),
+        # Dates are normalized once here, for the typed columns scorers read. `raw` stays as
+        # parsed, since prompts are built from it
+        "typed_json_str": json.dumps(normalize_resume_dates(parsed_dict)),
+        "file_path": file_path
+    }
+
+
 async def parse_and_insert_file(
     file_path: str,
     job_id: str,
-    db_manager: ResumeDBManager,
     parser: any,
-    db_lock: asyncio.Lock
+    writer: ResumeBatchWriter,
+    processed: Optional[Set[str]] = None
 ):
+    c_hash = None
     try:
-        parsed_dict = await parser.parse(file_path)
+        data = await asyncio.to_thread(Path(file_path).read_bytes)
+        c_hash = content_hash(data)
+        if processed is not None and c_hash in processed:
+            print(f"[=] Skipping '{file_path}', already processed for this job")
+            return
+        parsed_dict = await parser.parse_bytes(data, file_path)
     except Exception as e:
         print(f"[!] Failed to parse '{file_path}': {e}")
+        if c_hash is not None:
+            # Retried by the job's next run, until dead-lettered
+            await writer.db.write(record_failure, c_hash, file_path, "parsed", str(e))
         return
 
-    name = (parsed_dict.get("personal_information").get("first_name", "").strip() + " " +
-            parsed_dict.get("personal_information").get("last_name", "").strip()) or None
-    email = parsed_dict.get("personal_information").get(
-        "email_address", "").strip() or None
-    phone = parsed_dict.get("personal_information").get(
-        "phone_number", "").strip() or None
-
-    resume_id = str(uuid.uuid4())
-    raw_json_str = json.dumps(parsed_dict)
+    row = build_resume_row(parsed_dict, job_id=job_id, file_path=file_path)
 
-    async with db_lock:
-        try:
-            db_manager.insert_resume_row(
-                resume_id=resume_id,
-                name=name,
-                email=email,
-                phone=phone,
-                job_id=job_id,
-                raw_json_str=raw_json_str,
-                file_path=file_path
-            )
-            print(f"[+] Inserted '{file_path}' (resume_id={resume_id})")
-        except Exception as e:
-            print(f"[!] DB insert error for '{file_path}': {e}")
+    try:
+        await writer.write_resume(content_hash=c_hash, **row)
+    except Exception as e:
+        print(f"[!] DB insert error for '{file_path}': {e}")
 
 
 def collect_resume_paths(folder_path: str, extensions: List[str] = None) -> List[str]:
@@ -170,35 +408,41 @@ async def process_folder_concurrently(
     db_path: str,
     parser: any,
 ):
-    db_manager = ResumeDBManager(db_path=db_path)
-    db_lock = asyncio.Lock()
-
     try:
         resume_paths = collect_resume_paths(folder_path)
     except ValueError as ve:
         print(f"[!] {ve}")
-        db_manager.close()
         return
 
     if not resume_paths:
         print(f"[!] No resume files found under '{folder_path}'")
-        db_manager.close()
         return
 
-    tasks = [
-        parse_and_insert_file(
-            file_path=path,
-            job_id=job_id,
-            db_manager=db_manager,
-            parser=parser,
-            db_lock=db_lock
-        ) for path in resume_paths
-    ]
+    # Imported here, the connection manager itself builds on ResumeDBManager
+    from .connection_manager import get_connection_manager
+    manager = get_connection_manager()
+    db = await manager.acquire(db_path)
+    writer = ResumeBatchWriter(db).start()
+    try:
+        # Files already stored by an earlier run of this job are not parsed again
+        processed = await db.run(db.db_manager.processed_content_hashes)
 
-    await asyncio.gather(*tasks)
+        tasks = [
+            parse_and_insert_file(
+                file_path=path,
+                job_id=job_id,
+                parser=parser,
+                writer=writer,
+                processed=processed
+            ) for path in resume_paths
+        ]
+        await asyncio.gather(*tasks)
+        await writer.close()
 
-    dup_count = db_manager.identify_and_store_duplicates()
-    print(
-        f"[!] Found {dup_count} duplicate resume row(s) → stored in 'duplicate_resumes'.")
+        dup_count = await db.run(db.db_manager.identify_and_store_duplicates)
+        print(
+            f"[!] Found {dup_count} duplicate resume row(s) → stored in 'duplicate_resumes'.")
+    finally:
+        await writer.close()
+        await manager.release(db_path)
 
-    db_manager.close()
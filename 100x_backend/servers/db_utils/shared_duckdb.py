@@ -0,0 +1,75 @@
+import os
+import time
+import random
+import duckdb
+from typing import Any, List, Optional
+
+# "broker" when the API and separate worker processes share the stores, set by `main.py api|worker`
+JOB_RUNNER = os.getenv("job_runner", "local")
+# How long a statement waits for another process to let go of a shared database file
+DB_LOCK_TIMEOUT_SECONDS = float(os.getenv("db_lock_timeout_seconds", 30))
+
+
+class _Rows:
+    def __init__(self, rows: List[tuple]):
+        self._rows = rows
+
+    def fetchone(self) -> Optional[tuple]:
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self) -> List[tuple]:
+        return list(self._rows)
+
+
+class ProcessSharedDuckDB:
+    """
+    Stands in for the connection to a DuckDB file several processes use. DuckDB lets one process
+    hold a file at a time, so each statement opens the file, runs, and closes it again, retrying
+    with backoff while another process holds the lock. Results are fetched before closing.
+    """
+
+    def __init__(self, db_path: str, lock_timeout: float = DB_LOCK_TIMEOUT_SECONDS):
+        self.db_path = db_path
+        self.lock_timeout = lock_timeout
+
+    def _connect(self) -> duckdb.DuckDBPyConnection:
+        deadline = time.monotonic() + self.lock_timeout
+        delay = 0.005
+        while True:
+            try:
+                return duckdb.connect(database=self.db_path)
+            except duckdb.IOException as e:
+                if "lock" not in str(e).lower() or time.monotonic() >= deadline:
+                    raise
+            time.sleep(random.uniform(0, delay))
+            delay = min(delay * 2, 0.5)
+
+    def execute(self, query: str, params: Optional[Any] = None) -> _Rows:
+        con = self._connect()
+        try:
+            result = con.execute(query, params)
+            try:
+                return _Rows(result.fetchall())
+            except duckdb.InvalidInputError:
+                # Statements without a result set
+                return _Rows([])
+        finally:
+            con.close()
+
+    def executemany(self, query: str, params: List[Any]) -> _Rows:
+        con = self._connect()
+        try:
+            con.executemany(query, params)
+            return _Rows([])
+        finally:
+            con.close()
+
+    def close(self):
+        pass
+
+
+def connect_shared(db_path: str):
+    """Connection to a store shared by every job, per statement when other processes use it too"""
+    if JOB_RUNNER == "broker":
+        return ProcessSharedDuckDB(db_path)
+    return duckdb.connect(database=db_path)
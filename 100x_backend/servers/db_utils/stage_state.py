@@ -0,0 +1,114 @@
+import os
+import functools
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple, Union
+
+# Per-resume progress through a job, in order
+STAGES = ("extracted", "parsed", "ats_scored", "smart_scored", "qa_generated")
+# Failed attempts after which a file is dead-lettered instead of retried on the job's next run
+MAX_ATTEMPTS = int(os.getenv("pipeline_max_attempts", 3))
+
+
+def ensure_stage_tables(con):
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS resume_stages (
+            content_hash TEXT PRIMARY KEY,
+            file_path    TEXT,
+            resume_id    TEXT,
+            stage        TEXT,
+            updated_at   TIMESTAMP DEFAULT current_timestamp
+        );
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS resume_failures (
+            content_hash  TEXT PRIMARY KEY,
+            file_path     TEXT,
+            stage         TEXT,
+            attempts      INTEGER,
+            last_error    TEXT,
+            dead_lettered BOOLEAN,
+            updated_at    TIMESTAMP DEFAULT current_timestamp
+        );
+    """)
+
+
+def set_stages(con, entries: Iterable[Tuple[str, str, Optional[str], Optional[str]]]):
+    """
+    Records (content hash, stage, file path, resume id) entries, missing paths/ids are kept.
+    A file's stage only moves forward, e.g. a byte-identical copy being extracted leaves it where it is.
+    Reaching the stage a file failed at clears its failure, dead-lettered files stay recorded.
+    """
+    entries = list(entries)
+    if not entries:
+        return
+    for content_hash, stage, _, _ in entries:
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage '{stage}', expected one of {STAGES}")
+    order = "[" + ", ".join(f"'{stage}'" for stage in STAGES) + "]"
+    con.executemany(f"""
+        INSERT INTO resume_stages (content_hash, stage, file_path, resume_id, updated_at)
+        VALUES (?, ?, ?, ?, current_timestamp)
+        ON CONFLICT (content_hash) DO UPDATE SET
+            stage = CASE WHEN list_position({order}, excluded.stage) > list_position({order}, resume_stages.stage)
+                         THEN excluded.stage ELSE resume_stages.stage END,
+            file_path = COALESCE(excluded.file_path, resume_stages.file_path),
+            resume_id = COALESCE(excluded.resume_id, resume_stages.resume_id),
+            updated_at = excluded.updated_at;
+    """, [list(entry) for entry in entries])
+    con.executemany("DELETE FROM resume_failures WHERE content_hash = ? AND stage = ? AND NOT dead_lettered;",
+                    [[entry[0], entry[1]] for entry in entries])
+
+
+def set_stage(con, content_hash: str, stage: str, file_path: Optional[str] = None, resume_id: Optional[str] = None):
+    set_stages(con, [(content_hash, stage, file_path, resume_id)])
+
+
+def run_stage(con, content_hash: Union[str, List[str], None], stage: str, fn: Callable[..., Any], *args,
+              **kwargs) -> Any:
+    """
+    Runs `fn(con, ...)` and records the stage of one content hash, or of a batch's list of them,
+    in one transaction, so neither lands without the other
+    """
+    hashes = [content_hash] if isinstance(content_hash, str) else [h for h in content_hash or [] if h]
+    if not hashes:
+        return fn(con, *args, **kwargs)
+    con.begin()
+    try:
+        result = fn(con, *args, **kwargs)
+        set_stages(con, [(h, stage, None, None) for h in hashes])
+        con.commit()
+    except BaseException:
+        con.rollback()
+        raise
+    return result
+
+
+def in_stage(fn: Callable[..., Any], content_hash: Union[str, List[str], None], stage: str) -> Callable[..., Any]:
+    """`fn(con, ...)` wrapped by `run_stage`, for `JobConnection.write`"""
+    @functools.wraps(fn)
+    def staged(con, *args, **kwargs):
+        return run_stage(con, content_hash, stage, fn, *args, **kwargs)
+    return staged
+
+
+def record_failure(con, content_hash: str, file_path: Optional[str], stage: str, error: str,
+                   max_attempts: int = MAX_ATTEMPTS) -> bool:
+    """Counts a failed attempt at `stage`, returns True once the file is dead-lettered"""
+    row = con.execute("""
+        INSERT INTO resume_failures (content_hash, file_path, stage, attempts, last_error, dead_lettered, updated_at)
+        VALUES (?, ?, ?, 1, ?, 1 >= ?, current_timestamp)
+        ON CONFLICT (content_hash) DO UPDATE SET
+            file_path = COALESCE(excluded.file_path, resume_failures.file_path),
+            stage = excluded.stage,
+            attempts = resume_failures.attempts + 1,
+            last_error = excluded.last_error,
+            dead_lettered = resume_failures.attempts + 1 >= ?,
+            updated_at = excluded.updated_at
+        RETURNING dead_lettered;
+    """, [content_hash, file_path, stage, error, max_attempts, max_attempts]).fetchone()
+    return bool(row[0])
+
+
+def dead_lettered_hashes(con) -> Set[str]:
+    rows = con.execute(
+        "SELECT content_hash FROM resume_failures WHERE dead_lettered;").fetchall()
+    return {row[0] for row in rows}
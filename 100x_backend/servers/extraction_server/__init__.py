@@ -1,4 +1,5 @@
 from .resume_parser import ResumeParser
 from .server import parse
+from .ingestion import ResumeSource, iter_zip_resumes, count_zip_resumes
 
-__all__ = ['ResumeParser', 'parse']
+__all__ = ['ResumeParser', 'parse', 'ResumeSource', 'iter_zip_resumes', 'count_zip_resumes']
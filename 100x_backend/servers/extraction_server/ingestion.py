@@ -0,0 +1,75 @@
+import os
+import asyncio
+import zipfile
+from dataclasses import dataclass
+from typing import AsyncIterator, Tuple
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+MAX_RESUME_BYTES = int(os.getenv("max_resume_bytes", 10 * 1024 * 1024))
+
+
+@dataclass
+class ResumeSource:
+    """A resume file held in memory, ready for text extraction"""
+    file_path: str
+    data: bytes
+
+
+def _is_wanted_member(info: zipfile.ZipInfo, extensions: Tuple[str, ...], max_bytes: int, log: bool = True) -> bool:
+    name = info.filename
+    if info.is_dir() or name.startswith("__MACOSX/") or os.path.basename(name).startswith("._"):
+        return False
+    if not name.lower().endswith(extensions):
+        if log:
+            print(f"[!] Skipping unsupported member '{name}'")
+        return False
+    if info.file_size > max_bytes:
+        if log:
+            print(f"[!] Skipping oversized member '{name}' ({info.file_size} bytes)")
+        return False
+    return True
+
+
+def _read_member(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, max_bytes: int) -> bytes:
+    # The header size can lie, so never decompress more than the cap
+    with zip_ref.open(info) as member:
+        data = member.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise ValueError(f"member '{info.filename}' exceeds {max_bytes} bytes")
+    return data
+
+
+async def iter_zip_resumes(
+    zip_path: str,
+    extensions: Tuple[str, ...] = SUPPORTED_EXTENSIONS,
+    max_bytes: int = MAX_RESUME_BYTES
+) -> AsyncIterator[ResumeSource]:
+    """
+    Yields supported resume members of a ZIP one at a time, straight from the archive.
+    Unsupported and oversized members are skipped from the central directory alone, and
+    members are decompressed off the event loop only when the consumer asks for the next one,
+    so memory stays bounded by what the consumer keeps in flight.
+    """
+    zip_ref = await asyncio.to_thread(zipfile.ZipFile, zip_path, 'r')
+    try:
+        for info in zip_ref.infolist():
+            if not _is_wanted_member(info, extensions, max_bytes):
+                continue
+            try:
+                data = await asyncio.to_thread(_read_member, zip_ref, info, max_bytes)
+            except Exception as e:
+                print(f"[!] Failed to read '{info.filename}' from '{zip_path}': {e}")
+                continue
+            yield ResumeSource(file_path=os.path.join(zip_path, info.filename), data=data)
+    finally:
+        zip_ref.close()
+
+
+def count_zip_resumes(
+    zip_path: str,
+    extensions: Tuple[str, ...] = SUPPORTED_EXTENSIONS,
+    max_bytes: int = MAX_RESUME_BYTES
+) -> int:
+    """Number of members `iter_zip_resumes` will yield, from the central directory alone"""
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        return sum(1 for info in zip_ref.infolist() if _is_wanted_member(info, extensions, max_bytes, log=False))
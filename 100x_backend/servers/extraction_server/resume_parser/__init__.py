@@ -1,3 +1,5 @@
-from .core import ResumeParser
+from .core import ResumeParser, ExtractedResume, extract_text
+from .executor import get_extraction_executor, recycle_extraction_executor, shutdown_extraction_executor
 
-__all__ = ["ResumeParser"]
+__all__ = ["ResumeParser", "ExtractedResume", "extract_text",
+           "get_extraction_executor", "recycle_extraction_executor", "shutdown_extraction_executor"]
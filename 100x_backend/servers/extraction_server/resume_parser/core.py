@@ -1,8 +1,16 @@
+import io
 import re
 import docx
 import fitz
-from typing import Dict
+import asyncio
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Dict, Optional
 from ...connectors import BaseConnector
+from ...db_utils import ResumeCacheManager, content_hash, shared_db_thread, text_hash
+from .executor import EXTRACTION_MAX_PAGES, EXTRACTION_TIMEOUT, get_extraction_executor, \
+    recycle_extraction_executor
 
 from typing import List, TypedDict
 
@@ -83,33 +91,115 @@ class ResumeJSON(TypedDict):
     projects: List[Project]
 
 
+def extract_text(data: bytes, file_name: str, max_pages: Optional[int] = None) -> str:
+    """Module-level so it can be shipped to the extraction process pool"""
+    if file_name.lower().endswith('.pdf'):
+        return ResumeParser._extract_text_from_pdf(data, max_pages=max_pages)
+    elif file_name.lower().endswith('.docx'):
+        return ResumeParser._extract_text_from_docx(data)
+    else:
+        raise ValueError("Unsupported file format")
+
+
+@dataclass
+class ExtractedResume:
+    """Text of a resume file plus the hashes used for caching and de-duplication"""
+    content_hash: str
+    text_hash: str
+    text: str
+
+
 class ResumeParser:
-    def __init__(self, connector: BaseConnector):
+    def __init__(
+        self,
+        connector: BaseConnector,
+        executor: Optional[Executor] = None,
+        timeout: float = EXTRACTION_TIMEOUT,
+        max_pages: int = EXTRACTION_MAX_PAGES,
+        cache: Optional[ResumeCacheManager] = None
+    ):
         self.connector = connector
         self.connector_obj = self.connector.create_obj(structure=ResumeJSON)
+        self._executor = executor
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.cache = cache
+
+    @property
+    def executor(self) -> Optional[Executor]:
+        """The pool given to the parser, else the shared one, which is replaced once recycled"""
+        return self._executor or get_extraction_executor()
 
     async def parse(self, file_path: str) -> Dict:
-        if file_path.endswith('.pdf'):
-            text = self._extract_text_from_pdf(file_path)
-        elif file_path.endswith('.docx'):
-            text = self._extract_text_from_docx(file_path)
-        else:
-            raise ValueError("Unsupported file format")
-
-        formatted_data = await self.connector.acall(self.connector_obj, text+"\n\nPlease read all the text very thoroughly and make sure that all the fields are appropiatly filled.")
+        with open(file_path, 'rb') as f:
+            return await self.parse_bytes(f.read(), file_path)
+
+    async def parse_bytes(self, data: bytes, file_name: str) -> Dict:
+        """Parses a resume held in memory, e.g. a member read straight from a ZIP"""
+        extracted = await self.extract(data, file_name)
+        return await self.parse_extracted(extracted)
+
+    async def extract(self, data: bytes, file_name: str) -> ExtractedResume:
+        """Extracts and hashes the text, reusing cached text for files seen before"""
+        c_hash = content_hash(data)
+        if self.cache is not None:
+            cached = await shared_db_thread().run(self.cache.get_text, c_hash)
+            if cached is not None:
+                return ExtractedResume(content_hash=c_hash, text_hash=cached[0], text=cached[1])
+
+        text = await self.extract_text_async(data, file_name)
+        extracted = ExtractedResume(
+            content_hash=c_hash, text_hash=text_hash(text), text=text)
+        if self.cache is not None:
+            await shared_db_thread().run(self.cache.put_text, c_hash, extracted.text_hash, text)
+        return extracted
+
+    async def parse_extracted(self, extracted: ExtractedResume) -> Dict:
+        """Structures the text with the LLM, unless the same text was parsed before"""
+        if self.cache is not None:
+            cached = await shared_db_thread().run(self.cache.get_parsed, extracted.text_hash)
+            if cached is not None:
+                return cached
+
+        formatted_data = await self.connector.acall(self.connector_obj, extracted.text+"\n\nPlease read all the text very thoroughly and make sure that all the fields are appropiatly filled.")
+        if self.cache is not None:
+            await shared_db_thread().run(self.cache.put_parsed, extracted.text_hash, formatted_data)
         return formatted_data
 
+    async def extract_text_async(self, data: bytes, file_name: str) -> str:
+        """
+        Runs the CPU-bound extraction on the process pool so the event loop keeps serving
+        LLM calls and API requests. A timed-out file takes its pool down so the hung worker
+        is killed, files caught in that are retried once on a fresh pool.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = self.executor
+            future = loop.run_in_executor(
+                executor, extract_text, data, file_name, self.max_pages)
+            try:
+                return await asyncio.wait_for(future, timeout=self.timeout)
+            except asyncio.TimeoutError:
+                recycle_extraction_executor(executor)
+                raise TimeoutError(
+                    f"Text extraction exceeded {self.timeout}s for '{file_name}'")
+            except BrokenProcessPool:
+                recycle_extraction_executor(executor)
+                if attempt:
+                    raise
+
     @staticmethod
-    def _extract_text_from_pdf(file_path: str) -> str:
+    def _extract_text_from_pdf(data: bytes, max_pages: Optional[int] = None) -> str:
         """
         Extracts text from each page in “blocks,” and returns one string that
         shows page and block boundaries. Better for when you want to see
         headings, paragraphs, etc. instead of a flat blob of text.
         """
-        doc = fitz.open(file_path)
+        doc = fitz.open(stream=data, filetype="pdf")
         pieces = []
 
-        for page_number in range(len(doc)):
+        page_count = len(doc) if max_pages is None else min(len(doc), max_pages)
+        for page_number in range(page_count):
             page = doc.load_page(page_number)
             blocks = page.get_text("dict")["blocks"]
 
@@ -135,7 +225,7 @@ class ResumeParser:
         return "".join(pieces)
 
     @staticmethod
-    def _extract_text_from_docx(file_path: str) -> str:
-        doc = docx.Document(file_path)
+    def _extract_text_from_docx(data: bytes) -> str:
+        doc = docx.Document(io.BytesIO(data))
         text = '\n'.join([para.text for para in doc.paragraphs])
         return text
@@ -0,0 +1,52 @@
+import os
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+
+EXTRACTION_WORKERS = int(os.getenv("extraction_workers", os.cpu_count() or 1))
+EXTRACTION_TIMEOUT = float(os.getenv("extraction_timeout", 30))
+EXTRACTION_MAX_PAGES = int(os.getenv("extraction_max_pages", 10))
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_extraction_executor() -> Optional[ProcessPoolExecutor]:
+    """
+    Returns the process-wide pool used for PDF/DOCX text extraction, creating it on first use.
+    Returns None when `extraction_workers` is 0, in which case extraction runs in a thread.
+    """
+    global _executor
+    if _executor is None and EXTRACTION_WORKERS > 0:
+        # Workers start in a fresh interpreter, forking the threaded server could deadlock them.
+        # A forkserver with the parser preloaded makes replacing a recycled pool cheap.
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload([__name__.rsplit(".", 1)[0] + ".core"])
+        else:
+            context = multiprocessing.get_context("spawn")
+        _executor = ProcessPoolExecutor(
+            max_workers=EXTRACTION_WORKERS, mp_context=context)
+    return _executor
+
+
+def recycle_extraction_executor(executor: Optional[Executor]):
+    """
+    Kills the workers of a process pool stuck on a file that timed out, or already broken.
+    Files still running on it fail with `BrokenProcessPool`, the next call gets a fresh pool.
+    """
+    global _executor
+    if not isinstance(executor, ProcessPoolExecutor):
+        return
+    if _executor is executor:
+        _executor = None
+    # `_processes` is cleared once the pool is shut down, e.g. by an earlier recycle
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False)
+
+
+def shutdown_extraction_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
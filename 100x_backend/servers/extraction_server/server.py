@@ -11,15 +11,19 @@ def get_db_path(job_id: str) -> str:
     return str(db_dir / f"resumes_{job_id}.duckdb")
 
 
+def get_job_db_path(job_id: str) -> str:
+    db_filename = f"db/{job_id}"
+    os.makedirs(db_filename, exist_ok=True)
+    db_filename += f"/resumes_{job_id}.duckdb"
+    return os.path.abspath(db_filename)
+
+
 async def parse(
     connector,
     folder_path: str,
     job_id: str
 ):
-    db_filename = f"db/{job_id}"
-    os.makedirs(db_filename, exist_ok=True)
-    db_filename += f"/resumes_{job_id}.duckdb"
-    db_path = os.path.abspath(db_filename)
+    db_path = get_job_db_path(job_id)
 
     parser = ResumeParser(connector=connector)
 
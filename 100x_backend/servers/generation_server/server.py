@@ -1,10 +1,12 @@
 import os
-import duckdb
 import json
+from typing import Optional
 from dotenv import load_dotenv
 from .outreach_generation import generate_failed_message, generate_passed_message
 from .qa_generation import QAGenerator
 from ..connectors import OllamaConnector, GroqConnector
+from ..db_utils import JobConnection, get_connection_manager, in_stage
+from ..scoring_server.blueprints import CASCADE_SKIP_STATUSES
 
 load_dotenv()
 
@@ -12,71 +14,95 @@ api_key = os.getenv("groq_api_key")
 model = os.getenv("groq_model_name")
 
 
-async def update_passed_with_qa_and_message(con, generator: QAGenerator, job_requirements):
+def ensure_generation_columns(con, table: str = "passed_ranked_resumes"):
+    con.execute(f"""
+        ALTER TABLE {table}
+        ADD COLUMN IF NOT EXISTS qa_generation VARCHAR;
+    """)
+
+    con.execute(f"""
+        ALTER TABLE {table}
+        ADD COLUMN IF NOT EXISTS notification_message VARCHAR;
+    """)
+
+
+def store_resume_qa(con, resume_id: str, qa_json: str, notif_msg: str, table: str = "passed_ranked_resumes"):
+    con.execute(f"""
+        UPDATE {table}
+        SET qa_generation = ?, notification_message = ?
+        WHERE id = ?
+    """, (qa_json, notif_msg, resume_id))
+
+
+async def generate_resume_qa(db: JobConnection, generator: QAGenerator, resume_id: str, name: str, raw_json: str,
+                             job_requirements, table: str = "passed_ranked_resumes", content_hash: Optional[str] = None):
+    # Generate Q&A as JSON string
+    # should return list/dict
+    qa_list = await generator.generate(resume_text=raw_json, job_descr=job_requirements)
+    qa_json = json.dumps(qa_list)
 
-    # Fetch all passed resumes with their id and raw text
-    passed = con.execute(
-        "SELECT id, name, raw FROM passed_ranked_resumes").fetchall()
+    # Generate notification message string
+    notif_msg = generate_passed_message(name)
+
+    # Update the table
+    # With the resume's `content_hash`, its 'qa_generated' stage is recorded in the same transaction
+    await db.write(in_stage(store_resume_qa, content_hash, "qa_generated"),
+                   resume_id, qa_json, notif_msg, table=table)
+
+
+async def update_passed_with_qa_and_message(db: JobConnection, generator: QAGenerator, job_requirements):
+
+    # Fetch the passed resumes without Q&A yet, with their id and raw text
+    passed = await db.fetchall(
+        "SELECT id, name, raw FROM passed_ranked_resumes WHERE qa_generation IS NULL")
 
     for resume_id, name, raw_json in passed:
-        # Generate Q&A as JSON string
-        # should return list/dict
-        qa_list = await generator.generate(resume_text=raw_json, job_descr=job_requirements)
-        qa_json = json.dumps(qa_list)
-
-        # Generate notification message string
-        notif_msg = generate_passed_message(name)
-
-        # Update the table
-        con.execute("""
-            UPDATE passed_ranked_resumes
-            SET qa_generation = ?, notification_message = ?
-            WHERE id = ?
-        """, (qa_json, notif_msg, resume_id))
+        await generate_resume_qa(db, generator, resume_id, name, raw_json, job_requirements)
 
 
 def update_failed_with_message(con):
 
-    failed = con.execute("SELECT id, name FROM failed_resumes").fetchall()
+    failed = con.execute(
+        "SELECT id, name FROM failed_resumes WHERE notification_message IS NULL").fetchall()
 
-    for resume_id, name in failed:
-        notif_msg = generate_failed_message(name)
-        con.execute("""
+    if failed:
+        con.executemany("""
             UPDATE failed_resumes
             SET notification_message = ?
             WHERE id = ?
-        """, (notif_msg, resume_id))
+        """, [(generate_failed_message(name), resume_id) for resume_id, name in failed])
 
 
-async def generate(db_path: str, job_requirements):
-    con = duckdb.connect(db_path)
-    connector = GroqConnector(api_key=api_key, model=model)
+def keep_generation_on_resumes(con):
+    """Copies generated Q&A and messages back onto `resumes`, so rebuilt pass/fail tables keep them"""
+    for table in ("passed_ranked_resumes", "failed_resumes"):
+        con.execute(f"""
+            UPDATE resumes
+            SET qa_generation = COALESCE(resumes.qa_generation, t.qa_generation),
+                notification_message = COALESCE(resumes.notification_message, t.notification_message)
+            FROM {table} AS t
+            WHERE resumes.id = t.id
+              AND (resumes.qa_generation IS NULL OR resumes.notification_message IS NULL);
+        """)
 
-    con.execute("""
-    ALTER TABLE passed_ranked_resumes
-    ADD COLUMN IF NOT EXISTS qa_generation VARCHAR;
-    """)
-
-    con.execute("""
-        ALTER TABLE passed_ranked_resumes
-        ADD COLUMN IF NOT EXISTS notification_message VARCHAR;
-    """)
-
-    con.execute("""
-        ALTER TABLE failed_resumes
-        ADD COLUMN IF NOT EXISTS notification_message VARCHAR;
-    """)
 
+async def generate(db_path: str, job_requirements):
+    connector = GroqConnector(api_key=api_key, model=model)
     generator = QAGenerator(connector=connector)
 
-    update_failed_with_message(con=con)
+    async with get_connection_manager().connection(db_path) as db:
+        for table in ("resumes", "passed_ranked_resumes", "failed_resumes"):
+            await db.write(ensure_generation_columns, table=table)
+
+        # Only resumes without a message or Q&A yet are generated for, earlier runs' output is kept
+        await db.write(update_failed_with_message)
 
-    await update_passed_with_qa_and_message(con=con, generator=generator, job_requirements=job_requirements)
+        await update_passed_with_qa_and_message(db=db, generator=generator, job_requirements=job_requirements)
 
+        await db.write(keep_generation_on_resumes)
 
-def rerank_resumes(db_path: str):
-    con = duckdb.connect(database=db_path)
 
+def rank_resumes(con):
     # Create passed_ranked_resumes table
     con.execute("""
         CREATE OR REPLACE TABLE passed_ranked_resumes AS
@@ -88,15 +114,23 @@ def rerank_resumes(db_path: str):
         ORDER BY total_score DESC;
     """)
 
-    # Create failed_resumes table
-    con.execute("""
+    # Create failed_resumes table, including resumes the L2 cascade rejected (smart_passed NULL).
+    # Resumes not evaluated yet, left out to meet a deadline or whose L2 scoring failed or never ran,
+    # are in neither table until a later run scores them
+    skip_statuses = ", ".join(f"'{status}'" for status in CASCADE_SKIP_STATUSES)
+    con.execute(f"""
         CREATE OR REPLACE TABLE failed_resumes AS
         SELECT *
         FROM resumes
-        WHERE ats_passed = FALSE OR smart_passed = FALSE;
+        WHERE ats_passed = FALSE OR smart_passed = FALSE
+           OR l2_status IN ({skip_statuses});
     """)
 
-    con.close()
+
+async def rerank_resumes(db_path: str):
+    async with get_connection_manager().connection(db_path) as db:
+        await db.write(rank_resumes)
+
     print("Resumes processed successfully: 'passed_ranked_resumes' and 'failed_resumes' tables created.")
 
 
@@ -115,9 +149,9 @@ if __name__ == "__main__":
         extra_information=[]
     )
 
-    rerank_resumes(
-        db_path="/home/tanmaypatil/Documents/100x/db/resumes_3f496a1c-3e16-11f0-81c1-e1be77211e00.duckdb")
     import asyncio
+    asyncio.run(rerank_resumes(
+        db_path="/home/tanmaypatil/Documents/100x/db/resumes_3f496a1c-3e16-11f0-81c1-e1be77211e00.duckdb"))
     print(asyncio.run(generate(
         db_path="/home/tanmaypatil/Documents/100x/db/resumes_3f496a1c-3e16-11f0-81c1-e1be77211e00.duckdb",
         job_requirements=example_job_requirements
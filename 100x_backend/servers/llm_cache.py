@@ -0,0 +1,163 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .db_utils import connect_shared, shared_db_thread
+
+LLM_CACHE_DB_PATH = os.getenv("llm_cache_db_path")
+LLM_CACHE_TTL_SECONDS = float(os.getenv("llm_cache_ttl_seconds", 7 * 24 * 3600))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("llm_cache_max_entries", 100_000))
+
+
+def schema_key(structure: Any) -> str:
+    """Stable identifier of a structured-output schema, changes whenever the schema does"""
+    if structure is None:
+        return "text"
+    try:
+        from langchain_core.utils.function_calling import convert_to_openai_function
+        schema = json.dumps(convert_to_openai_function(structure), sort_keys=True)
+    except Exception:
+        schema = repr(structure)
+    name = getattr(structure, "__name__", type(structure).__name__)
+    return f"{name}:{hashlib.sha256(schema.encode('utf-8')).hexdigest()[:16]}"
+
+
+class LLMResponseCache:
+    """
+    Encapsulates the DuckDB response cache shared by all connectors:
+      • responses keyed by model, schema and prompt hash
+      • TTL expiry and least-recently-used eviction above `max_entries`
+      • coalescing of identical concurrent prompts into one in-flight call.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = LLM_CACHE_TTL_SECONDS, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.con = connect_shared(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._puts_since_eviction = 0
+        self._ensure_cache_table()
+
+    def _ensure_cache_table(self):
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key         TEXT PRIMARY KEY,
+                model       TEXT,
+                schema      TEXT,
+                response    JSON,
+                created_at  DOUBLE,
+                last_access DOUBLE
+            );
+        """)
+
+    @staticmethod
+    def make_key(model: str, schema: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\0{schema}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self.con.execute(
+            "SELECT response, created_at FROM llm_cache WHERE key = ?", [key]).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if now - row[1] > self.ttl_seconds:
+            self.con.execute("DELETE FROM llm_cache WHERE key = ?", [key])
+            return None
+
+        self.con.execute(
+            "UPDATE llm_cache SET last_access = ? WHERE key = ?", [now, key])
+        return json.loads(row[0])
+
+    def put(self, key: str, model: str, schema: str, response: Any):
+        try:
+            payload = json.dumps(response)
+        except TypeError:
+            # Raw chat messages and other non-JSON results are not cached
+            return
+
+        now = time.time()
+        self.con.execute(
+            """
+            INSERT OR REPLACE INTO llm_cache (key, model, schema, response, created_at, last_access)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [key, model, schema, payload, now, now]
+        )
+
+        self._puts_since_eviction += 1
+        if self._puts_since_eviction >= max(1, self.max_entries // 100):
+            self.evict()
+
+    def evict(self):
+        """Drops expired entries, then the least recently used ones above `max_entries`"""
+        self._puts_since_eviction = 0
+        self.con.execute("DELETE FROM llm_cache WHERE created_at < ?",
+                         [time.time() - self.ttl_seconds])
+        self.con.execute("""
+            DELETE FROM llm_cache
+            WHERE key IN (
+                SELECT key FROM llm_cache
+                ORDER BY last_access DESC
+                OFFSET ?
+            );
+        """, [self.max_entries])
+
+    async def get_or_call(self, model: str, schema: str, prompt: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        key = self.make_key(model, schema, prompt)
+
+        cached = await shared_db_thread().run(self.get, key)
+        if cached is not None:
+            return cached
+
+        in_flight = self._in_flight.get(key)
+        while in_flight is not None:
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            # The caller making the call was cancelled (its job was), make it ourselves
+            in_flight = self._in_flight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            response = await call()
+        except asyncio.CancelledError:
+            del self._in_flight[key]
+            future.cancel()
+            raise
+        except BaseException as e:
+            del self._in_flight[key]
+            future.set_exception(e)
+            # Retrieved here so waiters-less failures don't log "never retrieved"
+            future.exception()
+            raise
+
+        # Still in flight until stored, so a caller arriving meanwhile doesn't call again
+        try:
+            await shared_db_thread().run(self.put, key, model, schema, response)
+        except Exception as e:
+            print(f"[!] LLM cache write failed: {e}")
+        finally:
+            del self._in_flight[key]
+            future.set_result(response)
+        return response
+
+    def close(self):
+        self.con.close()
+
+
+_cache: Optional[LLMResponseCache] = None
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """The process-wide response cache, or None unless `llm_cache_db_path` is set"""
+    global _cache
+    if _cache is None and LLM_CACHE_DB_PATH:
+        _cache = LLMResponseCache(db_path=LLM_CACHE_DB_PATH)
+    return _cache
@@ -0,0 +1,303 @@
+import os
+import time
+import heapq
+import random
+import asyncio
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+# (job id, priority) of the work the current task does, calls outside any job share one flow
+_current_flow: ContextVar[Tuple[Optional[str], float]] = ContextVar("llm_flow", default=(None, 1.0))
+
+
+@contextmanager
+def llm_flow(job_id: str, priority: float = 1.0) -> Iterator[None]:
+    """Bills every LLM call made inside (and by tasks started inside) to `job_id`'s fair share"""
+    token = _current_flow.set((job_id, max(priority, 1e-3)))
+    try:
+        yield
+    finally:
+        _current_flow.reset(token)
+
+
+class TokenBucket:
+    """Refills `rate_per_minute` units per minute up to `capacity`, callers wait for enough units"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens +
+                          (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        # A request larger than the bucket would never fit, let it drain the bucket instead
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class FairQueue:
+    """
+    Weighted fair queuing of waiters across flows (start-time fair queuing): a waiter's start tag is
+    the later of the virtual time and its flow's last finish tag, its finish tag adds cost / priority.
+    The waiter with the smallest start tag goes first, so each flow with work waiting gets a share
+    proportional to its priority, however much work other flows queued.
+    """
+
+    def __init__(self):
+        self.virtual_time = 0.0
+        self._heap: List[list] = []
+        self._last_finish: Dict[Optional[str], float] = {}
+        self._waiting: Dict[Optional[str], int] = {}
+        self._seq = itertools.count()
+
+    def push(self, flow: Optional[str], priority: float, cost: float) -> list:
+        start = max(self.virtual_time, self._last_finish.get(flow, 0.0))
+        self._last_finish[flow] = start + cost / priority
+        self._waiting[flow] = self._waiting.get(flow, 0) + 1
+        entry = [start, next(self._seq), flow]
+        heapq.heappush(self._heap, entry)
+        return entry
+
+    def head(self) -> Optional[list]:
+        return self._heap[0] if self._heap else None
+
+    def pop(self, entry: list):
+        """Removes a waiter that was admitted, or gave up waiting"""
+        if self._heap and self._heap[0] is entry:
+            heapq.heappop(self._heap)
+            self.virtual_time = max(self.virtual_time, entry[0])
+        else:
+            self._heap.remove(entry)
+            heapq.heapify(self._heap)
+        flow = entry[2]
+        self._waiting[flow] -= 1
+        if not self._waiting[flow]:
+            del self._waiting[flow]
+            # An idle flow keeps no credit, it restarts from the virtual time
+            if self._last_finish.get(flow, 0.0) <= self.virtual_time:
+                self._last_finish.pop(flow, None)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class AIMDLimiter:
+    """
+    Adaptive concurrency limit:
+      • additive increase (+1 per limit's worth of fast successes)
+      • multiplicative decrease on 429s, and a gentler one when latency climbs
+        well above its moving baseline, at most once per congestion window: calls acquired
+        before the last decrease were sent at the old limit, so their signals are ignored.
+    Free slots go to waiters in weighted fair order across jobs, see `FairQueue`.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.baseline_latency: Optional[float] = None
+        # Bumped on every decrease, `acquire` returns it so `release` can tell old calls apart
+        self.epoch = 0
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop = None
+        self._queue = FairQueue()
+
+    def _condition(self) -> asyncio.Condition:
+        # asyncio primitives are bound to one loop, rebuild them if the loop changed
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._cond = asyncio.Condition()
+            self.in_flight = 0
+            self._queue = FairQueue()
+        return self._cond
+
+    async def acquire(self, flow: Optional[str] = None, priority: float = 1.0, cost: float = 1.0) -> int:
+        """Takes a slot, returns the epoch to hand back to `release`"""
+        cond = self._condition()
+        async with cond:
+            entry = self._queue.push(flow, priority, cost)
+            try:
+                await cond.wait_for(lambda: self.in_flight < int(self.limit) and self._queue.head() is entry)
+            except BaseException:
+                self._queue.pop(entry)
+                cond.notify_all()
+                raise
+            self._queue.pop(entry)
+            self.in_flight += 1
+            # The next waiter may fit in a slot as well
+            cond.notify_all()
+            return self.epoch
+
+    def _decrease(self, epoch: int, factor: float):
+        if epoch == self.epoch:
+            self.limit = max(self.min_limit, self.limit * factor)
+            self.epoch += 1
+
+    async def release(self, epoch: int, latency: Optional[float] = None, rate_limited: bool = False):
+        cond = self._condition()
+        async with cond:
+            self.in_flight -= 1
+            if rate_limited:
+                self._decrease(epoch, self.backoff)
+            elif latency is not None:
+                if self.baseline_latency is None:
+                    self.baseline_latency = latency
+                if latency > self.baseline_latency * self.latency_tolerance:
+                    self._decrease(epoch, 0.9)
+                else:
+                    self.limit = min(self.max_limit,
+                                     self.limit + 1.0 / self.limit)
+                self.baseline_latency = 0.9 * self.baseline_latency + 0.1 * latency
+            cond.notify_all()
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+def is_rate_limited(error: Exception) -> bool:
+    return _status_code(error) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def is_retryable(error: Exception) -> bool:
+    if is_rate_limited(error):
+        return True
+    status = _status_code(error)
+    if status is not None:
+        return status >= 500
+    name = type(error).__name__
+    return isinstance(error, (asyncio.TimeoutError, ConnectionError)) or "Timeout" in name or "Connection" in name
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class ProviderScheduler:
+    """
+    Gate for every LLM call to one provider: request and token buckets, an AIMD
+    concurrency limit, and retries with full-jitter exponential backoff. The concurrency
+    slots, and so the buckets, are shared by every job in weighted fair order (`llm_flow`).
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        initial_concurrency: int = 4,
+        max_concurrency: int = 64,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0
+    ):
+        self.provider = provider
+        self.request_bucket = TokenBucket(
+            requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(
+            tokens_per_minute) if tokens_per_minute else None
+        self.limiter = AIMDLimiter(
+            initial=initial_concurrency, max_limit=max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+    @classmethod
+    def from_env(cls, provider: str) -> "ProviderScheduler":
+        def env(name: str, default=None):
+            value = os.getenv(f"{provider}_{name}")
+            return float(value) if value else default
+
+        return cls(
+            provider,
+            requests_per_minute=env("requests_per_minute"),
+            tokens_per_minute=env("tokens_per_minute"),
+            initial_concurrency=int(env("initial_concurrency", 4)),
+            max_concurrency=int(env("max_concurrency", 64)),
+            max_retries=int(env("max_retries", 5)),
+        )
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.backoff_base)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    async def run(self, call: Callable[[], Awaitable[Any]], prompt: str = "") -> Any:
+        # Rough prompt size, ~4 characters per token
+        estimated_tokens = max(1, len(prompt) // 4)
+
+        flow, priority = _current_flow.get()
+
+        for attempt in range(self.max_retries + 1):
+            # The fair slot comes first, so the rate budget is also spent in fair order
+            epoch = await self.limiter.acquire(flow, priority, cost=estimated_tokens)
+            try:
+                if self.request_bucket is not None:
+                    await self.request_bucket.acquire(1)
+                if self.token_bucket is not None:
+                    await self.token_bucket.acquire(estimated_tokens)
+            except BaseException:
+                await self.limiter.release(epoch)
+                raise
+
+            start = time.monotonic()
+            try:
+                result = await call()
+            except Exception as e:
+                await self.limiter.release(epoch, rate_limited=is_rate_limited(e))
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                delay = self._backoff(attempt, e)
+                print(f"[!] {self.provider} call failed ({type(e).__name__}), "
+                      f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled: free the slot without treating it as a signal
+                await self.limiter.release(epoch)
+                raise
+
+            await self.limiter.release(epoch, latency=time.monotonic() - start)
+            return result
+
+
+_schedulers: Dict[str, ProviderScheduler] = {}
+
+
+def get_scheduler(provider: str) -> ProviderScheduler:
+    """Process-wide scheduler per provider, shared by every connector instance"""
+    if provider not in _schedulers:
+        _schedulers[provider] = ProviderScheduler.from_env(provider)
+    return _schedulers[provider]
@@ -0,0 +1,5 @@
+from .blueprints import DeadlinePolicy, PipelineConfig
+from .core import StreamingPipeline
+from .progress import JobProgress
+
+__all__ = ['DeadlinePolicy', 'PipelineConfig', 'StreamingPipeline', 'JobProgress']
@@ -0,0 +1,68 @@
+import os
+from dataclasses import dataclass, field
+
+from ..scoring_server.blueprints import CascadePolicy
+
+
+@dataclass
+class DeadlinePolicy:
+    """
+    How a job with a deadline degrades as its time budget runs out, one step per fraction of the budget:
+      1. `skip_low_ats_l2_at`  resumes below `low_ats_score` are no longer L2-scored
+      2. `skip_qa_at`          Q&A is no longer generated
+      3. `finalize_at`         the remaining work is dropped and the job is ranked with what it has.
+    """
+    skip_low_ats_l2_at: float = 0.5
+    skip_qa_at: float = 0.75
+    finalize_at: float = 0.9
+    low_ats_score: float = 70.0
+
+    @classmethod
+    def from_env(cls) -> "DeadlinePolicy":
+        defaults = cls()
+        return cls(
+            skip_low_ats_l2_at=float(os.getenv("deadline_skip_low_ats_l2_at", defaults.skip_low_ats_l2_at)),
+            skip_qa_at=float(os.getenv("deadline_skip_qa_at", defaults.skip_qa_at)),
+            finalize_at=float(os.getenv("deadline_finalize_at", defaults.finalize_at)),
+            low_ats_score=float(os.getenv("deadline_low_ats_score", defaults.low_ats_score)),
+        )
+
+
+@dataclass
+class PipelineConfig:
+    """Worker counts per stage and the size of the bounded queues between stages"""
+    parse_workers: int = 8
+    ats_workers: int = 1
+    smart_workers: int = 4
+    qa_workers: int = 4
+    queue_size: int = 32
+    # Parsed resumes an ATS worker scores and stores together, from what is waiting in its queue
+    ats_batch_size: int = 64
+    ats_threshold: float = 40.0
+    # Estimated Jaccard similarity above which resumes share one LLM parse, 0 disables
+    near_duplicate_threshold: float = 0.85
+    # Which ATS-scored resumes are sent on to L2 scoring
+    cascade: CascadePolicy = field(default_factory=CascadePolicy)
+    # Re-running a job only processes files (by content hash) it has not seen before,
+    # and resumes the ones a stopped run left midway
+    incremental: bool = True
+    # Degradation steps of jobs run with a deadline
+    deadline: DeadlinePolicy = field(default_factory=DeadlinePolicy)
+
+    @classmethod
+    def from_env(cls) -> "PipelineConfig":
+        defaults = cls()
+        return cls(
+            parse_workers=int(os.getenv("pipeline_parse_workers", defaults.parse_workers)),
+            ats_workers=int(os.getenv("pipeline_ats_workers", defaults.ats_workers)),
+            smart_workers=int(os.getenv("pipeline_smart_workers", defaults.smart_workers)),
+            qa_workers=int(os.getenv("pipeline_qa_workers", defaults.qa_workers)),
+            queue_size=int(os.getenv("pipeline_queue_size", defaults.queue_size)),
+            ats_batch_size=int(os.getenv("pipeline_ats_batch_size", defaults.ats_batch_size)),
+            ats_threshold=float(os.getenv("pipeline_ats_threshold", defaults.ats_threshold)),
+            near_duplicate_threshold=float(os.getenv(
+                "pipeline_near_duplicate_threshold", defaults.near_duplicate_threshold)),
+            cascade=CascadePolicy.from_env(),
+            incremental=os.getenv("pipeline_incremental", "true").lower() in ("1", "true", "yes"),
+            deadline=DeadlinePolicy.from_env(),
+        )
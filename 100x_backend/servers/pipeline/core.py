@@ -0,0 +1,547 @@
+import json
+import time
+import asyncio
+from pathlib import Path
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from ..connectors import BaseConnector
+from ..db_utils import JobConnection, MinHashLSH, ResumeBatchWriter, ResumeCacheManager, build_resume_row, content_hash, \
+    dead_lettered_hashes, get_connection_manager, in_stage, record_failure, resume_from_typed_columns, set_stage
+from ..extraction_server import ResumeParser, ResumeSource
+from ..extraction_server.resume_parser import ExtractedResume
+from ..scoring_server.ats_scoring import JobRequirements
+from ..scoring_server.server import RESUME_SECTIONS_SQL, ensure_score_columns, job_requirements_to_dict, l1_score_batch, \
+    l2_score_resume, make_ats_scorer, mark_l2_skipped
+from ..generation_server.qa_generation import QAGenerator
+from ..generation_server.server import ensure_generation_columns, generate_resume_qa, keep_generation_on_resumes, rank_resumes, update_failed_with_message
+from .blueprints import PipelineConfig
+from .progress import JobProgress
+
+# Sentinel telling a stage worker that its inbox is drained
+_DONE = object()
+# `l2_status` of resumes left out of L2 to meet the job's deadline, a later run scores them
+DEADLINE_SKIPPED = "skipped_deadline"
+
+
+def _describe(item: Any) -> str:
+    if isinstance(item, dict):
+        return item.get("file_path", "")
+    return getattr(item, "file_path", item)
+
+
+class StreamingPipeline:
+    """
+    Streams every resume of a job through the stages independently:
+      parse → ATS score → smart score → Q&A generation.
+    Stages are connected by bounded queues, so a resume moves on as soon as its
+    previous stage finishes instead of waiting for the whole batch.
+    Each stage records the resume's progress with its result, so a job that stopped midway
+    resumes where it was, and files that keep failing are dead-lettered instead of retried.
+    With `deadline_seconds`, the job degrades step by step as the time runs out (see `DeadlinePolicy`).
+    Counts, throughput and the leaderboard are reported to `progress` as resumes move along.
+    """
+
+    def __init__(
+        self,
+        connector: BaseConnector,
+        job_id: str,
+        db_path: str,
+        job_requirements: JobRequirements,
+        config: PipelineConfig = None,
+        cache: Optional[ResumeCacheManager] = None,
+        deadline_seconds: Optional[float] = None,
+        progress: Optional[JobProgress] = None
+    ):
+        self.job_id = job_id
+        self.db_path = db_path
+        self.job_requirements = job_requirements
+        self.job_req_dict = job_requirements_to_dict(job_requirements)
+        self.config = config or PipelineConfig()
+        self.deadline_seconds = deadline_seconds
+        # Degradation steps the deadline forced so far, in order
+        self.degraded: List[str] = []
+        self.progress = progress or JobProgress(job_id)
+
+        self.parser = ResumeParser(connector=connector, cache=cache)
+        self.ats_scorer = make_ats_scorer(job_requirements)
+        self.qa_generator = QAGenerator(connector=connector)
+
+        # The job's shared connection and batched resume writer, both set up by `run`
+        self.db: Optional[JobConnection] = None
+        self.writer: Optional[ResumeBatchWriter] = None
+
+        # (name, email) → id of the first resume seen with that identity
+        self._seen: Dict[tuple, str] = {}
+        # text hash → future of (parsed dict, resume id) for the first file with that text
+        self._by_text_hash: Dict[str, asyncio.Future] = {}
+        # Near-duplicate clusters: representatives' text hashes are indexed by MinHash signature
+        self._near_index: Optional[MinHashLSH] = None
+        if self.config.near_duplicate_threshold:
+            self._near_index = MinHashLSH(
+                threshold=self.config.near_duplicate_threshold)
+        self._signatures: Dict[str, Any] = {}
+
+        # What earlier runs of this job stored, filled by `_load_existing` in incremental mode:
+        # content hashes of handled files, text hash → resume id, and (id, ATS score, passed) rows
+        self._processed: Set[str] = set()
+        self._stored_by_text: Dict[str, str] = {}
+        self._stored_ats: List[Tuple[str, float, bool]] = []
+        # Stored resumes an earlier run left midway, by the queue they go back into
+        self._pending: Dict[str, List[Dict]] = {"ats": [], "cascade": [], "qa": []}
+
+    async def run(self, resumes: Union[Iterable[ResumeSource], AsyncIterable[ResumeSource], Iterable[str]]) -> str:
+        cfg = self.config
+        parse_q = asyncio.Queue(maxsize=cfg.queue_size)
+        ats_q = asyncio.Queue(maxsize=cfg.queue_size)
+        cascade_q = asyncio.Queue(maxsize=cfg.queue_size)
+        smart_q = asyncio.Queue(maxsize=cfg.queue_size)
+        qa_q = asyncio.Queue(maxsize=cfg.queue_size)
+
+        print(f"→ Using DuckDB file: {self.db_path}")
+        print(f"→ Tagging job_id    : {self.job_id}\n")
+
+        manager = get_connection_manager()
+        self.db = await manager.acquire(self.db_path)
+        # Parsed resumes and duplicates are appended in batches by a single writer task
+        self.writer = ResumeBatchWriter(self.db).start()
+        try:
+            await self.db.run(self.db.db_manager.ensure_duplicates_table)
+            await self.db.write(ensure_score_columns)
+            await self.db.write(ensure_generation_columns, table="resumes")
+            if cfg.incremental:
+                await self._load_existing()
+
+            async def feed():
+                # Sent before any new file, so they are in before their stage can be told it is done
+                await self._requeue_pending({"ats": ats_q, "cascade": cascade_q, "qa": qa_q})
+                await self._feed(parse_q, resumes, cfg.parse_workers)
+
+            stages = asyncio.gather(
+                feed(),
+                self._stage(parse_q, ats_q, self._parse_one,
+                            cfg.parse_workers, cfg.ats_workers, stage="parsed"),
+                self._ats_stage(ats_q, cascade_q, cfg.ats_workers),
+                self._cascade(cascade_q, smart_q, cfg.smart_workers),
+                self._stage(smart_q, qa_q, self._smart_one,
+                            cfg.smart_workers, cfg.qa_workers, stage="smart_scored"),
+                self._stage(qa_q, None, self._qa_one, cfg.qa_workers, 0, stage="qa_generated"),
+            )
+            watcher = None
+            if self.deadline_seconds is not None:
+                watcher = asyncio.create_task(self._watch_deadline(stages))
+            try:
+                await stages
+            except asyncio.CancelledError:
+                # Stopped by the deadline's last step rather than a cancelled job: rank what is there
+                if asyncio.current_task().cancelling() or "partial_finalize" not in self.degraded:
+                    raise
+            finally:
+                if watcher is not None:
+                    watcher.cancel()
+            await self._finalize()
+        finally:
+            await self.writer.close()
+            await manager.release(self.db_path)
+
+        return self.db_path
+
+    async def _load_existing(self):
+        """
+        Seeds the duplicate checks and the cascade with the resumes earlier runs of this job stored,
+        and picks up the ones a run left midway at the stage they reached.
+        """
+        self._processed = await self.db.run(self.db.db_manager.processed_content_hashes)
+        dead = await self.db.read(dead_lettered_hashes)
+        # Ids, hashes and scores of every stored resume, the resume itself only for those left midway
+        rows = await self.db.fetchall("""
+            SELECT r.id, r.name, r.email, r.phone, r.job_id, r.file_path, r.content_hash, r.text_hash,
+                   r.ats_score, r.ats_passed, r.l2_status, r.smart_score, r.smart_passed, r.qa_generation, s.stage
+            FROM resumes r LEFT JOIN resume_stages s ON s.content_hash = r.content_hash;
+        """)
+        for (resume_id, name, email, phone, job_id, file_path, c_hash, stored_text_hash,
+             ats_score, ats_passed, l2_status, smart_score, smart_passed, qa_generation, stage) in rows:
+            if name is not None and email is not None:
+                self._seen.setdefault((name, email), resume_id)
+            if stored_text_hash:
+                self._stored_by_text.setdefault(stored_text_hash, resume_id)
+            if ats_passed and smart_passed:
+                self.progress.add_score(resume_id, name, email, ats_score, smart_score)
+
+            pending = None
+            if c_hash not in dead:
+                if stage == "parsed":
+                    pending = "ats"
+                elif stage == "ats_scored" and l2_status in (None, DEADLINE_SKIPPED):
+                    pending = "cascade"
+                elif stage == "smart_scored" and ats_passed and smart_passed and qa_generation is None:
+                    pending = "qa"
+            if pending is not None:
+                self._pending[pending].append({
+                    "resume_id": resume_id, "name": name, "email": email, "phone": phone,
+                    "job_id": job_id, "file_path": file_path, "content_hash": c_hash,
+                    "ats_score": ats_score, "ats_passed": ats_passed})
+            if ats_score is not None and pending not in ("ats", "cascade"):
+                self._stored_ats.append((resume_id, ats_score, ats_passed))
+        await self._load_pending_resumes()
+        if rows:
+            print(f"→ Incremental run   : {len(rows)} resumes already stored")
+            for queue, pending_rows in self._pending.items():
+                if pending_rows:
+                    print(f"→ Resuming          : {len(pending_rows)} resumes before '{queue}'")
+            print()
+
+    async def _load_pending_resumes(self):
+        """Reads the stored resume of every row a run left midway, and its typed columns for ATS"""
+        pending = [row for rows in self._pending.values() for row in rows]
+        if not pending:
+            return
+        raw = dict(await self.db.fetchall("SELECT id, raw FROM resumes WHERE list_contains(?, id);",
+                                          [[row["resume_id"] for row in pending]]))
+        for row in pending:
+            row["raw_json_str"] = raw[row["resume_id"]]
+            row["parsed"] = json.loads(row["raw_json_str"])
+        if self._pending["ats"]:
+            # ATS scores the typed columns, which carry the normalized dates
+            typed = {row[0]: resume_from_typed_columns(*row[1:]) for row in await self.db.fetchall(
+                f"SELECT id, {RESUME_SECTIONS_SQL} FROM resumes WHERE list_contains(?, id);",
+                [[row["resume_id"] for row in self._pending["ats"]]])}
+            for row in self._pending["ats"]:
+                row["typed"] = typed[row["resume_id"]]
+
+    async def _requeue_pending(self, queues: Dict[str, asyncio.Queue]):
+        pending = sum(len(rows) for rows in self._pending.values())
+        if pending and self.progress.total is not None:
+            self.progress.expect(pending)
+        for queue, rows in self._pending.items():
+            for row in rows:
+                self.progress.count("discovered")
+                await queues[queue].put(row)
+
+    async def _watch_deadline(self, stages: asyncio.Future):
+        policy = self.config.deadline
+        start = time.monotonic()
+        steps = [(policy.skip_low_ats_l2_at, "skip_low_ats_l2"), (policy.skip_qa_at, "skip_qa"),
+                 (policy.finalize_at, "partial_finalize")]
+        for fraction, step in sorted(steps):
+            await asyncio.sleep(max(0.0, start + fraction * self.deadline_seconds - time.monotonic()))
+            self.degraded.append(step)
+            self.progress.degrade(step)
+            print(f"[!] Job {self.job_id} is running out of time, degrading: {step}")
+            if step == "partial_finalize":
+                stages.cancel()
+                return
+
+    def _skip_l2_for_deadline(self, row: Dict) -> bool:
+        return ("skip_low_ats_l2" in self.degraded
+                and row["ats_score"] < self.config.deadline.low_ats_score)
+
+    async def _feed(self, outbox: asyncio.Queue, items: Union[Iterable[Any], AsyncIterable[Any]], downstream_workers: int):
+        # The bounded queue applies back-pressure, so items are only pulled as the parsers free up
+        if hasattr(items, "__aiter__"):
+            async for item in items:
+                self.progress.count("discovered")
+                await outbox.put(item)
+        else:
+            for item in items:
+                self.progress.count("discovered")
+                await outbox.put(item)
+        self.progress.feeding_done()
+        for _ in range(downstream_workers):
+            await outbox.put(_DONE)
+
+    async def _stage(
+        self,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        handler: Callable[[Any], Awaitable[Any]],
+        workers: int,
+        downstream_workers: int,
+        stage: Optional[str] = None
+    ):
+        async def work():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                try:
+                    result = await handler(item)
+                except Exception as e:
+                    print(
+                        f"[!] {handler.__name__} failed for '{_describe(item)}': {e}")
+                    if stage is not None:
+                        await self._record_failure(item, stage, e)
+                    self.progress.count("failed")
+                    self.progress.count("completed")
+                    continue
+                if result is not None and outbox is not None:
+                    await outbox.put(result)
+                else:
+                    # Nothing left to do for this resume in this run
+                    self.progress.count("completed")
+
+        await asyncio.gather(*(work() for _ in range(workers)))
+
+        if outbox is not None:
+            for _ in range(downstream_workers):
+                await outbox.put(_DONE)
+
+    async def _record_failure(self, item: Any, stage: str, error: Exception):
+        """Counts the failure against the file, it is retried by the job's next run until dead-lettered"""
+        if isinstance(item, dict):
+            c_hash, file_path = item.get("content_hash"), item.get("file_path")
+        elif isinstance(item, ResumeSource):
+            c_hash, file_path = content_hash(item.data), item.file_path
+        else:
+            return
+        if c_hash is None:
+            return
+        try:
+            dead = await self.db.write(record_failure, c_hash, file_path, stage, str(error))
+        except Exception as e:
+            print(f"[!] Could not record the failure of '{file_path}': {e}")
+            return
+        if dead:
+            print(f"[!] '{file_path}' dead-lettered, it failed too often at '{stage}'")
+
+    async def _parse_one(self, source: Union[ResumeSource, str]) -> Optional[Dict]:
+        if not isinstance(source, ResumeSource):
+            data = await asyncio.to_thread(Path(source).read_bytes)
+            source = ResumeSource(file_path=source, data=data)
+        file_path = source.file_path
+
+        if content_hash(source.data) in self._processed:
+            print(f"[=] Skipping '{file_path}', already processed for this job")
+            self.progress.count("skipped")
+            return None
+
+        extracted = await self.parser.extract(source.data, file_path)
+        await self.db.write(set_stage, extracted.content_hash, "extracted", file_path=file_path)
+        self.progress.count("extracted")
+
+        # Same or near-same text earlier in this job: reuse that parse instead of calling the LLM
+        original = await self._find_original(extracted)
+        if original is not None:
+            (parsed_dict, original_id), duplicate_type, similarity = original
+            await self._store_duplicate(parsed_dict, original_id, file_path, extracted,
+                                        duplicate_type=duplicate_type, similarity=similarity)
+            return None
+
+        parsed_future = asyncio.get_running_loop().create_future()
+        self._by_text_hash[extracted.text_hash] = parsed_future
+        if self._near_index is not None:
+            self._near_index.insert(extracted.text_hash,
+                                    self._signatures.pop(extracted.text_hash))
+        row = None
+        try:
+            parsed_dict = await self.parser.parse_extracted(extracted)
+            row = build_resume_row(parsed_dict, job_id=self.job_id,
+                                   file_path=file_path)
+
+            identity = (row["name"], row["email"])
+            if None not in identity:
+                original_id = self._seen.get(identity)
+                if original_id is not None:
+                    parsed_future.set_result((parsed_dict, original_id))
+                    await self._store_duplicate(parsed_dict, original_id, file_path, extracted,
+                                                resume_id=row["resume_id"], duplicate_type="identity")
+                    return None
+                self._seen[identity] = row["resume_id"]
+
+            # Scoring updates the row by id, so it is only passed on once its batch is committed
+            await self.writer.write_resume(
+                content_hash=extracted.content_hash, text_hash=extracted.text_hash, **row)
+            parsed_future.set_result((parsed_dict, row["resume_id"]))
+        except Exception:
+            if not parsed_future.done():
+                # Let waiting copies parse themselves rather than inherit the failure
+                del self._by_text_hash[extracted.text_hash]
+                if self._near_index is not None:
+                    self._near_index.remove(extracted.text_hash)
+                if row is not None and self._seen.get((row["name"], row["email"])) == row["resume_id"]:
+                    del self._seen[(row["name"], row["email"])]
+                parsed_future.set_result(None)
+            raise
+        self.progress.count("parsed")
+        return {**row, "content_hash": extracted.content_hash, "parsed": parsed_dict,
+                "typed": json.loads(row["typed_json_str"])}
+
+    async def _find_original(self, extracted: ExtractedResume) -> Optional[Tuple[Tuple[Dict, str], str, float]]:
+        """
+        Looks for a resume earlier in this job with the same normalized text, or in the same
+        MinHash cluster, and waits for its parse. Returns ((parsed, resume id), type, similarity).
+        """
+        stored_id = self._stored_by_text.get(extracted.text_hash)
+        if stored_id is not None and extracted.text_hash not in self._by_text_hash:
+            # Same text as a resume stored by an earlier run, reuse its parse
+            rows = await self.db.fetchall("SELECT raw FROM resumes WHERE id = ?;", [stored_id])
+            stored = asyncio.get_running_loop().create_future()
+            stored.set_result((json.loads(rows[0][0]), stored_id))
+            self._by_text_hash[extracted.text_hash] = stored
+
+        while True:
+            if extracted.text_hash in self._by_text_hash:
+                key, duplicate_type, similarity = extracted.text_hash, "exact", 1.0
+            elif self._near_index is not None:
+                if extracted.text_hash not in self._signatures:
+                    self._signatures[extracted.text_hash] = self._near_index.signature(
+                        extracted.text)
+                match = self._near_index.query(
+                    self._signatures[extracted.text_hash])
+                if match is None:
+                    return None
+                (key, similarity), duplicate_type = match, "near"
+            else:
+                return None
+
+            outcome = await asyncio.shield(self._by_text_hash[key])
+            if outcome is not None:
+                self._signatures.pop(extracted.text_hash, None)
+                return outcome, duplicate_type, similarity
+
+    async def _store_duplicate(
+        self,
+        parsed_dict: Dict,
+        original_id: str,
+        file_path: str,
+        extracted: ExtractedResume,
+        resume_id: Optional[str] = None,
+        duplicate_type: Optional[str] = None,
+        similarity: Optional[float] = None
+    ):
+        row = build_resume_row(parsed_dict, job_id=self.job_id,
+                               file_path=file_path, resume_id=resume_id)
+        await self.writer.write_duplicate(
+            duplicate_of_id=original_id,
+            content_hash=extracted.content_hash,
+            text_hash=extracted.text_hash,
+            duplicate_type=duplicate_type,
+            similarity=similarity,
+            **row)
+        self.progress.count("duplicates")
+        print(
+            f"[!] '{file_path}' duplicates resume_id={original_id} ({duplicate_type})")
+
+    async def _ats_stage(self, inbox: asyncio.Queue, outbox: asyncio.Queue, workers: int):
+        """
+        ATS-scores in micro-batches: a worker takes the next parsed resume plus whatever else is
+        already waiting, up to `ats_batch_size`, and scores and stores them with one UPDATE.
+        """
+        async def work():
+            done = False
+            while not done:
+                batch = []
+                row = await inbox.get()
+                # Stops at its own sentinel, the others' are left for them
+                while True:
+                    if row is _DONE:
+                        done = True
+                        break
+                    batch.append(row)
+                    if len(batch) >= self.config.ats_batch_size or inbox.empty():
+                        break
+                    row = inbox.get_nowait()
+                if not batch:
+                    continue
+                try:
+                    results = await self._ats_batch(batch)
+                except Exception as e:
+                    print(f"[!] ATS scoring failed for a batch of {len(batch)} resumes: {e}")
+                    for row in batch:
+                        await self._record_failure(row, "ats_scored", e)
+                    self.progress.count("failed", len(batch))
+                    self.progress.count("completed", len(batch))
+                    continue
+                for row in results:
+                    await outbox.put(row)
+
+        await asyncio.gather(*(work() for _ in range(workers)))
+        await outbox.put(_DONE)
+
+    async def _ats_batch(self, batch: List[Dict]) -> List[Dict]:
+        hashes = [row.get("content_hash") for row in batch]
+        results = await self.db.write(in_stage(l1_score_batch, hashes, "ats_scored"),
+                                      self.ats_scorer, [(row["resume_id"], row["typed"]) for row in batch],
+                                      threshold=self.config.ats_threshold)
+        self.progress.count("ats_scored", len(batch))
+        print(f"ATS-scored {len(batch)} resumes: {sum(results['passed'])} passed")
+        return [{**row, "ats_score": float(score), "ats_passed": bool(passed)}
+                for row, score, passed in zip(batch, results["overall_score"], results["passed"])]
+
+    async def _cascade(self, inbox: asyncio.Queue, outbox: asyncio.Queue, downstream_workers: int):
+        """
+        Applies the cascade policy between ATS and L2 scoring. Policies that rank the whole
+        job (top-K) hold every row back until the last ATS score is in.
+        """
+        policy = self.config.cascade
+        held = []
+        while True:
+            row = await inbox.get()
+            if row is _DONE:
+                break
+            if policy.needs_all_scores:
+                held.append(row)
+                continue
+            reason = policy.skip_reason(row["ats_score"], row["ats_passed"])
+            if reason is None and self._skip_l2_for_deadline(row):
+                reason = DEADLINE_SKIPPED
+            if reason is None:
+                await outbox.put(row)
+            else:
+                await self.db.write(mark_l2_skipped, {row["resume_id"]: reason})
+                self._l2_skipped(1)
+
+        if held:
+            # Ranked together with the resumes earlier runs stored, only new ones are sent on or marked
+            by_id = {row["resume_id"]: row for row in held}
+            selected, skipped = policy.select(
+                [(row["resume_id"], row["ats_score"], row["ats_passed"]) for row in held] + self._stored_ats)
+            skipped = {resume_id: status for resume_id, status in skipped.items() if resume_id in by_id}
+            await self.db.write(mark_l2_skipped, skipped)
+            deadline_skipped = {resume_id: DEADLINE_SKIPPED for resume_id in selected
+                                if resume_id in by_id and self._skip_l2_for_deadline(by_id[resume_id])}
+            await self.db.write(mark_l2_skipped, deadline_skipped)
+            self._l2_skipped(len(skipped) + len(deadline_skipped))
+            for resume_id in selected:
+                if resume_id in by_id and resume_id not in deadline_skipped:
+                    await outbox.put(by_id[resume_id])
+
+        for _ in range(downstream_workers):
+            await outbox.put(_DONE)
+
+    def _l2_skipped(self, n: int):
+        if n:
+            self.progress.count("l2_skipped", n)
+            self.progress.count("completed", n)
+
+    async def _smart_one(self, row: Dict) -> Optional[Dict]:
+        if self._skip_l2_for_deadline(row):
+            await self.db.write(mark_l2_skipped, {row["resume_id"]: DEADLINE_SKIPPED})
+            self.progress.count("l2_skipped")
+            return None
+
+        candidate = (row["resume_id"], row["name"], row["email"],
+                     row["phone"], row["job_id"], row["parsed"])
+        scores = await l2_score_resume(self.db, candidate, self.job_req_dict,
+                                       content_hash=row.get("content_hash"))
+        self.progress.count("smart_scored")
+
+        if row["ats_passed"] and scores.get("is_adequate", False):
+            self.progress.add_score(row["resume_id"], row["name"], row["email"], row["ats_score"],
+                                    scores.get("final_score", 0))
+            return row
+        return None
+
+    async def _qa_one(self, row: Dict):
+        if "skip_qa" in self.degraded:
+            # Left without Q&A, a later run of the job generates it
+            return
+        await generate_resume_qa(self.db, self.qa_generator, row["resume_id"], row["name"],
+                                 row["raw_json_str"], self.job_requirements, table="resumes",
+                                 content_hash=row.get("content_hash"))
+        self.progress.count("qa_generated")
+
+    async def _finalize(self):
+        await self.db.write(rank_resumes)
+        await self.db.write(update_failed_with_message)
+        await self.db.write(keep_generation_on_resumes)
+        print("Resumes processed successfully: 'passed_ranked_resumes' and 'failed_resumes' tables created.")
@@ -0,0 +1,116 @@
+import os
+import time
+import heapq
+import asyncio
+from collections import deque
+from typing import Dict, List, Optional
+
+# Per-resume counters reported for a running job, in pipeline order
+PROGRESS_COUNTS = ("discovered", "extracted", "parsed", "ats_scored", "smart_scored", "qa_generated",
+                   "skipped", "duplicates", "l2_skipped", "failed", "completed")
+# Number of best passing resumes kept on a job's live leaderboard
+LEADERBOARD_SIZE = int(os.getenv("progress_leaderboard_size", 10))
+# Seconds of completions the throughput (and so the ETA) is measured over
+THROUGHPUT_WINDOW_SECONDS = float(os.getenv("progress_throughput_window_seconds", 60))
+
+
+class JobProgress:
+    """
+    Live progress of one job run, fed by its pipeline and read by the job's event stream:
+      • per-stage resume counts, a resume is `completed` once it leaves the pipeline for any reason
+      • throughput over the last `THROUGHPUT_WINDOW_SECONDS` and the ETA it gives
+      • the top `leaderboard_size` resumes passing both scores, ranked like `passed_ranked_resumes`.
+    Every update bumps `version` and wakes `wait_changed` callers.
+    """
+
+    def __init__(self, job_id: str, leaderboard_size: int = LEADERBOARD_SIZE):
+        self.job_id = job_id
+        self.leaderboard_size = leaderboard_size
+        self.counts: Dict[str, int] = {name: 0 for name in PROGRESS_COUNTS}
+        # Files the run is expected to see: a hint (e.g. the ZIP's members) until feeding is over
+        self.total: Optional[int] = None
+        self.degraded: List[str] = []
+        self.version = 0
+        self._started = time.monotonic()
+        self._completions = deque()
+        # Min-heap of (total score, resume id, entry), so the weakest leader is dropped first
+        self._leaders: List[tuple] = []
+        self._changed = asyncio.Event()
+
+    def _touch(self):
+        self.version += 1
+        # Waiters hold the event they started on, a fresh one is armed for the next update
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def expect(self, files: int):
+        self.total = (self.total or 0) + files
+        self._touch()
+
+    def feeding_done(self):
+        """Every file is in, so what has been discovered is the run's exact total"""
+        self.total = self.counts["discovered"]
+        self._touch()
+
+    def count(self, name: str, n: int = 1):
+        self.counts[name] += n
+        if name == "completed":
+            now = time.monotonic()
+            self._completions.extend([now] * n)
+        self._touch()
+
+    def add_score(self, resume_id: str, name: Optional[str], email: Optional[str], ats_score: float,
+                  smart_score: float):
+        total_score = round((ats_score or 0) + (smart_score or 0), 2)
+        entry = {"resume_id": resume_id, "name": name, "email": email, "ats_score": ats_score,
+                 "smart_score": smart_score, "total_score": total_score}
+        if len(self._leaders) < self.leaderboard_size:
+            heapq.heappush(self._leaders, (total_score, resume_id, entry))
+        elif (total_score, resume_id) > self._leaders[0][:2]:
+            heapq.heapreplace(self._leaders, (total_score, resume_id, entry))
+        else:
+            return
+        self._touch()
+
+    def degrade(self, step: str):
+        self.degraded.append(step)
+        self._touch()
+
+    def finish(self):
+        """Wakes the readers once the run is over, they move on to the job's stored status"""
+        self._touch()
+
+    def throughput(self) -> float:
+        """Resumes completed per second over the recent window"""
+        now = time.monotonic()
+        while self._completions and self._completions[0] < now - THROUGHPUT_WINDOW_SECONDS:
+            self._completions.popleft()
+        window = min(THROUGHPUT_WINDOW_SECONDS, now - self._started)
+        return len(self._completions) / window if window > 0 else 0.0
+
+    def snapshot(self) -> Dict:
+        rate = self.throughput()
+        total = max(self.total, self.counts["discovered"]) if self.total is not None else None
+        eta = None
+        if total is not None and rate > 0:
+            eta = round(max(0, total - self.counts["completed"]) / rate, 1)
+        leaders = [entry for _, _, entry in sorted(self._leaders, key=lambda leader: leader[:2], reverse=True)]
+        return {
+            "job_id": self.job_id,
+            "counts": dict(self.counts),
+            "total": total,
+            "elapsed_seconds": round(time.monotonic() - self._started, 1),
+            "throughput_per_minute": round(rate * 60, 1),
+            "eta_seconds": eta,
+            "leaderboard": [{"rank": rank, **entry} for rank, entry in enumerate(leaders, start=1)],
+            "degraded": list(self.degraded),
+        }
+
+    async def wait_changed(self, version: int, timeout: Optional[float] = None) -> int:
+        """Waits until the progress moves past `version` or `timeout` runs out, returns the current version"""
+        if self.version == version:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.version
@@ -1,6 +1,7 @@
 from .server import score
 from .ats_scoring import ATSScorer, JobRequirements
+from .blueprints import CascadePolicy
 from .smart_scoring import process_candidate, ScoringConfig, GroqScorer
 
 __all__ = ['process_candidate', 'ATSScorer', 'score',
-           'JobRequirements', 'GroqScorer', 'ScoringConfig']
+           'JobRequirements', 'GroqScorer', 'ScoringConfig', 'CascadePolicy']
@@ -1,4 +1,7 @@
 from .core import ATSScorer
 from .blueprints import JobRequirements
+from .matcher import RequirementMatcher
+from .vectorized import VectorizedATSScorer
 
-__all__ = ['JobRequirements', 'ATSScorer']
+__all__ = ['JobRequirements', 'ATSScorer',
+           'RequirementMatcher', 'VectorizedATSScorer']
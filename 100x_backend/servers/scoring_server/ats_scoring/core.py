@@ -1,10 +1,14 @@
 import re
 import json
-import difflib
 from datetime import datetime
 from typing import Dict, List, Any
 
+from ...date_utils import entry_dates, parse_date
 from .blueprints import JobRequirements, ScoringWeights
+from .matcher import RequirementMatcher
+
+SCORE_COMPONENTS = ['skills_score', 'experience_score', 'education_score', 'progression_score',
+                    'project_score', 'recency_score', 'completeness_score']
 
 
 class ATSScorer:
@@ -12,6 +16,7 @@ class ATSScorer:
         self.job_requirements = job_requirements
         self.weights = weights or ScoringWeights()
         self.threshold_score = 60.0
+        self.matcher = RequirementMatcher(job_requirements)
 
     def calculate_overall_score(self, resume_data: Dict) -> Dict[str, Any]:
         try:
@@ -50,6 +55,28 @@ class ATSScorer:
                 'error': str(e)
             }
 
+    def score_batch(self, resumes: List[Dict], threshold: float = None) -> Dict[str, List]:
+        """
+        Scores many resumes at once and returns the results column-wise: one list per field
+        (overall_score, passed, candidate_name and every detailed score), aligned with `resumes`.
+        """
+        threshold = self.threshold_score if threshold is None else threshold
+        columns: Dict[str, List] = {
+            'overall_score': [], 'passed': [], 'candidate_name': []}
+        for component in SCORE_COMPONENTS:
+            columns[component] = []
+
+        for resume_data in resumes:
+            result = self.calculate_overall_score(resume_data)
+            columns['overall_score'].append(result['overall_score'])
+            columns['passed'].append(result['overall_score'] >= threshold)
+            columns['candidate_name'].append(result['candidate_name'])
+            for component in SCORE_COMPONENTS:
+                columns[component].append(
+                    result['detailed_scores'].get(component, 0.0))
+
+        return columns
+
     def _safe_call(self, func, *args, **kwargs):
         try:
             return func(*args, **kwargs)
@@ -69,10 +96,8 @@ class ATSScorer:
             resume_skills.extend(self._extract_skills_from_text(skill_text))
 
         resume_skills = [skill.lower().strip() for skill in resume_skills]
-        required_skills = [skill.lower().strip()
-                           for skill in self.job_requirements.required_skills]
-        preferred_skills = [skill.lower().strip()
-                            for skill in self.job_requirements.preferred_skills]
+        required_skills = self.matcher.required_skills
+        preferred_skills = self.matcher.preferred_skills
 
         required_matches = self._fuzzy_skill_match(
             resume_skills, required_skills)
@@ -196,7 +221,7 @@ class ATSScorer:
             return 50.0
 
         sorted_exp = sorted(work_experiences,
-                            key=lambda x: self._parse_date(x.get('from_date', '')))
+                            key=lambda x: entry_dates(x)[0])
 
         progression_score = 50
 
@@ -267,11 +292,10 @@ class ATSScorer:
 
         latest_end_date = None
         for exp in work_experiences:
-            end_date = exp.get('to_date', '')
-            if end_date.lower() in ['present', 'current', '']:
+            _, parsed_date, is_current = entry_dates(exp)
+            if is_current:
                 return 100.0
 
-            parsed_date = self._parse_date(end_date)
             if parsed_date and (latest_end_date is None or parsed_date > latest_end_date):
                 latest_end_date = parsed_date
 
@@ -339,40 +363,17 @@ class ATSScorer:
 
     def _fuzzy_skill_match(self, resume_skills: List[str], required_skills: List[str]) -> int:
         """Count fuzzy matches between resume and required skills"""
-        matches = 0
-
-        for req_skill in required_skills:
-            for resume_skill in resume_skills:
-
-                if req_skill in resume_skill or resume_skill in req_skill:
-                    matches += 1
-                    break
-
-                elif difflib.SequenceMatcher(None, req_skill, resume_skill).ratio() > 0.8:
-                    matches += 1
-                    break
-
-        return matches
+        return self.matcher.count_skill_matches(resume_skills, required_skills)
 
     def _calculate_keyword_relevance(self, text: str, keywords: List[str]) -> float:
         """Calculate keyword relevance score (0-1)"""
-        if not keywords:
-            return 1.0
-
-        text_lower = text.lower()
-        matches = sum(
-            1 for keyword in keywords if keyword.lower() in text_lower)
-        return matches / len(keywords)
+        return self.matcher.keyword_set(keywords).relevance(text)
 
     def _calculate_experience_duration(self, experience: Dict) -> float:
         """Calculate experience duration in years"""
-        from_date = self._parse_date(experience.get('from_date', ''))
-        to_date_str = experience.get('to_date', '')
-
-        if to_date_str.lower() in ['present', 'current', '']:
+        from_date, to_date, is_current = entry_dates(experience)
+        if is_current:
             to_date = datetime.now()
-        else:
-            to_date = self._parse_date(to_date_str)
 
         if not from_date or not to_date:
             return 0.0
@@ -386,24 +387,4 @@ class ATSScorer:
 
     def _parse_date(self, date_str: str) -> datetime:
         """Parse date string to datetime object"""
-        if not date_str:
-            return None
-
-        date_str = date_str.strip()
-
-        formats = [
-            '%b %Y',
-            '%B %Y',
-            '%m/%Y',
-            '%Y-%m',
-            '%Y',
-            '%m %Y'
-        ]
-
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
-
-        return None
+        return parse_date(date_str)
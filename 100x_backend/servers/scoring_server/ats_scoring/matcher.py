@@ -0,0 +1,192 @@
+import difflib
+from collections import Counter, deque
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from .blueprints import JobRequirements
+
+# Below this many distinct keywords, C-level `in` scans beat a pure-Python automaton
+AHO_CORASICK_MIN_KEYWORDS = 32
+# Requirements longer than this are checked directly instead of through the substring index
+MAX_INDEXED_SKILL_LENGTH = 64
+FUZZY_CUTOFF = 0.8
+
+
+class AhoCorasick:
+    """Multi-pattern automaton: a single pass over a text finds every pattern it contains"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[str]] = [set()]
+
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._build_failure_links()
+
+    def _add(self, pattern: str):
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            state = next_state
+        self._out[state].add(pattern)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(ch, 0)
+                self._out[next_state] |= self._out[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """Every pattern occurring anywhere in `text`"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[str] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+
+class KeywordSet:
+    """Pre-lowered keywords with their multiplicity, counts how many a text mentions"""
+
+    def __init__(self, keywords: List[str]):
+        self.total = len(keywords)
+        self.counts = Counter(keyword.lower() for keyword in keywords)
+        self._automaton = None
+        if len(self.counts) >= AHO_CORASICK_MIN_KEYWORDS:
+            self._automaton = AhoCorasick(self.counts)
+
+    def relevance(self, text: str) -> float:
+        """Share of keywords occurring in `text` (0-1), 1.0 when there are no keywords"""
+        if not self.total:
+            return 1.0
+
+        text_lower = text.lower()
+        if self._automaton is not None:
+            found = self._automaton.find(text_lower)
+            matches = sum(count for keyword, count in self.counts.items()
+                          if not keyword or keyword in found)
+        else:
+            matches = sum(count for keyword, count in self.counts.items()
+                          if keyword in text_lower)
+        return matches / self.total
+
+
+class SkillMatcher:
+    """
+    Matches resume skills against a fixed list of requirement skills. A resume skill matches a
+    requirement when either contains the other, or their SequenceMatcher ratio is above 0.8:
+      • an Aho-Corasick pass finds requirements contained in the resume skill
+      • a substring index finds requirements containing the resume skill
+      • fuzzy candidates are bucketed by length and pruned with the ratio's cheap upper bounds
+      • results are memoized per resume skill string, across every resume of the job.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        self.skills: List[str] = list(dict.fromkeys(skills))
+        self._has_empty = "" in self.skills
+        self._automaton = AhoCorasick(self.skills)
+
+        self._substrings: Dict[str, Set[str]] = {}
+        self._unindexed: List[str] = []
+        self._by_length: Dict[int, List[str]] = {}
+        for skill in self.skills:
+            self._by_length.setdefault(len(skill), []).append(skill)
+            if len(skill) > MAX_INDEXED_SKILL_LENGTH:
+                self._unindexed.append(skill)
+                continue
+            for start in range(len(skill)):
+                for end in range(start + 1, len(skill) + 1):
+                    self._substrings.setdefault(
+                        skill[start:end], set()).add(skill)
+
+        self._memo: Dict[str, FrozenSet[str]] = {}
+
+    def _containing(self, resume_skill: str) -> Set[str]:
+        if not resume_skill:
+            return set(self.skills)
+        containing = set(self._substrings.get(resume_skill, ()))
+        containing.update(skill for skill in self._unindexed
+                          if resume_skill in skill)
+        return containing
+
+    def _fuzzy(self, resume_skill: str, exclude: Set[str]) -> Set[str]:
+        matched = set()
+        b = len(resume_skill)
+        for a, skills in self._by_length.items():
+            # real_quick_ratio: 2 * min(a, b) / (a + b) bounds the ratio from above
+            if a + b == 0 or 2.0 * min(a, b) / (a + b) <= FUZZY_CUTOFF:
+                continue
+            for skill in skills:
+                if skill in exclude:
+                    continue
+                matcher = difflib.SequenceMatcher(None, skill, resume_skill)
+                if matcher.quick_ratio() > FUZZY_CUTOFF and matcher.ratio() > FUZZY_CUTOFF:
+                    matched.add(skill)
+        return matched
+
+    def matches(self, resume_skill: str) -> FrozenSet[str]:
+        """Requirement skills matched by one (lower-cased, stripped) resume skill"""
+        cached = self._memo.get(resume_skill)
+        if cached is not None:
+            return cached
+
+        matched = self._automaton.find(resume_skill)
+        if self._has_empty:
+            matched.add("")
+        matched |= self._containing(resume_skill)
+        matched |= self._fuzzy(resume_skill, matched)
+
+        result = frozenset(matched)
+        self._memo[resume_skill] = result
+        return result
+
+    def count(self, resume_skills: List[str], requirements: List[str]) -> int:
+        """Number of `requirements` (duplicates counted) matched by any of `resume_skills`"""
+        matched: Set[str] = set()
+        for resume_skill in set(resume_skills):
+            matched |= self.matches(resume_skill)
+        return sum(1 for requirement in requirements if requirement in matched)
+
+
+class RequirementMatcher:
+    """Everything ATSScorer matches resumes against, compiled once per job"""
+
+    def __init__(self, job_requirements: JobRequirements):
+        self.required_skills = [skill.lower().strip()
+                                for skill in job_requirements.required_skills]
+        self.preferred_skills = [skill.lower().strip()
+                                 for skill in job_requirements.preferred_skills]
+        self.skills = SkillMatcher(self.required_skills + self.preferred_skills)
+        self._compiled_skills = set(self.skills.skills)
+        self._keyword_sets: Dict[Tuple[str, ...], KeywordSet] = {}
+
+    def keyword_set(self, keywords: List[str]) -> KeywordSet:
+        key = tuple(keywords)
+        keyword_set = self._keyword_sets.get(key)
+        if keyword_set is None:
+            keyword_set = self._keyword_sets[key] = KeywordSet(keywords)
+        return keyword_set
+
+    def count_skill_matches(self, resume_skills: List[str], requirements: List[str]) -> int:
+        if not self._compiled_skills.issuperset(requirements):
+            # Not one of the compiled requirement lists, match against it directly
+            return SkillMatcher(requirements).count(resume_skills, requirements)
+        return self.skills.count(resume_skills, requirements)
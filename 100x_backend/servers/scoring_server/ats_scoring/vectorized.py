@@ -0,0 +1,351 @@
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from ...date_utils import entry_dates
+from .blueprints import JobRequirements, ScoringWeights
+from .core import ATSScorer, SCORE_COMPONENTS
+
+PROGRESSION_KEYWORDS = ['intern', 'junior',
+                        'senior', 'lead', 'manager', 'director']
+FIELD_KEYWORDS = ['computer', 'data', 'engineering', 'science', 'technology']
+
+
+def _ordinal(date: Optional[datetime]) -> float:
+    return float(date.toordinal()) if date else np.nan
+
+
+def _group_mean(values: np.ndarray, groups: np.ndarray, size: int) -> np.ndarray:
+    """Mean of `values` per group index, 0 for groups without values"""
+    totals = np.bincount(groups, weights=values, minlength=size)
+    counts = np.bincount(groups, minlength=size)
+    return np.divide(totals, counts, out=np.zeros(size), where=counts > 0)
+
+
+class _Entries:
+    """Column lists for experience/project/education entries, each tagged with its resume index"""
+
+    def __init__(self, *columns: str):
+        self.columns = {column: [] for column in ("resume",) + columns}
+
+    def extend(self, rows: List[tuple]):
+        for row in rows:
+            for column, value in zip(self.columns, row):
+                self.columns[column].append(value)
+
+    def array(self, column: str, dtype=float) -> np.ndarray:
+        return np.asarray(self.columns[column], dtype=dtype)
+
+
+class VectorizedATSScorer:
+    """
+    Batch ATS engine with the same scores as ATSScorer:
+      • one pass turns every resume into feature arrays (skill-match matrix, keyword hits,
+        entry dates, education points, title levels, completeness flags)
+      • every component score and the weighted overall score are then NumPy operations over
+        the whole batch.
+    A component that raises for a resume scores 0, as in ATSScorer._safe_call.
+    """
+
+    def __init__(self, job_requirements: JobRequirements, weights: ScoringWeights = None):
+        self.scorer = ATSScorer(job_requirements, weights)
+        self.job_requirements = job_requirements
+        self.weights = self.scorer.weights
+        self.threshold_score = self.scorer.threshold_score
+        self.matcher = self.scorer.matcher
+
+        skill_index = {skill: i for i, skill in enumerate(
+            self.matcher.skills.skills)}
+        self._required_idx = np.array(
+            [skill_index[s] for s in self.matcher.required_skills], dtype=np.intp)
+        self._preferred_idx = np.array(
+            [skill_index[s] for s in self.matcher.preferred_skills], dtype=np.intp)
+        self._skill_index = skill_index
+
+        self._project_keywords = job_requirements.industry_keywords + \
+            job_requirements.required_skills
+
+    def _relevance(self, texts: List[str], keywords: List[str]) -> np.ndarray:
+        """Keyword relevance (0-1) of every text: a texts × keywords hit matrix times keyword multiplicity"""
+        if not keywords:
+            return np.ones(len(texts))
+        keyword_set = self.matcher.keyword_set(keywords)
+        distinct = list(keyword_set.counts)
+        multiplicity = np.array([keyword_set.counts[k]
+                                for k in distinct], dtype=float)
+        hits = np.array([[keyword in text.lower() for keyword in distinct] for text in texts],
+                        dtype=bool).reshape(len(texts), len(distinct))
+        return hits @ multiplicity / keyword_set.total
+
+    def _dated_rows(self, index: int, entries: List[Dict], text_keys: tuple, now: float) -> List[tuple]:
+        rows = []
+        for entry in entries:
+            start, end, is_current = entry_dates(entry)
+            rows.append((index, *(entry.get(key, '').lower() for key in text_keys),
+                         _ordinal(start), now if is_current else _ordinal(end),
+                         bool(entry.get('company_name'))))
+        return rows
+
+    def _education_rows(self, index: int, educations: List[Dict]) -> List[tuple]:
+        required = self.job_requirements.required_education.lower()
+        rows = []
+        for edu in educations:
+            degree = edu.get('degree', '').lower()
+            field = edu.get('field_of_study', '').lower()
+            grade = edu.get('grade', '')
+
+            points = 0
+            if 'bachelor' in required and 'bachelor' in degree:
+                points += 60
+            elif 'master' in required and 'master' in degree:
+                points += 70
+            elif 'phd' in required or 'doctorate' in required:
+                if 'phd' in degree or 'doctorate' in degree:
+                    points += 80
+            elif degree:
+                points += 40
+            if any(keyword in field for keyword in FIELD_KEYWORDS):
+                points += 5
+            if 'data science' in field or 'computer science' in field:
+                points += 25
+
+            # grade_state: 0 no grade, 1 parsed percentage, 2 unparseable grade
+            percentage, grade_state = np.nan, 0
+            if grade:
+                try:
+                    if '/' in grade:
+                        percentage = float(grade.split('/')[0]) / \
+                            float(grade.split('/')[1]) * 100
+                    else:
+                        percentage = float(grade)
+                    grade_state = 1
+                except:
+                    grade_state = 2
+            rows.append((index, points, percentage, grade_state))
+        return rows
+
+    def _progression_features(self, work_experiences: List[Dict]) -> tuple:
+        """(promotions, same-level moves, worked at several companies) in start-date order"""
+        sorted_exp = sorted(work_experiences,
+                            key=lambda x: entry_dates(x)[0])
+        levels = []
+        for exp in sorted_exp:
+            title = exp.get('job_title', '').lower()
+            levels.append(next((i for i, keyword in enumerate(PROGRESSION_KEYWORDS)
+                                if keyword in title), 0))
+        steps = np.diff(np.array(levels, dtype=int))
+        companies = [exp.get('company_name', '') for exp in sorted_exp]
+        return int((steps > 0).sum()), int((steps == 0).sum()), len(set(companies)) > 1
+
+    def _recency_months(self, work_experiences: List[Dict], now: datetime) -> float:
+        """Months since the latest end date, 0 for a current role, NaN when no date parses"""
+        latest = None
+        for exp in work_experiences:
+            _, parsed, is_current = entry_dates(exp)
+            if is_current:
+                return 0.0
+            if parsed and (latest is None or parsed > latest):
+                latest = parsed
+        if not latest:
+            return np.nan
+        return float((now.year - latest.year) * 12 + (now.month - latest.month))
+
+    def score_batch(self, resumes: List[Dict], threshold: float = None) -> Dict[str, List]:
+        """Same columnar output as ATSScorer.score_batch"""
+        threshold = self.threshold_score if threshold is None else threshold
+        n = len(resumes)
+        now = datetime.now()
+        now_ordinal = now.toordinal() + (now - now.replace(hour=0, minute=0, second=0,
+                                                           microsecond=0)).total_seconds() / 86400
+
+        # Per-resume component validity, mirrors ATSScorer._safe_call
+        valid = {component: np.ones(n, dtype=bool)
+                 for component in SCORE_COMPONENTS}
+        names = [''] * n
+        failed = np.zeros(n, dtype=bool)
+
+        skill_matches = np.zeros((n, len(self._skill_index)), dtype=bool)
+        has_skills = np.zeros(n, dtype=bool)
+        experiences = _Entries("title", "description", "start", "end", "company")
+        projects = _Entries("title", "description", "start", "end", "company")
+        educations = _Entries("points", "percentage", "grade_state")
+        exp_counts = np.zeros(n, dtype=int)
+        project_counts = np.zeros(n, dtype=int)
+        edu_counts = np.zeros(n, dtype=int)
+        progression = np.zeros((n, 3), dtype=float)
+        many_roles = np.zeros(n, dtype=bool)
+        recency = np.full(n, np.nan)
+        recency_present = np.zeros(n, dtype=bool)
+        completeness = np.zeros((n, 8), dtype=bool)
+
+        for i, resume_data in enumerate(resumes):
+            try:
+                info = resume_data.get('personal_information', {})
+                names[i] = f"{info.get('first_name', '')} {info.get('last_name', '')}".strip()
+            except Exception:
+                failed[i] = True
+                continue
+
+            try:
+                skill_info = resume_data.get('skill', {})
+                if skill_info:
+                    has_skills[i] = True
+                    matched = set()
+                    for skill_text in skill_info.get('skill_values', []):
+                        for skill in self.scorer._extract_skills_from_text(skill_text):
+                            matched |= self.matcher.skills.matches(
+                                skill.lower().strip())
+                    for skill in matched:
+                        skill_matches[i, self._skill_index[skill]] = True
+            except Exception:
+                valid['skills_score'][i] = False
+
+            work_experiences = resume_data.get('work_experience', [])
+            try:
+                rows = self._dated_rows(
+                    i, work_experiences, ('job_title', 'description'), now_ordinal)
+                experiences.extend(rows)
+                exp_counts[i] = len(rows)
+            except Exception:
+                valid['experience_score'][i] = False
+
+            try:
+                rows = self._dated_rows(
+                    i, resume_data.get('projects', []), ('title', 'description'), now_ordinal)
+                projects.extend(rows)
+                project_counts[i] = len(rows)
+            except Exception:
+                valid['project_score'][i] = False
+
+            try:
+                rows = self._education_rows(
+                    i, resume_data.get('education', []))
+                educations.extend(rows)
+                edu_counts[i] = len(rows)
+            except Exception:
+                valid['education_score'][i] = False
+
+            try:
+                if len(work_experiences) >= 2:
+                    many_roles[i] = True
+                    progression[i] = self._progression_features(
+                        work_experiences)
+            except Exception:
+                valid['progression_score'][i] = False
+
+            try:
+                if work_experiences:
+                    recency[i] = self._recency_months(work_experiences, now)
+                    recency_present[i] = True
+            except Exception:
+                valid['recency_score'][i] = False
+
+            try:
+                completeness[i] = [
+                    bool(info.get('first_name') and info.get('last_name')),
+                    bool(info.get('email_address')),
+                    bool(info.get('phone_number')),
+                    bool(info.get('linkedin_url') or info.get(
+                        'website_url') or info.get('github_url')),
+                    bool(resume_data.get('work_experience')),
+                    bool(resume_data.get('education')),
+                    bool(resume_data.get('skill', {}).get('skill_values')),
+                    bool(resume_data.get('projects')),
+                ]
+            except Exception:
+                valid['completeness_score'][i] = False
+
+        scores = {
+            'skills_score': self._skills_scores(skill_matches, has_skills),
+            'experience_score': self._experience_scores(experiences, n),
+            'education_score': self._education_scores(educations, edu_counts, n),
+            'progression_score': np.where(
+                many_roles,
+                np.minimum(100, 50 + 15 * progression[:, 0] + 5 *
+                           progression[:, 1] + 10 * progression[:, 2]),
+                50.0),
+            'project_score': self._project_scores(projects, n),
+            'recency_score': self._recency_scores(recency, recency_present),
+            'completeness_score': completeness @ np.array([5, 5, 5, 5, 30, 20, 20, 10], dtype=float),
+        }
+        for component in SCORE_COMPONENTS:
+            scores[component] = np.where(
+                valid[component] & ~failed, scores[component], 0.0)
+
+        w = self.weights
+        overall = (
+            scores['skills_score'] * w.skills_match +
+            scores['experience_score'] * w.experience_relevance +
+            scores['education_score'] * w.education_match +
+            scores['progression_score'] * w.career_progression +
+            scores['project_score'] * w.project_relevance +
+            scores['recency_score'] * w.recency +
+            scores['completeness_score'] * w.completeness
+        )
+        overall = np.round(overall, 2)
+
+        columns: Dict[str, List] = {
+            'overall_score': overall.tolist(),
+            'passed': (overall >= threshold).tolist(),
+            'candidate_name': names,
+        }
+        for component in SCORE_COMPONENTS:
+            columns[component] = scores[component].tolist()
+        return columns
+
+    def _skills_scores(self, skill_matches: np.ndarray, has_skills: np.ndarray) -> np.ndarray:
+        def share(idx: np.ndarray) -> np.ndarray:
+            if not len(idx):
+                return np.full(len(skill_matches), 100.0)
+            return skill_matches[:, idx].sum(axis=1) / len(idx) * 100
+
+        scores = np.minimum(100, share(self._required_idx) * 0.7 +
+                            share(self._preferred_idx) * 0.3)
+        return np.where(has_skills, scores, 0.0)
+
+    def _entry_scores(self, entries: _Entries, title_keywords: List[str], description_keywords: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per entry: weighted title relevance, weighted description relevance and duration in years"""
+        title = self._relevance(entries.columns["title"], title_keywords) * 30
+        description = self._relevance(
+            entries.columns["description"], description_keywords) * 40
+        days = np.floor(entries.array("end") - entries.array("start"))
+        years = np.where(np.isnan(days), 0.0, days / 365.25)
+        return title, description, years
+
+    def _experience_scores(self, experiences: _Entries, n: int) -> np.ndarray:
+        if not experiences.columns["resume"]:
+            return np.zeros(n)
+        title, description, years = self._entry_scores(
+            experiences, self.job_requirements.job_title_keywords, self.job_requirements.industry_keywords)
+        company = np.where(experiences.array("company", dtype=bool), 10, 5)
+        entry_scores = title + description + \
+            np.minimum(20, years * 4) + company
+        return np.minimum(100, _group_mean(entry_scores, experiences.array("resume", dtype=np.intp), n))
+
+    def _project_scores(self, projects: _Entries, n: int) -> np.ndarray:
+        if not projects.columns["resume"]:
+            return np.zeros(n)
+        title, description, years = self._entry_scores(
+            projects, self._project_keywords, self._project_keywords)
+        entry_scores = title + description + np.minimum(30, years * 10)
+        return np.minimum(100, _group_mean(entry_scores, projects.array("resume", dtype=np.intp), n))
+
+    def _education_scores(self, educations: _Entries, edu_counts: np.ndarray, n: int) -> np.ndarray:
+        best = np.zeros(n)
+        if educations.columns["resume"]:
+            percentage = educations.array("percentage")
+            state = educations.array("grade_state", dtype=int)
+            with np.errstate(invalid="ignore"):
+                grade_points = np.select(
+                    [state == 2, percentage >= 85, percentage >= 75, percentage >= 65],
+                    [5, 15, 10, 5], 0)
+            np.maximum.at(best, educations.array("resume", dtype=np.intp),
+                          educations.array("points") + np.where(state == 0, 0, grade_points))
+        return np.where(edu_counts > 0, np.minimum(100, best), 30.0)
+
+    def _recency_scores(self, months: np.ndarray, has_experience: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            scores = np.select(
+                [np.isnan(months), months <= 6, months <= 12, months <= 24, months <= 36],
+                [50.0, 100.0, 80.0, 60.0, 40.0], 20.0)
+        return np.where(has_experience, scores, 50.0)
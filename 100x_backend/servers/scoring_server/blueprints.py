@@ -0,0 +1,77 @@
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CASCADE_MODES = ("all", "ats_passed", "top_k", "ats_band")
+# `l2_status` of resumes a cascade policy rejected without L2 scoring
+CASCADE_SKIP_STATUSES = ("skipped_ats_failed", "skipped_ats_band", "skipped_top_k")
+
+
+@dataclass
+class CascadePolicy:
+    """
+    Which ATS-scored resumes go on to L2 (LLM) scoring:
+      • all         every resume
+      • ats_passed  only resumes that passed ATS
+      • top_k       the `top_k` best ATS passes
+      • ats_band    ATS passes with `min_ats_score` <= ats_score <= `max_ats_score`
+    Only ATS passes can end up in `passed_ranked_resumes`, so every mode but `all` skips ATS failures.
+    """
+    mode: str = "ats_passed"
+    top_k: Optional[int] = None
+    min_ats_score: Optional[float] = None
+    max_ats_score: Optional[float] = None
+
+    def __post_init__(self):
+        if self.mode not in CASCADE_MODES:
+            raise ValueError(
+                f"Unknown cascade mode '{self.mode}', expected one of {CASCADE_MODES}")
+        if self.mode == "top_k" and not self.top_k:
+            raise ValueError("Cascade mode 'top_k' needs a positive top_k")
+
+    @classmethod
+    def from_env(cls) -> "CascadePolicy":
+        def env(name: str, cast):
+            value = os.getenv(f"l2_cascade_{name}")
+            return cast(value) if value else None
+
+        return cls(
+            mode=os.getenv("l2_cascade_mode", cls.mode),
+            top_k=env("top_k", int),
+            min_ats_score=env("min_ats_score", float),
+            max_ats_score=env("max_ats_score", float),
+        )
+
+    @property
+    def needs_all_scores(self) -> bool:
+        """True when a resume can only be selected once every ATS score of the job is known"""
+        return self.mode == "top_k"
+
+    def skip_reason(self, ats_score: float, ats_passed: bool) -> Optional[str]:
+        """The `l2_status` recorded for a resume this policy skips, None if it goes on to L2"""
+        if self.mode == "all":
+            return None
+        if not ats_passed:
+            return "skipped_ats_failed"
+        if self.mode == "ats_band":
+            if self.min_ats_score is not None and ats_score < self.min_ats_score:
+                return "skipped_ats_band"
+            if self.max_ats_score is not None and ats_score > self.max_ats_score:
+                return "skipped_ats_band"
+        return None
+
+    def select(self, scored: Iterable[Tuple[str, float, bool]]) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Splits (resume id, ats_score, ats_passed) rows into the ids to L2-score, best ATS score
+        first, and a mapping of skipped ids to their `l2_status`.
+        """
+        selected, skipped = [], {}
+        for resume_id, ats_score, ats_passed in sorted(scored, key=lambda r: -(r[1] or 0.0)):
+            reason = self.skip_reason(ats_score, ats_passed)
+            if reason is None and self.mode == "top_k" and len(selected) >= self.top_k:
+                reason = "skipped_top_k"
+            if reason is None:
+                selected.append(resume_id)
+            else:
+                skipped[resume_id] = reason
+        return selected, skipped
@@ -1,37 +1,36 @@
-import json
+import os
+import asyncio
 import duckdb
-from .ats_scoring import ATSScorer, JobRequirements
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple, Union
+from .ats_scoring import ATSScorer, JobRequirements, VectorizedATSScorer
+from .blueprints import CascadePolicy
+from ..db_utils import TYPED_RESUME_COLUMNS, JobConnection, get_connection_manager, in_stage, resume_from_typed_columns
 from .smart_scoring import process_candidate
 
+L2_CONCURRENCY = int(os.getenv("l2_concurrency", 8))
+# "vectorized" scores each batch (a job's ATS micro-batches, or the whole job in `score()`) with the NumPy engine
+ATS_ENGINE = os.getenv("ats_engine", "python")
 
-async def l1_score_resumes(db_path: str, scorer: ATSScorer, threshold: float = 40.0):
+# The typed resume sections scoring reads, instead of decoding `raw` per resume
+RESUME_SECTIONS_SQL = ", ".join(TYPED_RESUME_COLUMNS)
 
-    conn = duckdb.connect(db_path)
+SCORE_COLUMNS = [("ats_score", "DOUBLE"), ("ats_passed", "BOOLEAN"),
+                 ("smart_score", "DOUBLE"), ("smart_passed", "BOOLEAN"),
+                 ("l2_status", "TEXT")]
 
-    resumes = conn.execute(
-        "SELECT id, raw FROM resumes;").fetchall()
 
-    for resume_id, resume_text in resumes:
-        ats_score = scorer.calculate_overall_score(json.loads(resume_text))
-        ats_passed = ats_score['overall_score'] >= threshold
-
-        conn.execute("""
-            UPDATE resumes
-            SET ats_score = ?, ats_passed = ?
-            WHERE id = ?
-        """, [ats_score['overall_score'], ats_passed, resume_id])
-
-        print(
-            f"Updated resume ID {resume_id}: Score={ats_score}, Passed={ats_passed}")
-
-
-async def l2_score_resumes(db_path: str, job_requirements: JobRequirements):
-    conn = duckdb.connect(db_path)
+def ensure_score_columns(conn):
+    for column, dtype in SCORE_COLUMNS:
+        try:
+            conn.execute(
+                f"ALTER TABLE resumes ADD COLUMN {column} {dtype};")
+        except duckdb.CatalogException:
+            pass
 
-    resumes = conn.execute(
-        "SELECT id, name, email, phone, job_id, raw FROM resumes;").fetchall()
 
-    job_req_dict = {
+def job_requirements_to_dict(job_requirements: JobRequirements) -> Dict[str, Any]:
+    return {
         'required_skills': job_requirements.required_skills,
         'preferred_skills': job_requirements.preferred_skills,
         'min_experience_years': job_requirements.min_experience_years,
@@ -42,61 +41,171 @@ async def l2_score_resumes(db_path: str, job_requirements: JobRequirements):
         'location_preference': job_requirements.location_preference
     }
 
-    for candidate_resume in resumes:
-        resume_id = candidate_resume[0]
-        name = candidate_resume[1]
 
-        # Get detailed evaluation
-        evaluation = await process_candidate(candidate_resume, job_requirements=job_req_dict)
+def store_smart_score(conn, resume_id: str, final_score: float, is_adequate: bool, l2_status: str):
+    conn.execute("""
+        UPDATE resumes
+        SET smart_score = ?, smart_passed = ?, l2_status = ?
+        WHERE id = ?
+    """, [final_score, is_adequate, l2_status, resume_id])
+
+
+async def l2_score_resume(db: JobConnection, candidate_resume: Tuple, job_req_dict: Dict[str, Any],
+                          content_hash: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Smart-score a single candidate tuple and store the result, returns the evaluation scores.
+    With the resume's `content_hash`, its 'smart_scored' stage is recorded in the same transaction.
+    """
+    resume_id = candidate_resume[0]
+    name = candidate_resume[1]
+
+    # Get detailed evaluation
+    evaluation = await process_candidate(candidate_resume, job_requirements=job_req_dict)
+
+    # Extract scores from the new structure
+    scores = evaluation.get('scores', {})
+    final_score = scores.get('final_score', 0)
+    is_adequate = scores.get('is_adequate', False)
+    recommended_level = scores.get('recommended_level', 'entry')
+    l2_status = 'failed_early' if scores.get('failed_early') else 'scored'
+
+    # Get component breakdowns
+    breakdowns = scores.get('breakdowns', {})
+
+    # Store the score in the database
+    await db.write(in_stage(store_smart_score, content_hash, "smart_scored"),
+                   resume_id, final_score, is_adequate, l2_status)
+
+    # Display detailed results
+    print(f"\nEvaluating {name} (ID: {resume_id}):")
+    print("-" * 50)
+    print(f"Final Score: {final_score:.1f}")
+    print(f"Level: {recommended_level}")
+    print(f"Pass Status: {'PASS' if is_adequate else 'FAIL'}"
+          f"{' (failed early)' if l2_status == 'failed_early' else ''}")
+    print("\nComponent Scores:")
+    for component, details in breakdowns.items():
+        print(
+            f"• {component.replace('_', ' ').title()}: {details.get('score', 0):.1f}")
+    print("-" * 50)
 
-        # Extract scores from the new structure
-        scores = evaluation.get('scores', {})
-        final_score = scores.get('final_score', 0)
-        is_adequate = scores.get('is_adequate', False)
-        recommended_level = scores.get('recommended_level', 'entry')
+    return scores
 
-        # Get component breakdowns
-        breakdowns = scores.get('breakdowns', {})
 
-        # Store the score in the database
-        conn.execute("""
-            UPDATE resumes
-            SET smart_score = ?, smart_passed = ?
-            WHERE id = ?
-        """, [final_score, is_adequate, resume_id])
-
-        # Display detailed results
-        print(f"\nEvaluating {name} (ID: {resume_id}):")
-        print("-" * 50)
-        print(f"Final Score: {final_score:.1f}")
-        print(f"Level: {recommended_level}")
-        print(f"Pass Status: {'PASS' if is_adequate else 'FAIL'}")
-        print("\nComponent Scores:")
-        for component, details in breakdowns.items():
-            print(
-                f"• {component.replace('_', ' ').title()}: {details.get('score', 0):.1f}")
-        print("-" * 50)
-
-
-async def score(db_path: str, job_requirements: JobRequirements):
-    conn = duckdb.connect(db_path)
-
-    for column, dtype in [("ats_score", "DOUBLE"), ("ats_passed", "BOOLEAN"), ("smart_score", "DOUBLE"), ("smart_passed", "BOOLEAN")]:
-        try:
-            conn.execute(
-                f"ALTER TABLE resumes ADD COLUMN {column} {dtype};")
-        except duckdb.CatalogException:
-            pass
+def mark_l2_skipped(conn, skipped: Dict[str, str]):
+    """Records the `l2_status` of resumes the cascade policy kept out of L2"""
+    if skipped:
+        conn.executemany(
+            "UPDATE resumes SET l2_status = ? WHERE id = ?",
+            [[status, resume_id] for resume_id, status in skipped.items()])
+        print(f"Skipped L2 scoring for {len(skipped)} resumes")
 
-    await l1_score_resumes(
-        db_path, scorer=ATSScorer(job_requirements))
 
-    await l2_score_resumes(
-        db_path=db_path, job_requirements=job_requirements
-    )
+def write_ats_scores(conn, resume_ids: List[str], ats_scores: List[float], ats_passed: List[bool]):
+    """Writes a batch of ATS results back with one joined UPDATE instead of one per resume"""
+    batch = pd.DataFrame(
+        {'id': resume_ids, 'ats_score': ats_scores, 'ats_passed': ats_passed})
+    conn.register('ats_score_batch', batch)
+    try:
+        conn.execute("""
+            UPDATE resumes
+            SET ats_score = b.ats_score, ats_passed = b.ats_passed
+            FROM ats_score_batch AS b
+            WHERE resumes.id = b.id
+        """)
+    finally:
+        conn.unregister('ats_score_batch')
+
+
+def l1_score_batch(conn, scorer: Union[ATSScorer, VectorizedATSScorer], resumes: List[Tuple[str, Dict]],
+                   threshold: float = 40.0) -> Dict[str, List]:
+    """ATS-scores a batch of (resume id, resume) and stores it with one UPDATE, returns the score columns"""
+    results = scorer.score_batch([resume for _, resume in resumes], threshold=threshold)
+    write_ats_scores(conn, [resume_id for resume_id, _ in resumes],
+                     results['overall_score'], results['passed'])
+    return results
+
+
+def make_ats_scorer(job_requirements: JobRequirements) -> Union[ATSScorer, VectorizedATSScorer]:
+    """The ATS engine `ats_engine` selects"""
+    if ATS_ENGINE == "vectorized":
+        return VectorizedATSScorer(job_requirements)
+    return ATSScorer(job_requirements)
+
+
+async def l1_score_resumes(db_path: str, scorer: Union[ATSScorer, VectorizedATSScorer], threshold: float = 40.0,
+                           rescore: bool = False):
+    """ATS-scores the resumes without an ATS score yet, or every resume with `rescore`"""
+    async with get_connection_manager().connection(db_path) as db:
+        resumes = await db.fetchall(
+            f"SELECT id, {RESUME_SECTIONS_SQL} FROM resumes"
+            f"{'' if rescore else ' WHERE ats_score IS NULL'};")
+        if not resumes:
+            return
+
+        if ATS_ENGINE == "vectorized" and not isinstance(scorer, VectorizedATSScorer):
+            scorer = VectorizedATSScorer(scorer.job_requirements, scorer.weights)
+
+        resume_ids = [resume[0] for resume in resumes]
+        results = scorer.score_batch(
+            [resume_from_typed_columns(*resume[1:]) for resume in resumes], threshold=threshold)
+        await db.write(write_ats_scores, resume_ids,
+                       results['overall_score'], results['passed'])
+
+    print(
+        f"Updated ATS scores for {len(resume_ids)} resumes: {sum(results['passed'])} passed")
+
+
+async def l2_score_resumes(db_path: str, job_requirements: JobRequirements, concurrency: int = L2_CONCURRENCY,
+                           policy: CascadePolicy = None, rescore: bool = False):
+    """
+    L2-scores the resumes the cascade policy selects. The policy ranks every resume of the job,
+    but only resumes without an L2 outcome yet are scored or marked skipped, unless `rescore`.
+    """
+    policy = policy or CascadePolicy.from_env()
+
+    async with get_connection_manager().connection(db_path) as db:
+        rows = await db.fetchall(
+            "SELECT id, ats_score, ats_passed, l2_status IS NULL AND smart_score IS NULL FROM resumes;")
+        pending = {row[0] for row in rows if rescore or row[3]}
+        selected, skipped = policy.select(row[:3] for row in rows)
+        selected = [resume_id for resume_id in selected if resume_id in pending]
+        await db.write(mark_l2_skipped, {resume_id: status for resume_id, status in skipped.items()
+                                         if resume_id in pending})
+
+        rows = await db.fetchall(
+            f"SELECT id, name, email, phone, job_id, {RESUME_SECTIONS_SQL} FROM resumes;")
+        # The candidate goes into the L2 prompts, so without the dates normalized at ingest
+        by_id = {row[0]: row[:5] + (resume_from_typed_columns(*row[5:], normalized_dates=False),)
+                 for row in rows}
+        resumes = [by_id[resume_id] for resume_id in selected]
+
+        job_req_dict = job_requirements_to_dict(job_requirements)
+
+        # Candidates are independent, score up to `concurrency` of them at a time
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def bounded(candidate_resume):
+            async with semaphore:
+                await l2_score_resume(db, candidate_resume, job_req_dict)
+
+        await asyncio.gather(*(bounded(candidate_resume) for candidate_resume in resumes))
+
+
+async def score(db_path: str, job_requirements: JobRequirements, policy: CascadePolicy = None, rescore: bool = False):
+    """Scores the resumes added since the last run, or all of them with `rescore`"""
+    # Held for the whole run, so both layers share the job's connection
+    async with get_connection_manager().connection(db_path) as db:
+        await db.write(ensure_score_columns)
+
+        await l1_score_resumes(
+            db_path, scorer=ATSScorer(job_requirements), rescore=rescore)
+
+        await l2_score_resumes(
+            db_path=db_path, job_requirements=job_requirements, policy=policy, rescore=rescore
+        )
 
 if __name__ == "__main__":
-    import asyncio
     example_job_requirements = JobRequirements(
         required_skills=['Python', 'Machine Learning',
                          'SQL', 'Statistics', 'Data Analysis'],
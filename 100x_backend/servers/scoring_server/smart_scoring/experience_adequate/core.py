@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Dict, Any
+from ....date_utils import entry_dates
 from ..groq_integration import GroqScorer
 
 
@@ -44,18 +45,14 @@ def _calculate_total_months(work_experience: list) -> int:
     total_months = 0
 
     for exp in work_experience:
-        from_date = exp.get('from_date', '')
-        to_date = exp.get('to_date', 'Present')
-
-        if from_date:
-            try:
-                start_date = datetime.strptime(from_date, '%b %Y')
-                end_date = datetime.now() if to_date == 'Present' else datetime.strptime(to_date, '%b %Y')
-                months = (end_date.year - start_date.year) * \
-                    12 + (end_date.month - start_date.month)
-                total_months += max(0, months)
-            except ValueError:
-                pass
+        start_date, end_date, is_current = entry_dates(exp)
+        if is_current:
+            end_date = datetime.now()
+
+        if start_date and end_date:
+            months = (end_date.year - start_date.year) * \
+                12 + (end_date.month - start_date.month)
+            total_months += max(0, months)
 
     return total_months
 
@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 from dotenv import load_dotenv
 from typing import Dict, Any
 from ....connectors import GroqConnector
@@ -27,11 +28,26 @@ class ScoringResult(TypedDict):
 
 
 class GroqScorer:
-    def __init__(self, api_key: str = None, model: str = None):
+    WEIGHTS = {
+        'skills': 0.30,        # Increased weight for technical skills
+        'education': 0.15,
+        'experience': 0.25,
+        'projects': 0.15,
+        'language': 0.10,
+        'relevance': 0.05      # Decreased weight for general relevance
+    }
+    ADEQUACY_THRESHOLD = 65  # Increased threshold
+
+    def __init__(self, api_key: str = None, model: str = None, early_exit: bool = None):
         self.api_key = api_key or os.getenv('groq_api_key')
         if not self.api_key:
             raise ValueError("Groq API key not found")
+        # Score skills/education first and skip the experience call when it cannot change the outcome
+        if early_exit is None:
+            early_exit = os.getenv('l2_early_exit', '0').lower() in ('1', 'true', 'yes')
+        self.early_exit = early_exit
         self.connector = GroqConnector(api_key=self.api_key, model=model)
+        self.scoring_obj = self.connector.create_obj(ScoringResult)
 
     async def evaluate_skills_education(self, education: list, skills: dict, requirements: dict) -> Dict:
         """Evaluate education and skills in a focused context with strict criteria"""
@@ -79,8 +95,7 @@ class GroqScorer:
             }
         }
 
-        scorer = self.connector.create_obj(ScoringResult)
-        return await self.connector.acall(scorer, f"{prompt}\n\nAnalyze:\n{json.dumps(context)}")
+        return await self.connector.acall(self.scoring_obj, f"{prompt}\n\nAnalyze:\n{json.dumps(context)}")
 
     async def evaluate_experience(self, experience: list, projects: list, requirements: dict) -> Dict:
         """Evaluate work experience, projects and relevance with stringent criteria"""
@@ -132,21 +147,13 @@ class GroqScorer:
             }
         }
 
-        scorer = self.connector.create_obj(ScoringResult)
-        return await self.connector.acall(scorer, f"{prompt}\n\nAnalyze:\n{json.dumps(context)}")
+        return await self.connector.acall(self.scoring_obj, f"{prompt}\n\nAnalyze:\n{json.dumps(context)}")
 
     def calculate_final_score(self, skills_score: float, education_score: float,
                               experience_score: float, projects_score: float,
                               language_score: float, relevance_score: float) -> Dict:
         """Calculate final score with stricter thresholds"""
-        weights = {
-            'skills': 0.30,        # Increased weight for technical skills
-            'education': 0.15,
-            'experience': 0.25,
-            'projects': 0.15,
-            'language': 0.10,
-            'relevance': 0.05      # Decreased weight for general relevance
-        }
+        weights = self.WEIGHTS
 
         final_score = (
             skills_score * weights['skills'] +
@@ -171,29 +178,55 @@ class GroqScorer:
 
         return {
             'final_score': final_score,
-            'is_adequate': final_score >= 65,  # Increased threshold
+            'is_adequate': final_score >= self.ADEQUACY_THRESHOLD,
             'recommended_level': level
         }
 
+    def can_reach_threshold(self, skills_edu_result: Dict) -> bool:
+        """Whether perfect experience, projects and relevance scores could still make the candidate adequate"""
+        best_case = self.calculate_final_score(
+            skills_edu_result.get('skills_score', 0),
+            skills_edu_result.get('education_score', 0),
+            ScoringConfig.MAX_SCORE,
+            ScoringConfig.MAX_SCORE,
+            skills_edu_result.get('language_score', 0),
+            ScoringConfig.MAX_SCORE
+        )
+        return best_case['is_adequate']
+
     async def evaluate_candidate(self, candidate_data: Dict[str, Any], job_requirements: Dict[str, Any] = None) -> Dict[str, Any]:
         """Evaluate candidate profile with all scoring components"""
         try:
             print("\nEvaluating candidate profile...")
 
-            # First evaluation: Skills and Education
-            skills_edu_result = await self.evaluate_skills_education(
+            skills_edu_call = self.evaluate_skills_education(
                 candidate_data.get('education', []),
                 candidate_data.get('skill', {}),
                 job_requirements
             )
-
-            # Second evaluation: Experience, Projects and Relevance
-            exp_result = await self.evaluate_experience(
+            # Only turned into a call where it is awaited, early exit may never make it
+            exp_args = (
                 candidate_data.get('work_experience', []),
                 candidate_data.get('projects', []),
                 job_requirements
             )
 
+            failed_early = False
+            if self.early_exit:
+                skills_edu_result = await skills_edu_call
+                if self.can_reach_threshold(skills_edu_result):
+                    exp_result = await self.evaluate_experience(*exp_args)
+                else:
+                    failed_early = True
+                    exp_result = {
+                        key: 0 for key in ('experience_score', 'projects_score', 'relevance_score')}
+                    exp_result.update({key: 'Not evaluated: skills and education scores rule out an adequate total'
+                                       for key in ('experience_analysis', 'projects_analysis', 'relevance_analysis')})
+            else:
+                # Skills/Education and Experience/Projects/Relevance are independent, run both at once
+                skills_edu_result, exp_result = await asyncio.gather(
+                    skills_edu_call, self.evaluate_experience(*exp_args))
+
             # Calculate final scores including language and relevance
             final_results = self.calculate_final_score(
                 skills_edu_result.get('skills_score', 0),
@@ -209,6 +242,7 @@ class GroqScorer:
                 'final_score': final_results['final_score'],
                 'is_adequate': final_results['is_adequate'],
                 'recommended_level': final_results['recommended_level'],
+                'failed_early': failed_early,
                 'breakdowns': {
                     'education': {
                         'score': skills_edu_result.get('education_score', 0),
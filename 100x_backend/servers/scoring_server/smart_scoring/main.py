@@ -3,6 +3,16 @@ import json
 from typing import Dict, Any, Tuple
 from .groq_integration import GroqScorer
 
+_scorer: GroqScorer = None
+
+
+def get_scorer() -> GroqScorer:
+    """Process-wide scorer, so its client and structured-output runnable are built once"""
+    global _scorer
+    if _scorer is None:
+        _scorer = GroqScorer()
+    return _scorer
+
 
 async def process_candidate(candidate_tuple: Tuple, job_requirements: Dict[str, Any] = None) -> Dict[str, Any]:
     """
@@ -13,9 +23,8 @@ async def process_candidate(candidate_tuple: Tuple, job_requirements: Dict[str,
     if isinstance(data, str):
         data = json.loads(data)
 
-    # Initialize scorer
-    scorer = GroqScorer()
-    
+    scorer = get_scorer()
+
     # Get comprehensive scoring analysis in a single API call
     result = await scorer.evaluate_candidate(data, job_requirements)
 
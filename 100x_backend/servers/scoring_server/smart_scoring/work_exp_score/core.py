@@ -1,19 +1,14 @@
 from datetime import datetime
 from typing import Dict, Any, List
+from ....date_utils import is_present, parse_date as normalize_date
 from ..groq_integration import GroqScorer
 
 
 def parse_date(date_str: str) -> datetime:
-    """Parse date string to datetime object"""
-    if not date_str or date_str.lower() == 'present':
+    """Parse date string to datetime object, today for ongoing or unparseable dates"""
+    if not date_str or is_present(date_str):
         return datetime.now()
-    try:
-        return datetime.strptime(date_str, '%b %Y')
-    except ValueError:
-        try:
-            return datetime.strptime(date_str, '%B, %Y')
-        except ValueError:
-            return datetime.now()
+    return normalize_date(date_str) or datetime.now()
 
 
 def calculate_duration_months(from_date: str, to_date: str) -> float:
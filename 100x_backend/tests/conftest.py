@@ -0,0 +1,7 @@
+import os
+import sys
+import tempfile
+
+# `servers.app` opens `db/` and `docs/` under the working directory on import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp(prefix="100x_tests_"))
@@ -0,0 +1,43 @@
+import duckdb
+import pytest
+
+from servers.scoring_server.ats_scoring import ATSScorer, JobRequirements, VectorizedATSScorer
+from servers.scoring_server.server import l1_score_batch
+
+JOB = JobRequirements(
+    required_skills=['Python', 'SQL', 'Machine Learning'],
+    preferred_skills=['Docker', 'AWS'],
+    min_experience_years=2,
+    required_education='Bachelor Degree',
+    industry_keywords=['data', 'analytics'],
+    job_title_keywords=['data scientist', 'engineer'],
+    extra_information=[]
+)
+
+RESUMES = [
+    ("r1", {
+        "personal_information": {"first_name": "Ada", "last_name": "L", "email": "ada@x.io"},
+        "skill": ["Python", "SQL", "Docker"],
+        "work_experience": [{"job_title": "Senior Data Scientist", "company_name": "Acme",
+                             "description": "Built data analytics pipelines in Python",
+                             "start_date": "2019-01", "end_date": "Present"}],
+        "education": [{"degree": "Bachelor of Science", "field_of_study": "Computer Science", "grade": "8/10"}],
+        "projects": [{"title": "Churn model", "description": "Machine Learning on SQL data"}],
+    }),
+    ("r2", {"personal_information": {"first_name": "Bo"}, "skill": ["Excel"]}),
+]
+
+
+@pytest.mark.parametrize("scorer_cls", [ATSScorer, VectorizedATSScorer])
+def test_batch_is_stored_in_one_update(scorer_cls):
+    con = duckdb.connect()
+    con.execute("CREATE TABLE resumes (id TEXT, ats_score DOUBLE, ats_passed BOOLEAN);")
+    con.executemany("INSERT INTO resumes (id) VALUES (?);", [[resume_id] for resume_id, _ in RESUMES])
+
+    results = l1_score_batch(con, scorer_cls(JOB), RESUMES, threshold=40.0)
+
+    expected = [ATSScorer(JOB).calculate_overall_score(resume)["overall_score"] for _, resume in RESUMES]
+    stored = con.execute("SELECT ats_score, ats_passed FROM resumes ORDER BY id;").fetchall()
+    assert [score for score, _ in stored] == pytest.approx(expected)
+    assert [passed for _, passed in stored] == [score >= 40.0 for score in expected]
+    assert list(results["passed"]) == [passed for _, passed in stored]
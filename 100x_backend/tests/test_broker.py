@@ -0,0 +1,69 @@
+import asyncio
+import importlib
+
+from servers.db_utils import JobDBManager, TaskBroker
+
+
+def make_broker(tmp_path):
+    return TaskBroker(db_path=str(tmp_path / "broker.sqlite3"))
+
+
+def test_urgent_worker_only_claims_jobs_above_bulk(tmp_path):
+    broker = make_broker(tmp_path)
+    broker.enqueue("bulk", ["bulk"], priority=1.0)
+
+    assert broker.claim("urgent", min_priority=1.0) == (None, [])
+    broker.enqueue("urgent", ["urgent"], priority=5.0)
+    (_, payload), _ = broker.claim("urgent", min_priority=1.0)
+    assert payload == ["urgent"]
+    (_, payload), _ = broker.claim("worker")
+    assert payload == ["bulk"]
+
+
+def test_lapsed_lease_goes_to_another_worker(tmp_path):
+    broker = make_broker(tmp_path)
+    task_id = broker.enqueue("A", ["A"])
+    assert broker.claim("first", lease_seconds=-1)[0] == (task_id, ["A"])
+
+    # The first worker stopped heartbeating, so its lease ran out
+    assert broker.claim("second")[0] == (task_id, ["A"])
+    assert not broker.heartbeat(task_id, "first")
+    broker.complete(task_id, "first")
+    assert broker.heartbeat(task_id, "second")
+    broker.complete(task_id, "second")
+    assert broker.claim("third") == (None, [])
+
+
+def test_job_cancelled_while_running_is_completed_not_rerun(tmp_path, monkeypatch):
+    app = importlib.import_module("servers.app")
+    broker = make_broker(tmp_path)
+    job_db = JobDBManager(db_path=str(tmp_path / "jobs.duckdb"))
+    monkeypatch.setattr(app, "broker", broker)
+    monkeypatch.setattr(app, "job_db", job_db)
+    monkeypatch.setattr(app, "BROKER_POLL_SECONDS", 0.05)
+
+    async def process_task(*args):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(app, "process_task", process_task)
+    task = ("prompt", "A", "resumes.zip", "resumes.zip", 1.0, None)
+    job_db.create_job("A", "prompt", "resumes.zip", "resumes.zip")
+    task_id = broker.enqueue("A", task)
+
+    async def main():
+        worker = asyncio.create_task(app.broker_worker("worker"))
+        while job_db.get_job("A")["status"] != "running":
+            await asyncio.sleep(0.05)
+        job_db.mark_cancelled("A")
+        # The worker notices at its next status poll, stops the job and closes its task
+        for _ in range(100):
+            if broker.con.execute("SELECT status FROM tasks WHERE id = ?;", [task_id]).fetchone()[0] == "done":
+                break
+            await asyncio.sleep(0.05)
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+
+    asyncio.run(main())
+    assert broker.con.execute("SELECT status FROM tasks WHERE id = ?;", [task_id]).fetchone()[0] == "done"
+    assert broker.claim("other") == (None, [])
+    assert job_db.get_job("A")["status"] == "cancelled"
@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+from servers.db_utils import get_connection_manager
+
+
+def test_close_waits_for_readers_off_the_event_loop(tmp_path):
+    async def main():
+        manager = get_connection_manager()
+        db = await manager.acquire(str(tmp_path / "job.duckdb"))
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.05)
+                ticks += 1
+
+        slow_read = asyncio.create_task(db.read(lambda cursor: time.sleep(0.5)))
+        await asyncio.sleep(0.05)
+        ticker = asyncio.create_task(tick())
+        await manager.release(str(tmp_path / "job.duckdb"))
+        ticker.cancel()
+        await slow_read
+        return ticks
+
+    # The loop kept running while `close` waited for the slow read to finish
+    assert asyncio.run(main()) >= 5
@@ -0,0 +1,40 @@
+import asyncio
+
+import fitz
+import pytest
+
+from servers.extraction_server.resume_parser import ResumeParser, get_extraction_executor, \
+    shutdown_extraction_executor
+
+
+class FakeConnector:
+    def create_obj(self, structure):
+        return None
+
+
+def make_pdf() -> bytes:
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Ada Lovelace, Data Scientist")
+    return doc.tobytes()
+
+
+def test_timed_out_extraction_recycles_pool():
+    data = make_pdf()
+    parser = ResumeParser(FakeConnector(), timeout=0.001)
+    hung = get_extraction_executor()
+    workers = hung._processes
+    try:
+        # A fresh worker cannot even start within the timeout
+        with pytest.raises(TimeoutError):
+            asyncio.run(parser.extract_text_async(data, "cv.pdf"))
+        assert parser.executor is not hung
+        assert workers
+        for process in workers.values():
+            process.join(timeout=5)
+            assert not process.is_alive()
+
+        parser.timeout = 60
+        text = asyncio.run(parser.extract_text_async(data, "cv.pdf"))
+        assert "Ada Lovelace" in text
+    finally:
+        shutdown_extraction_executor()
@@ -0,0 +1,86 @@
+from servers.db_utils import JobDBManager
+
+
+def make_job_db(tmp_path):
+    return JobDBManager(db_path=str(tmp_path / "jobs.duckdb"))
+
+
+def test_top_up_queued_while_running_still_runs(tmp_path):
+    job_db = make_job_db(tmp_path)
+    job_db.create_job("A", "prompt", "first.zip", "first.zip")
+    assert job_db.mark_running("A", "first.zip")
+
+    # A second upload to the job while its first run is going
+    job_db.create_job("A", "prompt", "second.zip", "second.zip")
+    assert job_db.get_job("A")["status"] == "running"
+    job_db.mark_completed("A", "first.zip", {"message": "first run"})
+
+    # Not done while the top-up waits for its run
+    assert job_db.get_job("A")["status"] == "queued"
+    assert job_db.mark_running("A", "second.zip")
+    assert job_db.get_job("A")["status"] == "running"
+    job_db.mark_completed("A", "second.zip", {"message": "second run"})
+    job = job_db.get_job("A")
+    assert job["status"] == "completed"
+    assert [upload["status"] for upload in job["uploads"]] == ["done", "done"]
+
+
+def test_restart_requeues_every_upload_left_to_run(tmp_path):
+    job_db = make_job_db(tmp_path)
+    job_db.create_job("A", "prompt", "first.zip", "first.zip")
+    job_db.create_job("B", "prompt", "other.zip", "other.zip")
+    job_db.mark_running("B", "other.zip")
+    job_db.mark_completed("B", "other.zip", {})
+    assert job_db.mark_running("A", "first.zip")
+    job_db.create_job("A", "prompt", "second.zip", "second.zip")
+
+    # The process died during the first run of A
+    tasks = job_db.requeue_interrupted_jobs()
+    assert [(task[1], task[2]) for task in tasks] == [("A", "first.zip"), ("A", "second.zip")]
+    assert job_db.get_job("A")["status"] == "queued"
+    assert job_db.get_job("B")["status"] == "completed"
+
+    # ... or once it finished and the top-up was still waiting
+    job_db.mark_running("A", "first.zip")
+    job_db.mark_completed("A", "first.zip", {})
+    assert [task[2] for task in job_db.requeue_interrupted_jobs()] == ["second.zip"]
+
+
+def test_failed_upload_keeps_the_job_failed_and_is_retried(tmp_path):
+    job_db = make_job_db(tmp_path)
+    job_db.create_job("A", "prompt", "first.zip", "first.zip")
+    job_db.create_job("A", "prompt", "second.zip", "second.zip")
+    job_db.mark_running("A", "first.zip")
+    job_db.mark_failed("A", "first.zip", "boom")
+    assert job_db.get_job("A")["status"] == "queued"
+
+    job_db.mark_running("A", "second.zip")
+    job_db.mark_completed("A", "second.zip", {})
+    job = job_db.get_job("A")
+    assert (job["status"], job["error"]) == ("failed", "boom")
+
+    assert [task[2] for task in job_db.requeue_stopped_job("A")] == ["first.zip"]
+    assert job_db.get_job("A")["status"] == "queued"
+
+
+def test_cancelled_job_does_not_start(tmp_path):
+    job_db = make_job_db(tmp_path)
+    job_db.create_job("A", "prompt", "resumes.zip", "resumes.zip")
+    assert job_db.mark_cancelled("A")
+
+    assert not job_db.mark_running("A", "resumes.zip")
+    assert job_db.get_job("A")["status"] == "cancelled"
+    assert job_db.requeue_interrupted_jobs() == []
+    # Retried, the cancelled upload runs again
+    assert [task[2] for task in job_db.requeue_stopped_job("A")] == ["resumes.zip"]
+    assert job_db.mark_running("A", "resumes.zip")
+
+
+def test_retry_needs_an_upload_to_run(tmp_path):
+    job_db = make_job_db(tmp_path)
+    job_db.create_job("A", "prompt", "resumes.zip", "resumes.zip")
+    job_db.mark_running("A", "resumes.zip")
+    job_db.mark_completed("A", "resumes.zip", {})
+
+    assert job_db.requeue_stopped_job("A") == []
+    assert job_db.get_job("A")["status"] == "completed"
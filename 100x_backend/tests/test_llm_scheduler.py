@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from servers import llm_scheduler
+from servers.llm_scheduler import AIMDLimiter, FairQueue, TokenBucket
+
+
+def test_fair_queue_shares_by_priority():
+    queue = FairQueue()
+    for _ in range(8):
+        queue.push("urgent", 3.0, cost=1.0)
+        queue.push("bulk", 1.0, cost=1.0)
+
+    admitted = []
+    for _ in range(8):
+        entry = queue.head()
+        queue.pop(entry)
+        admitted.append(entry[2])
+    assert (admitted.count("urgent"), admitted.count("bulk")) == (6, 2)
+
+
+def test_token_bucket_waits_for_its_refill(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+
+    async def sleep(seconds):
+        clock.now += seconds
+
+    monkeypatch.setattr(llm_scheduler, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    monkeypatch.setattr(llm_scheduler, "asyncio", SimpleNamespace(sleep=sleep))
+    bucket = TokenBucket(rate_per_minute=60, capacity=2)
+
+    async def main():
+        await bucket.acquire(2)
+        assert clock.now == 0.0
+        await bucket.acquire(1)
+        assert clock.now == 1.0
+        # Larger than the bucket, it waits for a full one
+        await bucket.acquire(5)
+        assert clock.now == 3.0
+
+    asyncio.run(main())
+
+
+def test_aimd_halves_once_per_congestion_window():
+    limiter = AIMDLimiter(initial=8)
+
+    async def main():
+        epochs = [await limiter.acquire() for _ in range(8)]
+        # A burst of 429s from calls sent at the same limit backs off once
+        for epoch in epochs:
+            await limiter.release(epoch, rate_limited=True)
+        assert limiter.limit == 4
+
+        epoch = await limiter.acquire()
+        await limiter.release(epoch, rate_limited=True)
+        assert limiter.limit == 2
+
+        # Fast successes grow it back additively, 1 / limit each
+        for _ in range(2):
+            await limiter.release(await limiter.acquire(), latency=0.1)
+        assert limiter.limit == pytest.approx(2.9)
+
+    asyncio.run(main())
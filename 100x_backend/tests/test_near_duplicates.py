@@ -0,0 +1,25 @@
+from servers.db_utils import MinHashLSH
+
+RESUME = " ".join(f"Built data pipeline number {i} in Python and SQL for the analytics team." for i in range(30))
+
+
+def test_edited_copy_clusters_and_unrelated_text_does_not():
+    index = MinHashLSH(threshold=0.85)
+    index.insert("original", index.signature("Ada Lovelace, Data Scientist. " + RESUME))
+
+    key, similarity = index.query(index.signature("Ada Lovelace, Senior Data Scientist. " + RESUME))
+    assert key == "original"
+    assert 0.85 <= similarity < 1.0
+    unrelated = " ".join(f"Wrote compiler pass {i} in COBOL for the navy." for i in range(30))
+    assert index.query(index.signature(unrelated)) is None
+
+
+def test_removed_resume_leaves_its_buckets():
+    index = MinHashLSH(threshold=0.85)
+    signature = index.signature(RESUME)
+    index.insert("original", signature)
+
+    index.remove("original")
+    assert "original" not in index
+    assert index.query(signature) is None
+    assert not any(keys for buckets in index._buckets for keys in buckets.values())
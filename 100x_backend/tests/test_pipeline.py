@@ -0,0 +1,143 @@
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+import fitz
+
+from servers.extraction_server import ResumeSource
+from servers.pipeline import PipelineConfig, StreamingPipeline
+from servers.scoring_server.ats_scoring import JobRequirements
+
+JOB = JobRequirements(
+    required_skills=['Python'],
+    preferred_skills=['SQL'],
+    min_experience_years=1,
+    required_education='Bachelor',
+    industry_keywords=['data'],
+    job_title_keywords=['data scientist'],
+    extra_information=[]
+)
+
+
+class FakeConnector:
+    """Answers every structured call with `respond(structure name, prompt)`"""
+
+    def __init__(self, respond):
+        self.respond = respond
+
+    def create_obj(self, structure):
+        return structure.__name__
+
+    async def acall(self, obj, prompt):
+        return self.respond(obj, prompt)
+
+
+def make_pdf(text: str) -> bytes:
+    doc = fitz.open()
+    doc.new_page().insert_textbox(fitz.Rect(72, 72, 540, 770), text)
+    return doc.tobytes()
+
+
+def run_pipeline(db_path: str, sources, respond, timeout: float = 30) -> StreamingPipeline:
+    async def main():
+        pipeline = StreamingPipeline(FakeConnector(respond), "job", db_path, JOB, config=PipelineConfig())
+        # Extraction in a thread, a process pool is not worth starting for a few pages
+        pipeline.parser._executor = ThreadPoolExecutor(max_workers=2)
+        await asyncio.wait_for(pipeline.run(sources), timeout)
+        return pipeline
+
+    return asyncio.run(main())
+
+
+def test_copy_of_a_resume_whose_row_fails_does_not_hang(tmp_path):
+    calls = []
+
+    def respond(structure, prompt):
+        calls.append(structure)
+        # No personal_information, so building the resume row fails after the parse
+        return {"skill": {"category": "Tech", "skill_values": ["Python"]}}
+
+    data = make_pdf("Ada Lovelace, Data Scientist, Python")
+    db_path = str(tmp_path / "job.duckdb")
+    run_pipeline(db_path, [ResumeSource("a.pdf", data), ResumeSource("copy.pdf", data)], respond)
+
+    # The copy did not wait forever on the failed original, it was parsed and failed on its own
+    assert calls.count("ResumeJSON") == 2
+    con = duckdb.connect(db_path, read_only=True)
+    assert con.execute("SELECT count(*) FROM resumes;").fetchone()[0] == 0
+    assert con.execute("SELECT count(*) FROM duplicate_resumes;").fetchone()[0] == 0
+    con.close()
+
+
+def test_ats_scores_the_resume_with_normalized_dates(tmp_path, monkeypatch):
+    resume = {
+        "personal_information": {"first_name": "Ada", "last_name": "Lovelace", "email_address": "ada@x.org"},
+        "work_experience": [{"company_name": "Analytical Engines", "job_title": "Data Scientist",
+                             "from_date": "Jan 2019", "to_date": "Present"}],
+    }
+
+    def respond(structure, prompt):
+        if structure == "ResumeJSON":
+            return resume
+        raise ValueError("only parsing is answered")
+
+    scored = []
+
+    def score_batch(self, resumes, threshold=40.0):
+        scored.extend(resumes)
+        if len(scored) == 1:
+            raise RuntimeError("ATS down")
+        return {"overall_score": [10.0] * len(resumes), "passed": [False] * len(resumes)}
+
+    monkeypatch.setattr("servers.scoring_server.ats_scoring.ATSScorer.score_batch", score_batch)
+    db_path = str(tmp_path / "job.duckdb")
+    sources = [ResumeSource("a.pdf", make_pdf("Ada Lovelace, Data Scientist, Python"))]
+    # The first run fails in ATS, the second picks the stored resume up from its typed columns
+    run_pipeline(db_path, sources, respond)
+    run_pipeline(db_path, sources, respond)
+
+    assert len(scored) == 2
+    for scored_resume in scored:
+        entry = scored_resume["work_experience"][0]
+        assert (str(entry["start_date"]), entry["is_current"]) == ("2019-01-01", True)
+    # The parsed resume itself is stored as parsed
+    con = duckdb.connect(db_path, read_only=True)
+    raw = json.loads(con.execute("SELECT raw FROM resumes;").fetchone()[0])
+    con.close()
+    assert "start_date" not in raw["work_experience"][0]
+
+
+def test_lightly_edited_copy_is_stored_as_a_near_duplicate(tmp_path):
+    experience = " ".join(f"Built data pipeline number {i} in Python and SQL for the analytics team." for i in range(30))
+    original = "Ada Lovelace, Data Scientist. " + experience
+    edited = "Ada Lovelace, Senior Data Scientist. " + experience
+    unrelated = "Grace Hopper, Compiler Engineer. " + " ".join(
+        f"Wrote compiler pass {i} in COBOL for the navy." for i in range(30))
+
+    def respond(structure, prompt):
+        if structure != "ResumeJSON":
+            raise ValueError("only parsing is answered")
+        first, last = ("Grace", "Hopper") if "Hopper" in prompt else ("Ada", "Lovelace")
+        return {"personal_information": {"first_name": first, "last_name": last,
+                                         "email_address": f"{first.lower()}@x.org"}}
+
+    parsed = []
+    db_path = str(tmp_path / "job.duckdb")
+    run_pipeline(db_path, [ResumeSource("a.pdf", make_pdf(original)), ResumeSource("b.pdf", make_pdf(edited)),
+                           ResumeSource("c.pdf", make_pdf(unrelated))],
+                 lambda structure, prompt: parsed.append(structure) or respond(structure, prompt))
+
+    # The copy reused its original's parse, the unrelated resume was parsed on its own
+    assert parsed.count("ResumeJSON") == 2
+    con = duckdb.connect(db_path, read_only=True)
+    stored = dict(con.execute("SELECT file_path, id FROM resumes;").fetchall())
+    duplicates = con.execute(
+        "SELECT file_path, duplicate_of_id, duplicate_type, similarity FROM duplicate_resumes;").fetchall()
+    con.close()
+    assert sorted(stored) in (["a.pdf", "c.pdf"], ["b.pdf", "c.pdf"])
+    [(file_path, duplicate_of_id, duplicate_type, similarity)] = duplicates
+    assert {file_path, *stored} == {"a.pdf", "b.pdf", "c.pdf"}
+    assert duplicate_of_id == stored["a.pdf" if file_path == "b.pdf" else "b.pdf"]
+    assert duplicate_type == "near"
+    assert 0.85 <= similarity < 1.0
@@ -0,0 +1,31 @@
+import duckdb
+
+from servers.generation_server.server import rank_resumes
+
+
+def ranked_ids(rows):
+    con = duckdb.connect()
+    con.execute("""
+        CREATE TABLE resumes (id TEXT, ats_score DOUBLE, ats_passed BOOLEAN, smart_score DOUBLE,
+                              smart_passed BOOLEAN, l2_status TEXT);
+    """)
+    con.executemany("INSERT INTO resumes VALUES (?, ?, ?, ?, ?, ?);", rows)
+    rank_resumes(con)
+    passed = [row[0] for row in con.execute("SELECT id FROM passed_ranked_resumes;").fetchall()]
+    failed = sorted(row[0] for row in con.execute("SELECT id FROM failed_resumes;").fetchall())
+    return passed, failed
+
+
+def test_unevaluated_resumes_are_not_rejected():
+    passed, failed = ranked_ids([
+        ("scored_pass", 80, True, 70, True, "scored"),
+        ("scored_fail", 80, True, 20, False, "scored"),
+        ("ats_fail", 20, False, None, None, "skipped_ats_failed"),
+        ("top_k", 60, True, None, None, "skipped_top_k"),
+        # Left by a deadline's partial finalize, or an L2 call that raised
+        ("deadline", 60, True, None, None, "skipped_deadline"),
+        ("in_flight", 75, True, None, None, None),
+    ])
+
+    assert passed == ["scored_pass"]
+    assert failed == ["ats_fail", "scored_fail", "top_k"]
@@ -0,0 +1,31 @@
+import json
+
+from servers.db_utils import TYPED_RESUME_COLUMNS, ResumeDBManager, build_resume_row, resume_from_typed_columns
+
+PARSED = {
+    "personal_information": {"first_name": "Ada", "last_name": "L", "email_address": "ada@x.io"},
+    "work_experience": [{"job_title": "Data Scientist", "from_date": "June, 2019", "to_date": "Present"}],
+    "education": [{"degree": "BSc", "from_date": "2015-2019"}],
+}
+
+
+def test_normalized_dates_stay_out_of_raw(tmp_path):
+    parsed = json.loads(json.dumps(PARSED))
+    row = build_resume_row(parsed, job_id="j", file_path="a.pdf")
+    assert parsed == PARSED
+
+    db = ResumeDBManager(str(tmp_path / "job.duckdb"))
+    db.insert_resume_rows([row])
+    raw, *typed = db.con.execute(f"SELECT raw, {', '.join(TYPED_RESUME_COLUMNS)} FROM resumes;").fetchone()
+    db.close()
+
+    # What the Q&A prompt and the pipeline's L2 candidate are built from
+    assert json.loads(raw) == PARSED
+    scored = resume_from_typed_columns(*typed)
+    assert scored["work_experience"][0]["start_date"] == "2019-06-01"
+    assert scored["work_experience"][0]["is_current"] is True
+    assert scored["education"][0]["end_date"] == "2019-01-01"
+    # What `l2_score_resumes` builds its prompts from
+    prompted = resume_from_typed_columns(*typed, normalized_dates=False)
+    assert prompted["work_experience"][0] == PARSED["work_experience"][0]
+    assert prompted["education"][0] == PARSED["education"][0]
@@ -0,0 +1,32 @@
+import duckdb
+
+from servers.db_utils.stage_state import ensure_stage_tables, record_failure, set_stage
+
+
+def stage_of(con, content_hash):
+    return con.execute("SELECT stage FROM resume_stages WHERE content_hash = ?;", [content_hash]).fetchone()[0]
+
+
+def test_stage_only_moves_forward():
+    con = duckdb.connect()
+    ensure_stage_tables(con)
+    set_stage(con, "abc", "extracted", file_path="a.pdf")
+    set_stage(con, "abc", "smart_scored", resume_id="r1")
+
+    # A byte-identical copy of the file is extracted later in the job
+    set_stage(con, "abc", "extracted", file_path="copy.pdf")
+
+    assert stage_of(con, "abc") == "smart_scored"
+    set_stage(con, "abc", "qa_generated")
+    assert stage_of(con, "abc") == "qa_generated"
+
+
+def test_reaching_failed_stage_clears_failure():
+    con = duckdb.connect()
+    ensure_stage_tables(con)
+    set_stage(con, "abc", "ats_scored")
+    assert not record_failure(con, "abc", "a.pdf", "smart_scored", "timeout", max_attempts=3)
+
+    set_stage(con, "abc", "smart_scored")
+
+    assert con.execute("SELECT count(*) FROM resume_failures;").fetchone()[0] == 0
@@ -2,6 +2,7 @@ import { BrowserRouter as Router, Routes, Route } from "react-router-dom";
 import HomePage from "@/pages/HomePage";
 import AnalyticsPage from "@/pages/AnalyticsPage";
 import HitHistoryPage from "@/pages/HistoryPage";
+import JobPage from "@/pages/JobPage";
 
 function App() {
   return (
@@ -10,6 +11,7 @@ function App() {
         <Route path="/" element={<HomePage />} />
         <Route path="/analytics" element={<AnalyticsPage />} />
         <Route path="/history" element={<HitHistoryPage />} />
+        <Route path="/jobs/:jobId" element={<JobPage />} />
       </Routes>
     </Router>
   );
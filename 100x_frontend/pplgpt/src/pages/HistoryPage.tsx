@@ -4,6 +4,7 @@ import { Table, TableHeader, TableRow, TableHead, TableBody, TableCell } from '@
 import { Badge } from '@/components/ui/badge';
 import { Skeleton } from '@/components/ui/skeleton';
 import { motion } from 'framer-motion';
+import { Link } from 'react-router-dom';
 import { Topbar } from '@/components/Topbar';
 import { Button } from '@/components/ui/button';
 import { captureEvent } from '@/lib/posthog';
@@ -38,6 +39,8 @@ const fetchHits = async (): Promise<Hit[]> => {
   }));
 };
 
+const FINAL_STATUSES = ['completed', 'failed', 'cancelled'];
+
 const downloadFile = (url?: string) => {
   if (url) {
     const a = document.createElement('a');
@@ -50,20 +53,39 @@ const downloadFile = (url?: string) => {
 const HitHistoryPage: React.FC = () => {
   const [hits, setHits] = useState<Hit[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
+  const [refresh, setRefresh] = useState<number>(0);
+  // Resumes done / expected for the jobs still running, as pushed by their event streams
+  const [progress, setProgress] = useState<Record<string, string>>({});
 
   useEffect(() => {
-    const getHits = () => {
-      fetchHits()
-        .then(data => setHits(data))
-        .catch(console.error)
-        .finally(() => setLoading(false));
-    };
+    fetchHits()
+      .then(data => setHits(data))
+      .catch(console.error)
+      .finally(() => setLoading(false));
+  }, [refresh]);
 
-    getHits();
-    const interval = setInterval(getHits, 5000);
+  const pendingIds = hits.filter(hit => hit.status === 'pending').map(hit => hit.id).join(',');
 
-    return () => clearInterval(interval);
-  }, []);
+  useEffect(() => {
+    if (!pendingIds) return;
+    // No polling: each pending job pushes its progress, and the list is refetched once one finishes
+    const streams = pendingIds.split(',').map(id => {
+      const events = new EventSource(`http://localhost:8000/jobs/${id}/events`);
+      events.addEventListener('progress', e => {
+        const data = JSON.parse((e as MessageEvent).data);
+        setProgress(current => ({ ...current, [id]: `${data.counts.completed}/${data.total ?? '?'}` }));
+      });
+      events.addEventListener('status', e => {
+        if (FINAL_STATUSES.includes(JSON.parse((e as MessageEvent).data).status)) {
+          events.close();
+          setRefresh(count => count + 1);
+        }
+      });
+      return events;
+    });
+
+    return () => streams.forEach(events => events.close());
+  }, [pendingIds]);
 
   useEffect(() => {
     captureEvent('history_page_loaded');
@@ -111,7 +133,9 @@ const HitHistoryPage: React.FC = () => {
               <TableBody>
                 {hits.map(hit => (
                   <TableRow key={hit.id}>
-                    <TableCell>{hit.id}</TableCell>
+                    <TableCell>
+                      <Link to={`/jobs/${hit.id}`} className="hover:underline">{hit.id}</Link>
+                    </TableCell>
                     <TableCell>{new Date(hit.timestamp).toLocaleString()}</TableCell>
                     <TableCell>
                       <Badge
@@ -124,6 +148,7 @@ const HitHistoryPage: React.FC = () => {
                         }
                       >
                         {hit.status}
+                        {hit.status === 'pending' && progress[hit.id] ? ` (${progress[hit.id]})` : ''}
                       </Badge>
                     </TableCell>
                     <TableCell className="space-x-2">
@@ -64,7 +64,7 @@ export default function HomePage() {
         jobId: data.job_id
       });
 
-      navigate("/history");
+      navigate(`/jobs/${data.job_id}`);
     } catch (error) {
       captureEvent('upload_error', {
         error: error instanceof Error ? error.message : 'Unknown error'
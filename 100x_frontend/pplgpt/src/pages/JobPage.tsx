@@ -0,0 +1,175 @@
+import React, { useEffect, useState } from 'react';
+import { useParams } from 'react-router-dom';
+import { Card, CardContent } from '@/components/ui/card';
+import { Table, TableHeader, TableRow, TableHead, TableBody, TableCell } from '@/components/ui/table';
+import { Badge } from '@/components/ui/badge';
+import { Skeleton } from '@/components/ui/skeleton';
+import { motion } from 'framer-motion';
+import { Topbar } from '@/components/Topbar';
+import { captureEvent } from '@/lib/posthog';
+
+interface LeaderboardEntry {
+  rank: number;
+  resume_id: string;
+  name: string | null;
+  email: string | null;
+  ats_score: number;
+  smart_score: number;
+  total_score: number;
+}
+
+interface JobProgress {
+  counts: Record<string, number>;
+  total: number | null;
+  elapsed_seconds: number;
+  throughput_per_minute: number;
+  eta_seconds: number | null;
+  leaderboard: LeaderboardEntry[];
+  degraded: string[];
+}
+
+const STAGES: [string, string][] = [
+  ['discovered', 'Discovered'],
+  ['extracted', 'Extracted'],
+  ['parsed', 'Parsed'],
+  ['ats_scored', 'ATS scored'],
+  ['smart_scored', 'Smart scored'],
+  ['qa_generated', 'Q&A generated'],
+];
+
+const FINAL_STATUSES = ['completed', 'failed', 'cancelled'];
+
+const formatSeconds = (seconds: number | null) => {
+  if (seconds === null) return '—';
+  const mins = Math.floor(seconds / 60);
+  const secs = Math.round(seconds % 60);
+  return mins ? `${mins} min ${secs} sec` : `${secs} sec`;
+};
+
+const JobPage: React.FC = () => {
+  const { jobId } = useParams<{ jobId: string }>();
+  const [status, setStatus] = useState<string>('connecting');
+  const [progress, setProgress] = useState<JobProgress | null>(null);
+
+  useEffect(() => {
+    // Pushed by the server as the job moves along, the stream ends with the job's final status
+    const events = new EventSource(`http://localhost:8000/jobs/${jobId}/events`);
+
+    events.addEventListener('progress', e => {
+      setProgress(JSON.parse((e as MessageEvent).data));
+    });
+    events.addEventListener('status', e => {
+      const data = JSON.parse((e as MessageEvent).data);
+      setStatus(data.status);
+      if (FINAL_STATUSES.includes(data.status)) {
+        // Otherwise EventSource reconnects once the server closes the stream
+        events.close();
+        captureEvent('job_finished', { jobId, status: data.status });
+      }
+    });
+    events.onerror = () => {
+      if (events.readyState === EventSource.CLOSED) setStatus('unavailable');
+    };
+
+    return () => events.close();
+  }, [jobId]);
+
+  useEffect(() => {
+    captureEvent('job_page_loaded');
+    return () => {
+      captureEvent('job_page_unloaded');
+    };
+  }, []);
+
+  const completed = progress?.counts.completed ?? 0;
+  return (
+    <div>
+      <Topbar />
+    <div className="p-6 max-w-5xl mx-auto space-y-6">
+      <motion.h1
+        className="text-3xl font-semibold text-center"
+        initial={{ opacity: 0, y: -20 }}
+        animate={{ opacity: 1, y: 0 }}
+      >
+        Job {jobId}
+      </motion.h1>
+
+      <Card>
+        <CardContent className="p-4 space-y-4">
+          <div className="flex justify-between items-center">
+            <span className="text-lg font-medium">
+              {completed} / {progress?.total ?? '?'} resumes done
+            </span>
+            <Badge
+              variant={
+                status === 'completed'
+                  ? 'default'
+                  : FINAL_STATUSES.includes(status) || status === 'unavailable'
+                  ? 'destructive'
+                  : 'secondary'
+              }
+            >
+              {status}
+            </Badge>
+          </div>
+          {progress ? (
+            <>
+              <div className="grid grid-cols-3 md:grid-cols-6 gap-4">
+                {STAGES.map(([key, label]) => (
+                  <div key={key} className="text-center">
+                    <div className="text-2xl font-semibold">{progress.counts[key] ?? 0}</div>
+                    <div className="text-sm text-gray-500">{label}</div>
+                  </div>
+                ))}
+              </div>
+              <div className="flex justify-between text-sm text-gray-600">
+                <span>{progress.throughput_per_minute} resumes/min</span>
+                <span>Elapsed: {formatSeconds(progress.elapsed_seconds)}</span>
+                <span>ETA: {FINAL_STATUSES.includes(status) ? '—' : formatSeconds(progress.eta_seconds)}</span>
+              </div>
+              {progress.degraded.length > 0 && (
+                <div className="text-sm text-amber-700">
+                  Running out of time: {progress.degraded.join(', ')}
+                </div>
+              )}
+            </>
+          ) : (
+            <Skeleton className="h-20 w-full" />
+          )}
+        </CardContent>
+      </Card>
+
+      <Card>
+        <CardContent className="p-4">
+          <Table>
+            <TableHeader>
+              <TableRow>
+                <TableHead>#</TableHead>
+                <TableHead>Name</TableHead>
+                <TableHead>Email</TableHead>
+                <TableHead>ATS</TableHead>
+                <TableHead>Smart</TableHead>
+                <TableHead>Total</TableHead>
+              </TableRow>
+            </TableHeader>
+            <TableBody>
+              {(progress?.leaderboard ?? []).map(entry => (
+                <TableRow key={entry.resume_id}>
+                  <TableCell>{entry.rank}</TableCell>
+                  <TableCell>{entry.name}</TableCell>
+                  <TableCell>{entry.email}</TableCell>
+                  <TableCell>{entry.ats_score.toFixed(1)}</TableCell>
+                  <TableCell>{entry.smart_score.toFixed(1)}</TableCell>
+                  <TableCell>{entry.total_score.toFixed(1)}</TableCell>
+                </TableRow>
+              ))}
+            </TableBody>
+          </Table>
+        </CardContent>
+      </Card>
+    </div>
+    </div>
+  );
+};
+
+export default JobPage;